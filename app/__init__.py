@@ -2,7 +2,7 @@ import os
 import logging
 from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
 from datetime import datetime
-from flask import Flask, request
+from flask import Flask, flash, redirect, request
 from werkzeug.exceptions import HTTPException
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
@@ -82,7 +82,11 @@ def setup_logging(app):
 
 def create_app(config_name='default'):
     """Application factory pattern"""
+    from app.utils.upload_stream import UploadRequest
+
     app = Flask(__name__)
+    # 업로드 파일 파트를 blob 저장소 임시 파일로 바로 스트리밍 (파일 종류별 크기 제한)
+    app.request_class = UploadRequest
     app.config.from_object(config[config_name])
     try:
         app.logger.info(f'DB URI: {app.config.get("SQLALCHEMY_DATABASE_URI")}')
@@ -122,12 +126,24 @@ def create_app(config_name='default'):
         app.logger.info(f'{request.method} {request.path} - {response.status_code}')
         return response
     
+    # 템플릿에서 미디어 URL 캐시 버전(?v=) 생성
+    from app.utils.media_serving import media_version
+    app.jinja_env.globals['media_version'] = media_version
+
     # 브라우저가 자동으로 요청하는 favicon (없어도 되지만 404 노이즈 감소)
     @app.route('/favicon.ico')
     def favicon():
         return ('', 204)
 
     # 에러 핸들러
+    @app.errorhandler(413)
+    def handle_too_large(e):
+        # 업로드 크기 제한 초과: API는 JSON, 페이지(피드백 폼 등)는 메시지와 함께 이전 화면으로
+        if request.path.startswith('/api/'):
+            return {'error': '파일 용량이 너무 큽니다.'}, 413
+        flash('파일 용량이 너무 큽니다.', 'error')
+        return redirect(request.referrer or request.url)
+
     @app.errorhandler(Exception)
     def handle_exception(e):
         # 404/403 등 HTTP 예외는 그대로 반환(현재는 Exception 핸들러가 전부 500으로 바꿔버리는 문제 방지)
@@ -360,68 +360,88 @@ class Run(db.Model):
     results = db.relationship('Result', backref='run', lazy='dynamic', cascade='all, delete-orphan')
     
     def get_stats(self):
-        """런의 통계 반환 (각 케이스당 최신 결과만 카운트)"""
-        results = {}
-        executed_count = 0
-        
-        # 각 RunCase의 최신 결과만 카운트
-        for run_case in self.run_cases:
-            latest_result = run_case.get_latest_result()
-            if latest_result:
-                status = latest_result.status
-                results[status] = results.get(status, 0) + 1
-                executed_count += 1
-        
-        total = self.run_cases.count()
-        passed = results.get('pass', 0)
-        
-        return {
-            'total': total,
-            'executed': executed_count,
-            'pending': total - executed_count,
-            'pass': passed,
-            'fail': results.get('fail', 0),
-            'blocked': results.get('blocked', 0),
-            'retest': results.get('retest', 0),
-            'na': results.get('na', 0),
-            'pass_rate': round(passed / executed_count * 100, 1) if executed_count > 0 else 0,
-            'progress': round(executed_count / total * 100, 1) if total > 0 else 0
-        }
+        """런의 통계 반환 (각 케이스당 최신 결과만 카운트, 집계 쿼리 1회)"""
+        from app.utils.run_stats import compute_run_stats
+        return compute_run_stats([self.id])[self.id]
     
     def __repr__(self):
         return f'<Run {self.name}>'
 
 
+class CaseSnapshot(db.Model):
+    """런 케이스 내용 스냅샷 (내용 주소 기반, 동일 내용은 한 번만 저장)
+
+    content_hash = sha256(case_id, version, language, 내용 필드) - app.utils.case_snapshots.snapshot_hash
+    여러 런의 RunCase가 같은 스냅샷을 공유한다. (불변: 내용이 바뀌면 새 스냅샷)
+    """
+    __tablename__ = 'case_snapshots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    content_hash = db.Column(db.String(64), nullable=False, unique=True)
+    case_id = db.Column(db.Integer, db.ForeignKey('cases.id'), nullable=False, index=True)
+    case_version = db.Column(db.Integer)
+    language = db.Column(db.String(10))  # original, ko, en
+    title = db.Column(db.String(500))
+    steps = db.Column(db.Text)
+    expected_result = db.Column(db.Text)
+    priority = db.Column(db.String(10))
+    jira_links = db.Column(db.Text)  # ' | ' 구분
+    media_names = db.Column(db.Text)  # ' | ' 구분
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<CaseSnapshot case_id={self.case_id} v{self.case_version} {self.content_hash[:12]}>'
+
+
 class RunCase(db.Model):
-    """런에 포함된 케이스 스냅샷"""
+    """런에 포함된 케이스 (내용 스냅샷은 CaseSnapshot 참조)"""
     __tablename__ = 'run_cases'
     
     id = db.Column(db.Integer, primary_key=True)
     run_id = db.Column(db.Integer, db.ForeignKey('runs.id'), nullable=False, index=True)
     case_id = db.Column(db.Integer, db.ForeignKey('cases.id'), nullable=False, index=True)
     order_index = db.Column(db.Integer, default=0)
-    # Phase 1: 런에 포함된 시점의 케이스 버전 및 내용 스냅샷
-    case_version_snapshot = db.Column(db.Integer)  # 케이스 버전
-    title_snapshot = db.Column(db.String(500))  # 제목 스냅샷
-    steps_snapshot = db.Column(db.Text)  # 단계 스냅샷
-    expected_result_snapshot = db.Column(db.Text)  # 예상 결과 스냅샷
-    priority_snapshot = db.Column(db.String(10))  # 우선순위 스냅샷 (Phase 1 수정)
-    jira_links_snapshot = db.Column(db.Text)  # 케이스 Jira 링크 스냅샷(쉼표/개행)
-    media_names_snapshot = db.Column(db.Text)  # 케이스 미디어 파일명 스냅샷(쉼표/개행)
+    # Phase 1: 런에 포함된 시점의 케이스 버전 및 내용 스냅샷 (중복 제거된 case_snapshots 행)
+    snapshot_id = db.Column(db.Integer, db.ForeignKey('case_snapshots.id'), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    snapshot = db.relationship('CaseSnapshot', lazy='joined')
+
+    # 기존 *_snapshot 속성 이름 유지 (읽기 전용)
+    @property
+    def case_version_snapshot(self):
+        return self.snapshot.case_version if self.snapshot else None
+
+    @property
+    def title_snapshot(self):
+        return self.snapshot.title if self.snapshot else None
+
+    @property
+    def steps_snapshot(self):
+        return self.snapshot.steps if self.snapshot else None
+
+    @property
+    def expected_result_snapshot(self):
+        return self.snapshot.expected_result if self.snapshot else None
+
+    @property
+    def priority_snapshot(self):
+        return self.snapshot.priority if self.snapshot else None
+
+    @property
+    def jira_links_snapshot(self):
+        return self.snapshot.jira_links if self.snapshot else None
+
+    @property
+    def media_names_snapshot(self):
+        return self.snapshot.media_names if self.snapshot else None
     
     def get_latest_result(self):
-        """이 런케이스의 최신 '실행 결과' 반환 (코멘트 전용 결과(status='comment') 제외)
-
-        주의:
-        - 코멘트는 Phase 1에서 Result(status='comment')로 별도 저장되므로,
-          실행 상태(pass/fail/...)를 덮어쓰지 않도록 여기서는 제외한다.
-        """
+        """이 런케이스의 최신 실행 결과 반환 (코멘트/산출물은 별도 테이블: RunCaseComment/RunCaseArtifact)"""
         return Result.query.filter(
             Result.run_id == self.run_id,
-            Result.case_id == self.case_id,
-            Result.status.notin_(['comment', 'artifact'])
-        ).order_by(Result.created_at.desc()).first()
+            Result.case_id == self.case_id
+        ).order_by(Result.created_at.desc(), Result.id.desc()).first()
     
     def __repr__(self):
         return f'<RunCase run_id={self.run_id} case_id={self.case_id}>'
@@ -439,6 +459,11 @@ class Result(db.Model):
     comment = db.Column(db.Text)
     bug_links = db.Column(db.Text)  # Phase 1: 버그 링크 (JSON 배열 또는 쉼표 구분 문자열)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        # (run, case)별 최신 결과 조회/런 통계 집계용
+        db.Index('ix_results_run_case_created', 'run_id', 'case_id', 'created_at'),
+    )
     
     # Relationships
     attachments = db.relationship('Attachment', backref='result', lazy='dynamic', cascade='all, delete-orphan')
@@ -447,12 +472,60 @@ class Result(db.Model):
         return f'<Result {self.status} for case_id={self.case_id}>'
 
 
+class RunCaseComment(db.Model):
+    """런 케이스 코멘트 (실행 결과와 무관하게 남기는 코멘트)"""
+    __tablename__ = 'run_case_comments'
+
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('runs.id'), nullable=False)
+    case_id = db.Column(db.Integer, db.ForeignKey('cases.id'), nullable=False, index=True)
+    author_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    comment = db.Column(db.Text, nullable=False, default='')
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_run_case_comments_run_case_created', 'run_id', 'case_id', 'created_at'),
+    )
+
+    run = db.relationship('Run', backref=db.backref('comments', lazy='dynamic', cascade='all, delete-orphan'))
+    author = db.relationship('User')
+
+    def __repr__(self):
+        return f'<RunCaseComment run_id={self.run_id} case_id={self.case_id}>'
+
+
+class RunCaseArtifact(db.Model):
+    """런 케이스 산출물 (결과 입력 없이 저장하는 버그 링크/첨부파일의 소유자, (run, case)당 1개)"""
+    __tablename__ = 'run_case_artifacts'
+
+    id = db.Column(db.Integer, primary_key=True)
+    run_id = db.Column(db.Integer, db.ForeignKey('runs.id'), nullable=False)
+    case_id = db.Column(db.Integer, db.ForeignKey('cases.id'), nullable=False, index=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    bug_links = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('run_id', 'case_id', name='uq_run_case_artifacts_run_case'),
+        db.Index('ix_run_case_artifacts_run_case_created', 'run_id', 'case_id', 'created_at'),
+    )
+
+    run = db.relationship('Run', backref=db.backref('artifacts', lazy='dynamic', cascade='all, delete-orphan'))
+    creator = db.relationship('User')
+    attachments = db.relationship('Attachment', backref='artifact', lazy='dynamic', cascade='all, delete-orphan')
+
+    def __repr__(self):
+        return f'<RunCaseArtifact run_id={self.run_id} case_id={self.case_id}>'
+
+
 class Attachment(db.Model):
-    """첨부파일 모델"""
+    """첨부파일 모델 (실행 결과 또는 런 케이스 산출물에 첨부)"""
     __tablename__ = 'attachments'
     
     id = db.Column(db.Integer, primary_key=True)
-    result_id = db.Column(db.Integer, db.ForeignKey('results.id'), nullable=False, index=True)
+    result_id = db.Column(db.Integer, db.ForeignKey('results.id'), nullable=True, index=True)
+    artifact_id = db.Column(db.Integer, db.ForeignKey('run_case_artifacts.id'), nullable=True, index=True)
     file_path = db.Column(db.String(500), nullable=False)
     original_name = db.Column(db.String(300), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
@@ -461,6 +534,119 @@ class Attachment(db.Model):
         return f'<Attachment {self.original_name}>'
 
 
+class Blob(db.Model):
+    """내용 주소(SHA-256) 파일 저장소의 blob 1개 (app.utils.blob_store)
+
+    파일 위치: <BLOB_STORE_DIR>/<sha[:2]>/<sha[2:4]>/<sha>
+    ref_count: 이 파일을 가리키는 Attachment/CaseMedia/FeedbackAttachment/아바타 수
+    """
+    __tablename__ = 'blobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), nullable=False, unique=True)
+    size = db.Column(db.BigInteger, nullable=False, default=0)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # 참조 수 변경 시각 (GC 유예 기준)
+
+    def __repr__(self):
+        return f'<Blob {self.sha256[:12]} refs={self.ref_count}>'
+
+
+class ResultArchive(db.Model):
+    """종료된 런의 대체된(superseded) 실행 결과 보관
+
+    - close_run 시 (run, case)별 최신 실행 결과가 아닌 이력을 results에서 옮겨 온다 (app/utils/result_archive.py)
+    - 첨부파일/버그 링크가 있는 결과는 옮기지 않는다
+    - id는 원래 Result.id를 그대로 사용
+    """
+    __tablename__ = 'result_archive'
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    run_id = db.Column(db.Integer, db.ForeignKey('runs.id'), nullable=False)
+    case_id = db.Column(db.Integer, db.ForeignKey('cases.id'), nullable=False, index=True)
+    executor_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    comment = db.Column(db.Text)
+    bug_links = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_result_archive_run_case_created', 'run_id', 'case_id', 'created_at'),
+    )
+
+    run = db.relationship('Run', backref=db.backref('archived_results', lazy='dynamic', cascade='all, delete-orphan'))
+    case = db.relationship('Case')
+    executor = db.relationship('User')
+
+    def __repr__(self):
+        return f'<ResultArchive {self.status} for case_id={self.case_id}>'
+
+
+class CaseResultDaily(db.Model):
+    """케이스별 일간 결과 집계 (analytics rollup)
+
+    - Result 기록/수정/삭제 시 해당 (case, day) 행만 다시 계산 (app/utils/analytics_rollup.py)
+    - day는 UTC 기준 (Result.created_at과 동일)
+    """
+    __tablename__ = 'case_result_daily'
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    case_id = db.Column(db.Integer, db.ForeignKey('cases.id', ondelete='CASCADE'), nullable=False, index=True)
+    day = db.Column(db.Date, nullable=False)
+    total_count = db.Column(db.Integer, nullable=False, default=0)
+    pass_count = db.Column(db.Integer, nullable=False, default=0)
+    fail_count = db.Column(db.Integer, nullable=False, default=0)
+    blocked_count = db.Column(db.Integer, nullable=False, default=0)
+    last_result_at = db.Column(db.DateTime)
+    last_fail_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        db.UniqueConstraint('case_id', 'day', name='uq_case_result_daily_case_day'),
+        db.Index('ix_case_result_daily_project_day', 'project_id', 'day'),
+    )
+
+    project = db.relationship('Project', backref=db.backref('result_rollups', lazy='dynamic', cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<CaseResultDaily case_id={self.case_id} day={self.day}>'
+
+
+class CaseFlakiness(db.Model):
+    """케이스별 불안정성(flakiness) 상태
+
+    - 런 순서(run_id)대로 본 케이스의 최종 pass/fail 결과 사이의 전환(flip) 수를 누적
+    - ewma_flip_rate: 최근 전환에 가중치를 둔 전환율, confidence: 관측 수 기반 신뢰도
+    - flaky_score = ewma_flip_rate * confidence (project_id, flaky_score 인덱스로 순위 조회)
+    - 갱신 로직: app/utils/flakiness.py
+    """
+    __tablename__ = 'case_flakiness'
+
+    case_id = db.Column(db.Integer, db.ForeignKey('cases.id', ondelete='CASCADE'), primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    observations = db.Column(db.Integer, nullable=False, default=0)  # pass/fail로 끝난 런 수
+    pass_observations = db.Column(db.Integer, nullable=False, default=0)
+    flips = db.Column(db.Integer, nullable=False, default=0)
+    ewma_flip_rate = db.Column(db.Float, nullable=False, default=0.0)
+    confidence = db.Column(db.Float, nullable=False, default=0.0)
+    flaky_score = db.Column(db.Float, nullable=False, default=0.0)
+    last_run_id = db.Column(db.Integer, nullable=True)
+    last_status = db.Column(db.String(20), nullable=True)
+    last_observed_at = db.Column(db.DateTime, nullable=True)
+    last_flip_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        db.Index('ix_case_flakiness_project_score', 'project_id', 'flaky_score'),
+    )
+
+    project = db.relationship('Project', backref=db.backref('case_flakiness', lazy='dynamic', cascade='all, delete-orphan'))
+
+    def __repr__(self):
+        return f'<CaseFlakiness case_id={self.case_id} score={self.flaky_score:.3f}>'
+
+
 class AuditLog(db.Model):
     """감사 로그 모델 (Phase 2)"""
     __tablename__ = 'audit_logs'
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify, current_app, send_file
+from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 from datetime import datetime
@@ -6,9 +6,12 @@ import os
 import requests
 import mimetypes
 from app import db
-from app.models import Project, Section, Case, Tag, CaseTag, Run, RunCase, Result, Attachment, RunTemplate, User, CaseTranslation, TranslationPrompt, APIKey, TranslationUsage, JiraConfig, ActivityLog, CaseJiraLink, CaseMedia
+from app.models import Project, Section, Case, Tag, CaseTag, Run, RunCase, Result, Attachment, RunTemplate, User, CaseTranslation, TranslationPrompt, APIKey, TranslationUsage, JiraConfig, ActivityLog, CaseJiraLink, CaseMedia, RunCaseComment, RunCaseArtifact
 from app.utils.translator import detect_language, translate_case, translate_cases_batch, TranslationError
 from app.utils.activity import log_activity_safe
+from app.utils.analytics_rollup import refresh_result_rollups_safe
+from app.utils.flakiness import record_result_flakiness_safe, recompute_case_flakiness_safe
+from app.utils.run_stats import invalidate_project_run_stats
 from sqlalchemy import func
 from sqlalchemy.orm import selectinload, joinedload
 
@@ -116,26 +119,43 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
 
-def _get_or_create_artifact_result(run_id: int, case_id: int) -> Result:
+def _refresh_result_analytics(run_id: int, case_id: int, *timestamps) -> None:
+    """결과 기록/수정/삭제 후 analytics(일간 rollup, flakiness, 대시보드 런 통계 캐시) 갱신"""
+    refresh_result_rollups_safe([(case_id, ts) for ts in timestamps])
+    record_result_flakiness_safe(run_id, case_id)
+    run = db.session.get(Run, run_id)
+    if run:
+        invalidate_project_run_stats(run.project_id)
+
+
+def _run_result_keys(run_id: int) -> set:
+    """런의 실행 결과 이력(results + result_archive)이 걸친 (case_id, created_at) - 삭제 전에 모아 rollup 갱신에 사용"""
+    from app.models import ResultArchive
+
+    keys = set()
+    for model in (Result, ResultArchive):
+        keys.update(db.session.query(model.case_id, model.created_at).filter(model.run_id == run_id).all())
+    return keys
+
+
+def _get_or_create_artifact(run_id: int, case_id: int) -> RunCaseArtifact:
     """
     결과(status) 없이도 버그링크/첨부파일을 저장할 수 있도록,
-    (run_id, case_id) 단위로 하나의 'artifact' Result를 유지한다.
+    (run_id, case_id) 단위로 하나의 RunCaseArtifact를 유지한다.
     """
-    existing = Result.query.filter_by(run_id=run_id, case_id=case_id, status='artifact').first()
+    existing = RunCaseArtifact.query.filter_by(run_id=run_id, case_id=case_id).first()
     if existing:
         return existing
 
-    r = Result(
+    artifact = RunCaseArtifact(
         run_id=run_id,
         case_id=case_id,
-        executor_id=current_user.id,
-        status='artifact',
-        comment='',
+        created_by=current_user.id,
         bug_links=''
     )
-    db.session.add(r)
+    db.session.add(artifact)
     db.session.commit()
-    return r
+    return artifact
 
 
 # ============ Auth API ============
@@ -188,6 +208,19 @@ def presence_online():
     return jsonify({'count': len(users), 'users': users})
 
 
+@bp.route('/jobs/<job_id>', methods=['GET'])
+@login_required
+def get_background_job(job_id):
+    """백그라운드 작업 진행 상태 조회 (요청자 또는 관리자)"""
+    from app.utils.jobs import get_job
+    job = get_job(job_id)
+    if not job:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+    if job.user_id != current_user.id and current_user.role != 'admin':
+        return jsonify({'error': '권한이 없습니다'}), 403
+    return jsonify(job.to_dict())
+
+
 # ============ User Management API (Admin) ============
 
 @bp.route('/users', methods=['GET'])
@@ -323,28 +356,32 @@ def delete_profile():
 @login_required
 def profile_avatar():
     """프로필 이미지 조회/업로드/삭제"""
-    # GET: 현재 사용자 아바타 반환
+    from app.utils.blob_store import avatar_blob_path, avatar_file_path, avatar_filename, put_upload, release_paths
+    from app.utils.media_serving import send_media
+
+    # GET: 현재 사용자 아바타 반환 (?v=<버전>이 맞으면 immutable 캐시)
     if request.method == 'GET':
         filename = current_user.avatar_filename
         if not filename:
             return jsonify({'error': '프로필 이미지가 없습니다'}), 404
 
-        avatar_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'avatars')
-        filepath = os.path.join(avatar_dir, filename)
+        filepath = avatar_file_path(filename)
         if not os.path.exists(filepath):
             return jsonify({'error': '프로필 이미지 파일을 찾을 수 없습니다'}), 404
-        return send_file(filepath)
+        guessed_type, _ = mimetypes.guess_type(filename)
+        return send_media(filepath, mimetype=guessed_type)
 
     # DELETE: 아바타 제거
     if request.method == 'DELETE':
         old = current_user.avatar_filename
         current_user.avatar_filename = None
+        # blob 아바타는 참조 수만 줄이고(파일은 GC가 정리), 이전 방식 파일은 바로 삭제
+        released = release_paths([avatar_blob_path(old)]) if old else 0
         db.session.commit()
 
-        if old:
+        if old and not released:
             try:
-                avatar_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'avatars')
-                old_path = os.path.join(avatar_dir, old)
+                old_path = avatar_file_path(old)
                 if os.path.exists(old_path):
                     os.remove(old_path)
             except Exception:
@@ -370,24 +407,20 @@ def profile_avatar():
     if not allowed_file(file.filename):
         return jsonify({'error': '허용되지 않은 파일 형식입니다'}), 400
 
-    avatar_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'avatars')
-    os.makedirs(avatar_dir, exist_ok=True)
-
     original = secure_filename(file.filename)
     ext = original.rsplit('.', 1)[1].lower() if '.' in original else 'png'
-    ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"user_{current_user.id}_{ts}.{ext}"
-    filepath = os.path.join(avatar_dir, filename)
-    file.save(filepath)
+    stored = put_upload(file)
+    filename = avatar_filename(stored, ext)
 
     # 이전 파일 정리
     old = current_user.avatar_filename
     current_user.avatar_filename = filename
+    released = release_paths([avatar_blob_path(old)]) if old else 0
     db.session.commit()
 
-    if old and old != filename:
+    if old and not released and old != filename:
         try:
-            old_path = os.path.join(avatar_dir, old)
+            old_path = avatar_file_path(old)
             if os.path.exists(old_path):
                 os.remove(old_path)
         except Exception:
@@ -525,56 +558,36 @@ def copy_project(project_id):
     
     original_project = Project.query.get_or_404(project_id)
     
-    # 새 프로젝트 생성
+    # 새 프로젝트 생성 (내용 복제는 백그라운드 작업에서 배치 단위로 진행)
     new_project = Project(
         name=f"{original_project.name} (복사본)",
         description=original_project.description
     )
     db.session.add(new_project)
-    db.session.flush()
-    
-    # 섹션 복제 (재귀적으로)
-    def copy_sections(parent_section, new_parent_id=None):
-        sections = Section.query.filter_by(
-            project_id=original_project.id,
-            parent_id=parent_section.id if parent_section else None
-        ).all()
-        
-        for section in sections:
-            new_section = Section(
-                project_id=new_project.id,
-                parent_id=new_parent_id,
-                name=section.name,
-                order_index=section.order_index
-            )
-            db.session.add(new_section)
-            db.session.flush()
-            
-            # 하위 섹션 복제
-            copy_sections(section, new_section.id)
-            
-            # 케이스 복제
-            cases = Case.query.filter_by(section_id=section.id).all()
-            for case in cases:
-                new_case = Case(
-                    project_id=new_project.id,
-                    section_id=new_section.id,
-                    title=case.title,
-                    steps=case.steps,
-                    expected_result=case.expected_result,
-                    priority=case.priority,
-                    order_index=case.order_index
-                )
-                db.session.add(new_case)
-    
-    copy_sections(None)
     db.session.commit()
+
+    from app.utils.jobs import submit_job
+    from app.utils.project_copy import copy_project_contents
+    job = submit_job(
+        'project_copy', copy_project_contents, original_project.id, new_project.id, current_user.id,
+        user_id=current_user.id, project_id=new_project.id
+    )
+
+    log_activity_safe(
+        user_id=current_user.id,
+        action='project.copy',
+        entity_type='project',
+        entity_id=new_project.id,
+        project_id=new_project.id,
+        description=f'프로젝트 복제: {original_project.name}',
+    )
     
     return jsonify({
         'id': new_project.id,
         'name': new_project.name,
-        'description': new_project.description
-    }), 201
+        'description': new_project.description,
+        'job_id': job.id
+    }), 202
 
 
 # ============ Section API ============
@@ -668,29 +681,29 @@ def section(section_id):
             'order_index': section.order_index
         })
     
-    # DELETE
-    # autoflush를 비활성화하여 외래키 제약 조건 문제 방지
-    with db.session.no_autoflush:
-        # 하위 섹션들을 재귀적으로 수집
-        def collect_sections(sec, sections_list):
-            sections_list.append(sec)
-            children = Section.query.filter_by(parent_id=sec.id).all()
-            for child in children:
-                collect_sections(child, sections_list)
-        
-        sections_to_delete = []
-        collect_sections(section, sections_to_delete)
-        
-        # 모든 섹션의 케이스들을 먼저 삭제 (archived가 아닌 완전 삭제)
-        for sec in sections_to_delete:
-            # 해당 섹션의 모든 케이스를 삭제
-            Case.query.filter_by(section_id=sec.id).delete()
-        
-        # 섹션들을 역순으로 삭제 (자식부터 부모 순서)
-        for sec in reversed(sections_to_delete):
-            db.session.delete(sec)
-    
+    # DELETE: 하위 섹션/케이스/런 기록까지 set 기반으로 일괄 삭제
+    from app.utils.section_delete import delete_section_tree, cleanup_orphan_files
+    project_id = section.project_id
+    section_name = section.name
+    summary = delete_section_tree(section.id)
     db.session.commit()
+    # 삭제된 케이스의 결과/런 케이스가 빠졌으므로 런 진행률/통과율 캐시 무효화
+    invalidate_project_run_stats(project_id)
+
+    # 미디어/첨부 파일은 커밋 이후 백그라운드에서 정리
+    if summary['file_paths']:
+        from app.utils.jobs import submit_job
+        submit_job('file_cleanup', cleanup_orphan_files, summary['file_paths'],
+                   user_id=current_user.id, project_id=project_id)
+
+    log_activity_safe(
+        user_id=current_user.id,
+        action='section.delete',
+        entity_type='section',
+        entity_id=section_id,
+        project_id=project_id,
+        description=f"섹션 삭제: {section_name} (하위 섹션 {summary['sections']}개, 케이스 {summary['cases']}개)",
+    )
     return '', 204
 
 
@@ -858,6 +871,9 @@ def case(case_id):
     
     if request.method == 'GET':
         jira_links = [l.url for l in CaseJiraLink.query.filter_by(case_id=case.id).order_by(CaseJiraLink.created_at.desc()).all()]
+        from app.utils.media_serving import versioned_url
+        from app.utils.thumbnails import thumbnail_url
+
         media_items = CaseMedia.query.filter_by(case_id=case.id).order_by(CaseMedia.created_at.desc()).all()
         return jsonify({
             'id': case.id,
@@ -875,7 +891,8 @@ def case(case_id):
             'media': [{
                 'id': m.id,
                 'original_name': m.original_name,
-                'url': f'/api/case-media/{m.id}'
+                'url': versioned_url(f'/api/case-media/{m.id}', m.file_path),
+                'thumbnail_url': thumbnail_url(f'/api/case-media/{m.id}', m.file_path),
             } for m in media_items],
             'version': case.version or 1,  # Phase 1: 버전 정보 추가
             'created_at': case.created_at.isoformat(),
@@ -1068,11 +1085,15 @@ def case_media(case_id):
     case = Case.query.get_or_404(case_id)
 
     if request.method == 'GET':
+        from app.utils.media_serving import versioned_url
+        from app.utils.thumbnails import thumbnail_url
+
         items = CaseMedia.query.filter_by(case_id=case_id).order_by(CaseMedia.created_at.desc()).all()
         return jsonify([{
             'id': m.id,
             'original_name': m.original_name,
-            'url': f'/api/case-media/{m.id}',
+            'url': versioned_url(f'/api/case-media/{m.id}', m.file_path),
+            'thumbnail_url': thumbnail_url(f'/api/case-media/{m.id}', m.file_path),
             'created_at': m.created_at.isoformat() if m.created_at else None
         } for m in items])
 
@@ -1087,19 +1108,14 @@ def case_media(case_id):
     if not allowed_file(file.filename):
         return jsonify({'error': '허용되지 않은 파일 형식입니다'}), 400
 
-    media_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'case_media')
-    os.makedirs(media_dir, exist_ok=True)
+    from app.utils.blob_store import put_upload
 
     original = file.filename
-    filename = secure_filename(original)
-    ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-    stored = f"{ts}_{filename}"
-    filepath = os.path.join(media_dir, stored)
-    file.save(filepath)
+    stored = put_upload(file)
 
     m = CaseMedia(
         case_id=case_id,
-        file_path=filepath,
+        file_path=stored.path,
         original_name=original,
         mime_type=file.mimetype,
         created_by=current_user.id
@@ -1107,6 +1123,9 @@ def case_media(case_id):
     db.session.add(m)
     db.session.commit()
 
+    from app.utils.thumbnails import schedule_thumbnails
+    schedule_thumbnails([(m.file_path, original)], user_id=current_user.id, project_id=case.project_id)
+
     log_activity_safe(
         user_id=current_user.id,
         action='case.media.upload',
@@ -1116,7 +1135,22 @@ def case_media(case_id):
         description=f'케이스 미디어 업로드: {original}',
     )
 
-    return jsonify({'id': m.id, 'original_name': m.original_name, 'url': f'/api/case-media/{m.id}'}), 201
+    from app.utils.media_serving import versioned_url
+    return jsonify({'id': m.id, 'original_name': m.original_name, 'url': versioned_url(f'/api/case-media/{m.id}', m.file_path)}), 201
+
+
+@bp.route('/case-media/<int:media_id>/thumbnail', methods=['GET'])
+@login_required
+def get_case_media_thumbnail(media_id):
+    """케이스 미디어 썸네일 (WebP, 아직 없으면 404)"""
+    from app.utils.media_serving import send_media
+    from app.utils.thumbnails import thumbnail_path
+
+    media = CaseMedia.query.get_or_404(media_id)
+    path = thumbnail_path(media.file_path)
+    if not path or not os.path.exists(path):
+        return jsonify({'error': '썸네일이 없습니다'}), 404
+    return send_media(path, mimetype='image/webp')
 
 
 @bp.route('/case-media/<int:media_id>', methods=['GET', 'DELETE'])
@@ -1130,14 +1164,21 @@ def get_case_media(media_id):
         if current_user.role not in ['admin', 'author']:
             return jsonify({'error': '권한이 없습니다'}), 403
 
+        from app.utils.blob_store import release_paths
+
         file_path = media.file_path
         db.session.delete(media)
+        # blob 파일은 참조 수만 줄인다 (파일은 GC가 정리)
+        released = release_paths([file_path])
         db.session.commit()
-        try:
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
-        except Exception:
-            pass
+        # 이전 방식 파일: Import 미디어는 같은 파일을 여러 케이스가 공유할 수 있으므로, 마지막 참조일 때만 파일 삭제
+        if not released:
+            still_used = CaseMedia.query.filter_by(file_path=file_path).first() is not None
+            try:
+                if file_path and not still_used and os.path.exists(file_path):
+                    os.remove(file_path)
+            except Exception:
+                pass
 
         log_activity_safe(
             user_id=current_user.id,
@@ -1150,9 +1191,11 @@ def get_case_media(media_id):
 
         return jsonify({'success': True})
 
+    from app.utils.media_serving import send_media
+
     download = request.args.get('download', '0') in ['1', 'true', 'True', 'yes', 'y']
     guessed_type, _ = mimetypes.guess_type(media.original_name or media.file_path)
-    return send_file(
+    return send_media(
         media.file_path,
         as_attachment=download,
         download_name=media.original_name,
@@ -1452,21 +1495,49 @@ def tags(project_id):
 @bp.route('/projects/<int:project_id>/runs', methods=['GET', 'POST'])
 @login_required
 def runs(project_id):
-    """런 목록 조회 / 생성"""
+    """
+    런 목록 조회 / 생성
+
+    GET 파라미터:
+    - page, per_page (기본 20, 최대 200)
+    - run_type, build_label, created_by, date_from, date_to (YYYY-MM-DD), status (open|closed)
+    - fields=summary: 최소 필드만 반환
+    - stats=0: 통계 생략
+    페이지/필터 파라미터가 하나라도 있으면 {runs, page, per_page, total, pages},
+    없으면 기존과 같이 전체 런 배열을 반환한다.
+    """
     project = Project.query.get_or_404(project_id)
-    
+
     if request.method == 'GET':
-        runs = Run.query.filter_by(project_id=project_id).order_by(Run.created_at.desc()).all()
-        return jsonify([{
-            'id': r.id,
-            'name': r.name,
-            'description': r.description,
-            'run_type': r.run_type,
-            'is_closed': r.is_closed,
-            'created_by': r.creator.name,
-            'created_at': r.created_at.isoformat(),
-            'stats': r.get_stats()
-        } for r in runs])
+        from app.utils.run_listing import (
+            DEFAULT_PER_PAGE, RunListFilterError, list_runs, paging_requested, parse_run_filters, serialize_run
+        )
+        try:
+            filters = parse_run_filters(request.args)
+        except RunListFilterError as e:
+            return jsonify({'error': str(e)}), 400
+
+        summary_only = (request.args.get('fields') or '').strip().lower() == 'summary'
+        with_stats = request.args.get('stats', '1') not in ('0', 'false')
+        paged = paging_requested(request.args)
+        result = list_runs(
+            project_id,
+            filters,
+            page=request.args.get('page', 1, type=int),
+            per_page=request.args.get('per_page', DEFAULT_PER_PAGE, type=int) if paged else None,
+            with_stats=with_stats
+        )
+        items = [serialize_run(r, result.stats.get(r.id) if with_stats else None, summary_only)
+                 for r in result.runs]
+        if not paged:
+            return jsonify(items)
+        return jsonify({
+            'runs': items,
+            'page': result.page,
+            'per_page': result.per_page,
+            'total': result.total,
+            'pages': result.pages,
+        })
     
     # POST: 런 생성
     data = request.get_json()
@@ -1486,44 +1557,15 @@ def runs(project_id):
     db.session.add(run)
     db.session.flush()
     
-    # RunCase 스냅샷 생성 (언어 선택 지원)
+    # RunCase 스냅샷 생성 (언어 선택 지원, 동일 내용 스냅샷은 재사용)
     case_ids = data.get('case_ids', [])
 
-    # 케이스 Jira/미디어 스냅샷(문자열)
-    jira_map = {}
-    media_map = {}
-    if case_ids:
-        for l in CaseJiraLink.query.filter(CaseJiraLink.case_id.in_(case_ids)).all():
-            jira_map.setdefault(l.case_id, []).append(l.url)
-        for m in CaseMedia.query.filter(CaseMedia.case_id.in_(case_ids)).all():
-            media_map.setdefault(m.case_id, []).append(m.original_name)
-
     translations = {}
     if language in ['ko', 'en']:
         translations, _, _ = _ensure_case_translations(case_ids, language, force=False)
 
-    for idx, case_id in enumerate(case_ids):
-        case = Case.query.get(case_id)
-        if case:
-            t = translations.get(case_id) if language in ['ko', 'en'] else None
-            title_snapshot = (t or {}).get('title') or case.title
-            steps_snapshot = (t or {}).get('steps') or case.steps
-            expected_snapshot = (t or {}).get('expected_result') or case.expected_result
-
-            run_case = RunCase(
-                run_id=run.id,
-                case_id=case_id,
-                order_index=idx,
-                case_version_snapshot=case.version,
-                title_snapshot=title_snapshot,
-                steps_snapshot=steps_snapshot,
-                expected_result_snapshot=expected_snapshot,
-                priority_snapshot=case.priority  # Phase 1 수정: 우선순위 스냅샷
-                ,
-                jira_links_snapshot=' | '.join(jira_map.get(case_id, [])),
-                media_names_snapshot=' | '.join(media_map.get(case_id, []))
-            )
-            db.session.add(run_case)
+    from app.utils.case_snapshots import add_run_cases
+    add_run_cases(run.id, case_ids, language, translations)
     
     db.session.commit()
 
@@ -1558,9 +1600,15 @@ def get_run(run_id):
         
         run_name = run.name
         project_id = run.project_id
+        touched = _run_result_keys(run.id)
         db.session.delete(run)
         db.session.commit()
 
+        # 삭제된 결과가 집계되어 있던 일간 rollup/flakiness/대시보드 통계 갱신
+        refresh_result_rollups_safe(touched)
+        recompute_case_flakiness_safe([case_id for case_id, _ in touched])
+        invalidate_project_run_stats(project_id)
+
         log_activity_safe(
             user_id=current_user.id,
             action='run.delete',
@@ -1589,40 +1637,22 @@ def close_run(run_id):
     """런 종료 - Phase 1 개선: 런 완료 시점의 케이스 스냅샷 저장"""
     run = Run.query.get_or_404(run_id)
     
-    # 런 완료 시점의 케이스 스냅샷 저장
+    # 런 완료 시점의 케이스 스냅샷 저장: 바뀐 케이스만 다시 스냅샷 (동일 내용 스냅샷은 재사용)
     language = getattr(run, 'language', None) or 'original'
-    case_ids = [rc.case_id for rc in run.run_cases]
-    translations = {}
-    if language in ['ko', 'en'] and case_ids:
-        translations, _, _ = _ensure_case_translations(case_ids, language, force=False)
-
-    jira_map = {}
-    media_map = {}
-    if case_ids:
-        for l in CaseJiraLink.query.filter(CaseJiraLink.case_id.in_(case_ids)).all():
-            jira_map.setdefault(l.case_id, []).append(l.url)
-        for m in CaseMedia.query.filter(CaseMedia.case_id.in_(case_ids)).all():
-            media_map.setdefault(m.case_id, []).append(m.original_name)
-
-    for rc in run.run_cases:
-        case = rc.case
-        rc.case_version_snapshot = case.version or 1
-        if language in ['ko', 'en']:
-            t = translations.get(rc.case_id) or {}
-            rc.title_snapshot = t.get('title') or case.title
-            rc.steps_snapshot = t.get('steps') or case.steps
-            rc.expected_result_snapshot = t.get('expected_result') or case.expected_result
-        else:
-            rc.title_snapshot = case.title
-            rc.steps_snapshot = case.steps
-            rc.expected_result_snapshot = case.expected_result
-        rc.priority_snapshot = case.priority
-        rc.jira_links_snapshot = ' | '.join(jira_map.get(rc.case_id, []))
-        rc.media_names_snapshot = ' | '.join(media_map.get(rc.case_id, []))
+    from app.utils.case_snapshots import refresh_run_snapshots
+    refreshed_count = refresh_run_snapshots(
+        run.id,
+        language,
+        translate=lambda ids: _ensure_case_translations(ids, language, force=False)[0]
+    )
     
     run.is_closed = True
     db.session.commit()
 
+    # 대체된 실행 결과 이력을 보관 테이블로 이동 (results에는 최종 결과만 유지)
+    from app.utils.result_archive import archive_superseded_results_safe
+    archived_count = archive_superseded_results_safe(run.id)
+
     log_activity_safe(
         user_id=current_user.id,
         action='run.close',
@@ -1630,9 +1660,10 @@ def close_run(run_id):
         entity_id=run.id,
         project_id=run.project_id,
         description=f'런 완료(닫기): {run.name}',
+        meta={'archived_results': archived_count, 'refreshed_snapshots': refreshed_count},
     )
     
-    return jsonify({'is_closed': True})
+    return jsonify({'is_closed': True, 'archived_results': archived_count, 'refreshed_snapshots': refreshed_count})
 
 
 @bp.route('/runs/<int:run_id>/reopen', methods=['POST'])
@@ -1712,7 +1743,7 @@ def generate_run_summary(run_id):
         
         for rc in run.run_cases.order_by(RunCase.order_index):
             result = rc.get_latest_result()
-            if result and result.status != 'comment':
+            if result:
                 # 완료된 런의 경우 스냅샷 데이터 사용, 진행 중인 경우 현재 데이터 사용
                 if run.is_closed:
                     case_title = rc.title_snapshot or rc.case.title
@@ -1800,6 +1831,9 @@ def run_cases(run_id):
     run_cases = run.run_cases.order_by(RunCase.order_index).all()
     
     # 케이스 Jira/미디어 사전 로드
+    from app.utils.media_serving import versioned_url
+    from app.utils.thumbnails import thumbnail_url
+
     case_ids = [rc.case_id for rc in run_cases]
     jira_map = {}
     media_map = {}
@@ -1810,7 +1844,8 @@ def run_cases(run_id):
             media_map.setdefault(m.case_id, []).append({
                 'id': m.id,
                 'original_name': m.original_name,
-                'url': f'/api/case-media/{m.id}'
+                'url': versioned_url(f'/api/case-media/{m.id}', m.file_path),
+                'thumbnail_url': thumbnail_url(f'/api/case-media/{m.id}', m.file_path),
             })
 
     result_list = []
@@ -1882,11 +1917,15 @@ def create_result(run_id):
         time_diff = datetime.utcnow() - existing_result.created_at
         if time_diff < timedelta(minutes=5):
             # 기존 결과 업데이트 (Phase 1: bug_links 포함)
+            previous_created_at = existing_result.created_at
             existing_result.status = data['status']
             existing_result.comment = data.get('comment', '')
             existing_result.bug_links = data.get('bug_links', '')
             existing_result.created_at = datetime.utcnow()
             db.session.commit()
+            _refresh_result_analytics(
+                run_id, existing_result.case_id, previous_created_at, existing_result.created_at
+            )
 
             log_activity_safe(
                 user_id=current_user.id,
@@ -1916,6 +1955,7 @@ def create_result(run_id):
     )
     db.session.add(result)
     db.session.commit()
+    _refresh_result_analytics(run_id, result.case_id, result.created_at)
 
     log_activity_safe(
         user_id=current_user.id,
@@ -1976,33 +2016,30 @@ def create_comment(run_id):
     run = Run.query.get_or_404(run_id)
     data = request.get_json()
     
-    # 코멘트만 저장하는 Result 생성 (status='comment')
-    result = Result(
+    comment = RunCaseComment(
         run_id=run_id,
         case_id=data['case_id'],
-        executor_id=current_user.id,
-        status='comment',  # 코멘트 전용 상태
-        comment=data.get('comment', ''),
-        bug_links=''
+        author_id=current_user.id,
+        comment=data.get('comment', '')
     )
-    db.session.add(result)
+    db.session.add(comment)
     db.session.commit()
 
     log_activity_safe(
         user_id=current_user.id,
         action='run.comment.create',
-        entity_type='result',
-        entity_id=result.id,
+        entity_type='comment',
+        entity_id=comment.id,
         project_id=run.project_id,
         description=f'코멘트 작성: {run.name} / case_id={data.get("case_id")}',
         meta={'run_id': run_id, 'case_id': data.get('case_id')},
     )
     
     return jsonify({
-        'id': result.id,
-        'comment': result.comment,
-        'executor': result.executor.name,
-        'created_at': result.created_at.isoformat()
+        'id': comment.id,
+        'comment': comment.comment,
+        'executor': comment.author.name,
+        'created_at': comment.created_at.isoformat()
     }), 201
 
 
@@ -2011,20 +2048,42 @@ def create_comment(run_id):
 def get_case_comments(run_id, case_id):
     """케이스의 모든 코멘트 조회"""
     run = Run.query.get_or_404(run_id)
-    comments = Result.query.filter_by(
+    comments = RunCaseComment.query.options(joinedload(RunCaseComment.author)).filter_by(
         run_id=run_id,
-        case_id=case_id,
-        status='comment'
-    ).order_by(Result.created_at.desc()).all()
+        case_id=case_id
+    ).order_by(RunCaseComment.created_at.desc()).all()
     
     return jsonify([{
         'id': c.id,
         'comment': c.comment,
-        'executor': c.executor.name,
+        'executor': c.author.name,
         'created_at': c.created_at.isoformat()
     } for c in comments])
 
 
+@bp.route('/comments/<int:comment_id>', methods=['DELETE'])
+@login_required
+def delete_comment(comment_id):
+    """코멘트 삭제 (작성자 본인만)"""
+    comment = RunCaseComment.query.get_or_404(comment_id)
+    if comment.author_id != current_user.id:
+        return jsonify({'error': '권한이 없습니다.'}), 403
+
+    project_id = comment.run.project_id if comment.run else None
+    db.session.delete(comment)
+    db.session.commit()
+
+    log_activity_safe(
+        user_id=current_user.id,
+        action='run.comment.delete',
+        entity_type='comment',
+        entity_id=comment_id,
+        project_id=project_id,
+        description=f'코멘트 삭제: comment_id={comment_id}',
+    )
+    return jsonify({'success': True}), 200
+
+
 @bp.route('/runs/<int:run_id>/cases/<int:case_id>/bug-links', methods=['GET', 'PUT'])
 @login_required
 def run_case_bug_links(run_id, case_id):
@@ -2032,33 +2091,40 @@ def run_case_bug_links(run_id, case_id):
     Run.query.get_or_404(run_id)
 
     if request.method == 'GET':
-        # 실행 결과의 bug_links 또는 artifact bug_links 중 최신 non-empty를 반환
+        # 실행 결과의 bug_links 또는 산출물 bug_links 중 최신 non-empty를 반환
+        candidates = []
         latest = Result.query.filter(
             Result.run_id == run_id,
             Result.case_id == case_id,
             Result.bug_links.isnot(None),
             Result.bug_links != ''
         ).order_by(Result.created_at.desc()).first()
-        return jsonify({'bug_links': latest.bug_links if latest else ''})
+        if latest:
+            candidates.append((latest.created_at, latest.bug_links))
+        artifact = RunCaseArtifact.query.filter_by(run_id=run_id, case_id=case_id).first()
+        if artifact and artifact.bug_links:
+            candidates.append((artifact.updated_at, artifact.bug_links))
+        bug_links = max(candidates, key=lambda x: x[0] or datetime.min)[1] if candidates else ''
+        return jsonify({'bug_links': bug_links})
 
     data = request.get_json() or {}
     bug_links = (data.get('bug_links') or '').strip()
 
-    artifact = _get_or_create_artifact_result(run_id, case_id)
+    artifact = _get_or_create_artifact(run_id, case_id)
     artifact.bug_links = bug_links
-    artifact.created_at = datetime.utcnow()
+    artifact.updated_at = datetime.utcnow()
     db.session.commit()
 
     log_activity_safe(
         user_id=current_user.id,
         action='run.bug_links.update',
-        entity_type='result',
+        entity_type='artifact',
         entity_id=artifact.id,
         project_id=artifact.run.project_id if artifact.run else None,
         description=f'버그 링크 저장: run_id={run_id} case_id={case_id}',
     )
 
-    return jsonify({'bug_links': artifact.bug_links, 'result_id': artifact.id})
+    return jsonify({'bug_links': artifact.bug_links, 'artifact_id': artifact.id})
 
 
 @bp.route('/runs/<int:run_id>/cases/<int:case_id>/attachments', methods=['GET', 'POST'])
@@ -2068,15 +2134,23 @@ def run_case_attachments(run_id, case_id):
     Run.query.get_or_404(run_id)
 
     if request.method == 'GET':
-        # 해당 런/케이스의 모든 첨부(결과 status 무관)
-        attachments = Attachment.query.join(Result, Attachment.result_id == Result.id).filter(
-            Result.run_id == run_id,
-            Result.case_id == case_id
-        ).order_by(Attachment.created_at.desc()).all()
+        # 해당 런/케이스의 모든 첨부(실행 결과 첨부 + 산출물 첨부)
+        attachments = Attachment.query \
+            .outerjoin(Result, Attachment.result_id == Result.id) \
+            .outerjoin(RunCaseArtifact, Attachment.artifact_id == RunCaseArtifact.id) \
+            .filter(db.or_(
+                db.and_(Result.run_id == run_id, Result.case_id == case_id),
+                db.and_(RunCaseArtifact.run_id == run_id, RunCaseArtifact.case_id == case_id)
+            )).order_by(Attachment.created_at.desc()).all()
+
+        from app.utils.media_serving import versioned_url
+        from app.utils.thumbnails import thumbnail_url
 
         return jsonify([{
             'id': a.id,
             'original_name': a.original_name,
+            'url': versioned_url(f'/api/attachments/{a.id}', a.file_path),
+            'thumbnail_url': thumbnail_url(f'/api/attachments/{a.id}', a.file_path),
             'created_at': a.created_at.isoformat() if a.created_at else None
         } for a in attachments])
 
@@ -2089,22 +2163,22 @@ def run_case_attachments(run_id, case_id):
     if not allowed_file(file.filename):
         return jsonify({'error': '허용되지 않은 파일 형식입니다'}), 400
 
-    artifact = _get_or_create_artifact_result(run_id, case_id)
+    artifact = _get_or_create_artifact(run_id, case_id)
 
-    filename = secure_filename(file.filename)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"{timestamp}_{filename}"
-    filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-    file.save(filepath)
+    from app.utils.blob_store import put_upload
+    stored = put_upload(file)
 
     attachment = Attachment(
-        result_id=artifact.id,
-        file_path=filepath,
+        artifact_id=artifact.id,
+        file_path=stored.path,
         original_name=file.filename
     )
     db.session.add(attachment)
     db.session.commit()
 
+    from app.utils.thumbnails import schedule_thumbnails
+    schedule_thumbnails([(attachment.file_path, attachment.original_name)], user_id=current_user.id)
+
     log_activity_safe(
         user_id=current_user.id,
         action='attachment.upload',
@@ -2125,15 +2199,17 @@ def run_case_attachments(run_id, case_id):
 @bp.route('/results/<int:result_id>', methods=['DELETE'])
 @login_required
 def delete_result(result_id):
-    """결과/코멘트 삭제"""
+    """결과 삭제 (코멘트는 DELETE /comments/<id>)"""
     result = Result.query.get_or_404(result_id)
     
     # 본인이 작성한 것만 삭제 가능
     if result.executor_id != current_user.id:
         return jsonify({'error': '권한이 없습니다.'}), 403
     
+    run_id, case_id, created_at = result.run_id, result.case_id, result.created_at
     db.session.delete(result)
     db.session.commit()
+    _refresh_result_analytics(run_id, case_id, created_at)
 
     log_activity_safe(
         user_id=current_user.id,
@@ -2141,7 +2217,7 @@ def delete_result(result_id):
         entity_type='result',
         entity_id=result_id,
         project_id=result.run.project_id if result.run else None,
-        description=f'결과/코멘트 삭제: result_id={result_id}',
+        description=f'결과 삭제: result_id={result_id}',
     )
     
     return jsonify({'success': True}), 200
@@ -2150,9 +2226,10 @@ def delete_result(result_id):
 @bp.route('/runs/<int:run_id>/results', methods=['GET'])
 @login_required
 def get_results(run_id):
-    """런의 모든 결과"""
+    """런의 모든 결과 (종료된 런은 보관된 이력 포함)"""
     run = Run.query.get_or_404(run_id)
-    results = Result.query.filter_by(run_id=run_id).order_by(Result.created_at.desc()).all()
+    from app.utils.result_archive import result_history
+    results = result_history(run_id)
     
     return jsonify([{
         'id': r.id,
@@ -2356,6 +2433,29 @@ def export_run_csv(run_id):
     return response
 
 
+@bp.route('/runs/<int:run_id>/attachments.zip', methods=['GET'])
+@login_required
+def export_run_attachments_zip(run_id):
+    """런 첨부파일 일괄 다운로드 (스트리밍 ZIP, ?status=fail 또는 fail,blocked 로 최신 상태 필터)"""
+    from urllib.parse import quote
+    from app.utils.attachment_zip import run_attachment_entries, stream_zip
+
+    run = Run.query.get_or_404(run_id)
+    statuses = [s for s in (request.args.get('status') or '').split(',') if s.strip()]
+    entries = run_attachment_entries(run.id, statuses)
+    if not entries:
+        return jsonify({'error': '다운로드할 첨부파일이 없습니다'}), 404
+
+    # 항목 목록은 위에서 확정했으므로 스트리밍 중에는 DB/요청 컨텍스트가 필요 없다
+    response = current_app.response_class(stream_zip(entries), mimetype='application/zip')
+    suffix = f'_{"_".join(s.strip().lower() for s in statuses)}' if statuses else ''
+    filename = f'run_{run.id}_{run.name}_attachments{suffix}.zip'
+    response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(filename.encode('utf-8'))}"
+    response.headers['Cache-Control'] = 'private, no-store'
+    response.headers['X-Accel-Buffering'] = 'no'  # nginx가 모아서 보내지 않도록 (바로 다운로드 시작)
+    return response
+
+
 @bp.route('/runs/<int:run_id>/wiki-draft/ai-fill', methods=['POST'])
 @login_required
 def ai_fill_run_wiki_draft(run_id):
@@ -2544,9 +2644,15 @@ def reset_run_results(run_id):
     run = Run.query.get_or_404(run_id)
     
     try:
-        # 해당 런의 모든 결과 삭제
+        # 해당 런의 모든 결과 삭제 (삭제 전에 rollup 갱신 대상 수집)
+        touched = _run_result_keys(run_id)
         Result.query.filter_by(run_id=run_id).delete()
+        from app.utils.result_archive import clear_run_archive
+        clear_run_archive(run_id)
         db.session.commit()
+        refresh_result_rollups_safe(touched)
+        recompute_case_flakiness_safe([case_id for case_id, _ in touched])
+        invalidate_project_run_stats(run.project_id)
         
         current_app.logger.info(f'Run {run_id} 결과 초기화 by {current_user.email}')
         return jsonify({'success': True, 'message': '모든 결과가 초기화되었습니다.'})
@@ -2561,12 +2667,10 @@ def reset_run_results(run_id):
 def get_case_result_history(run_id, case_id):
     """특정 케이스의 결과 히스토리"""
     run = Run.query.get_or_404(run_id)
+    from app.utils.result_archive import result_history
     
-    # 해당 런과 케이스의 모든 결과를 시간순으로 조회
-    results = Result.query.filter_by(
-        run_id=run_id,
-        case_id=case_id
-    ).order_by(Result.created_at.desc()).all()
+    # 해당 런과 케이스의 모든 결과를 시간순으로 조회 (종료된 런은 보관된 이력 포함)
+    results = result_history(run_id, case_id)
     
     return jsonify([{
         'id': r.id,
@@ -2578,6 +2682,31 @@ def get_case_result_history(run_id, case_id):
     } for r in results])
 
 
+@bp.route('/runs/<int:base_run_id>/diff/<int:target_run_id>', methods=['GET'])
+@login_required
+def diff_runs(base_run_id, target_run_id):
+    """런 비교 - base 런 대비 target 런의 신규 실패/수정됨/계속 실패/추가/제거/내용 변경 케이스"""
+    from app.utils.run_diff import diff_runs as build_run_diff
+
+    base_run = Run.query.get_or_404(base_run_id)
+    target_run = Run.query.get_or_404(target_run_id)
+    if base_run.project_id != target_run.project_id:
+        return jsonify({'error': '같은 프로젝트의 런만 비교할 수 있습니다'}), 400
+
+    def _run_info(run):
+        return {
+            'id': run.id,
+            'name': run.name,
+            'build_label': run.build_label,
+            'created_at': run.created_at.isoformat() if run.created_at else None,
+        }
+
+    diff = build_run_diff(base_run.id, target_run.id)
+    diff['base_run'] = _run_info(base_run)
+    diff['target_run'] = _run_info(target_run)
+    return jsonify(diff)
+
+
 # ============ Attachment API ============
 
 @bp.route('/results/<int:result_id>/attachments', methods=['POST'])
@@ -2595,22 +2724,21 @@ def upload_attachment(result_id):
         return jsonify({'error': '파일이 선택되지 않았습니다'}), 400
     
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        # 파일명 중복 방지
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"{timestamp}_{filename}"
-        
-        filepath = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        # 내용 해시로 저장 (같은 스크린샷을 여러 결과에 올려도 파일은 1개)
+        from app.utils.blob_store import put_upload
+        stored = put_upload(file)
         
         attachment = Attachment(
             result_id=result_id,
-            file_path=filepath,
+            file_path=stored.path,
             original_name=file.filename
         )
         db.session.add(attachment)
         db.session.commit()
 
+        from app.utils.thumbnails import schedule_thumbnails
+        schedule_thumbnails([(attachment.file_path, attachment.original_name)], user_id=current_user.id)
+
         log_activity_safe(
             user_id=current_user.id,
             action='attachment.upload',
@@ -2630,6 +2758,220 @@ def upload_attachment(result_id):
     return jsonify({'error': '허용되지 않은 파일 형식입니다'}), 400
 
 
+# ============ Resumable Upload API (청크 업로드) ============
+
+def _chunked_upload_target(target_type, target_id, filename):
+    """
+    청크 업로드 대상 검증 -> (대상 객체, 파일 1개 최대 bytes, 에러 응답)
+    result: 실행 결과 첨부 / case_media: 케이스 미디어(admin/author) / feedback: 피드백 첨부(작성자/관리자)
+    """
+    if target_type == 'result':
+        target = Result.query.get(target_id)
+        if not target:
+            return None, None, (jsonify({'error': '실행 결과를 찾을 수 없습니다'}), 404)
+        if not allowed_file(filename):
+            return None, None, (jsonify({'error': '허용되지 않은 파일 형식입니다'}), 400)
+        limit_mb = current_app.config.get('CHUNKED_UPLOAD_MAX_MB')
+    elif target_type == 'case_media':
+        target = Case.query.get(target_id)
+        if not target:
+            return None, None, (jsonify({'error': '케이스를 찾을 수 없습니다'}), 404)
+        if current_user.role not in ['admin', 'author']:
+            return None, None, (jsonify({'error': '권한이 없습니다'}), 403)
+        if not allowed_file(filename):
+            return None, None, (jsonify({'error': '허용되지 않은 파일 형식입니다'}), 400)
+        limit_mb = current_app.config.get('CHUNKED_UPLOAD_MAX_MB')
+    elif target_type == 'feedback':
+        from app.models import FeedbackPost
+        from app.routes.main import _allowed_feedback_file, _is_feedback_admin
+
+        target = FeedbackPost.query.get(target_id)
+        if not target:
+            return None, None, (jsonify({'error': '게시글을 찾을 수 없습니다'}), 404)
+        if target.created_by != current_user.id and not _is_feedback_admin(current_user):
+            return None, None, (jsonify({'error': '권한이 없습니다'}), 403)
+        if not _allowed_feedback_file(filename):
+            return None, None, (jsonify({'error': '허용되지 않은 파일 형식입니다'}), 400)
+        limit_mb = current_app.config.get('FEEDBACK_ATTACHMENT_MAX_MB')
+    else:
+        return None, None, (jsonify({'error': 'target_type은 result/case_media/feedback 중 하나여야 합니다'}), 400)
+
+    max_bytes = max(1, int(limit_mb)) * 1024 * 1024 if limit_mb else current_app.config.get('MAX_CONTENT_LENGTH')
+    return target, max_bytes, None
+
+
+@bp.route('/uploads', methods=['POST'])
+@login_required
+def create_chunked_upload():
+    """
+    청크 업로드 세션 생성
+    body: {target_type, target_id, filename, size, sha256?(전체 파일), mime_type?}
+    응답의 chunk_size 단위로 PUT /api/uploads/<id>/chunks?offset=... 를 보낸다(순서 무관, 병렬 가능).
+    """
+    from app.utils.chunked_upload import create_upload_session
+
+    data = request.get_json(silent=True) or {}
+    target_type = (data.get('target_type') or '').strip()
+    filename = (data.get('filename') or '').strip()
+    try:
+        target_id = int(data.get('target_id'))
+        size = int(data.get('size'))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'target_id/size가 필요합니다'}), 400
+    if not filename:
+        return jsonify({'error': '파일명이 필요합니다'}), 400
+    if size <= 0:
+        return jsonify({'error': '빈 파일은 업로드할 수 없습니다'}), 400
+    sha256 = (data.get('sha256') or '').strip().lower() or None
+    if sha256 and (len(sha256) != 64 or any(c not in '0123456789abcdef' for c in sha256)):
+        return jsonify({'error': 'sha256은 64자리 hex여야 합니다'}), 400
+
+    _, max_bytes, error = _chunked_upload_target(target_type, target_id, filename)
+    if error:
+        return error
+    if max_bytes and size > max_bytes:
+        return jsonify({'error': f'파일 용량 초과 ({max_bytes // (1024 * 1024)}MB)'}), 413
+
+    session = create_upload_session(
+        user_id=current_user.id,
+        target_type=target_type,
+        target_id=target_id,
+        filename=filename,
+        size=size,
+        mime_type=data.get('mime_type') or mimetypes.guess_type(filename)[0],
+        sha256=sha256,
+    )
+    return jsonify(session.status()), 201
+
+
+@bp.route('/uploads/<upload_id>', methods=['GET', 'DELETE'])
+@login_required
+def chunked_upload_status(upload_id):
+    """청크 업로드 상태(받은/빠진 청크) 조회 또는 취소"""
+    from app.utils.chunked_upload import delete_upload_session, get_upload_session
+
+    session = get_upload_session(upload_id, user_id=current_user.id)
+    if not session:
+        return jsonify({'error': '업로드 세션이 없거나 만료되었습니다'}), 404
+    if request.method == 'DELETE':
+        delete_upload_session(session)
+        return jsonify({'success': True})
+    return jsonify(session.status())
+
+
+@bp.route('/uploads/<upload_id>/chunks', methods=['PUT'])
+@login_required
+def put_upload_chunk(upload_id):
+    """
+    청크 1개 업로드 (본문: 청크 바이트)
+    - ?offset=N (chunk_size 배수)
+    - X-Chunk-SHA256: 청크 본문 SHA-256 hex (선택, 불일치 시 422 -> 그 청크만 다시 전송)
+    """
+    from app.utils.chunked_upload import ChunkError, get_upload_session, write_chunk
+
+    session = get_upload_session(upload_id, user_id=current_user.id)
+    if not session:
+        return jsonify({'error': '업로드 세션이 없거나 만료되었습니다'}), 404
+    offset = request.args.get('offset', type=int)
+    if offset is None:
+        return jsonify({'error': 'offset이 필요합니다'}), 400
+    try:
+        index = write_chunk(
+            session, offset, request.stream, request.content_length,
+            sha256=request.headers.get('X-Chunk-SHA256'),
+        )
+    except ChunkError as e:
+        return jsonify({'error': str(e)}), e.status
+    return jsonify({'index': index, 'offset': offset, 'received_chunks': len(session.received())})
+
+
+@bp.route('/uploads/<upload_id>/complete', methods=['POST'])
+@login_required
+def complete_chunked_upload(upload_id):
+    """모든 청크를 받은 업로드를 blob으로 확정하고 대상(Result/CaseMedia/FeedbackPost)에 첨부"""
+    from app.models import FeedbackAttachment
+    from app.utils.blob_store import release_paths
+    from app.utils.chunked_upload import ChunkError, finalize_upload, get_upload_session
+
+    session = get_upload_session(upload_id, user_id=current_user.id)
+    if not session:
+        return jsonify({'error': '업로드 세션이 없거나 만료되었습니다'}), 404
+    meta = session.meta
+    target_type = meta['target_type']
+    filename = meta['filename']
+    target, _, error = _chunked_upload_target(target_type, int(meta['target_id']), filename)
+    if error:
+        return error
+
+    try:
+        stored = finalize_upload(session)
+    except ChunkError as e:
+        return jsonify({'error': str(e)}), e.status
+
+    try:
+        if target_type == 'result':
+            row = Attachment(result_id=target.id, file_path=stored.path, original_name=filename)
+            project_id = target.run.project_id if target.run else None
+            action, entity_type = 'attachment.upload', 'attachment'
+        elif target_type == 'case_media':
+            row = CaseMedia(
+                case_id=target.id, file_path=stored.path, original_name=filename,
+                mime_type=meta.get('mime_type'), created_by=current_user.id,
+            )
+            project_id = target.project_id
+            action, entity_type = 'case.media.upload', 'case'
+        else:
+            row = FeedbackAttachment(
+                post_id=target.id, file_path=stored.path, original_name=filename,
+                mime_type=meta.get('mime_type'), file_size=stored.size, uploaded_by=current_user.id,
+            )
+            project_id = None
+            action, entity_type = 'feedback.attachment.upload', 'feedback'
+        db.session.add(row)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        release_paths([stored.path])
+        db.session.commit()
+        raise
+
+    from app.utils.thumbnails import schedule_thumbnails
+    schedule_thumbnails([(stored.path, filename)], user_id=current_user.id, project_id=project_id)
+
+    log_activity_safe(
+        user_id=current_user.id,
+        action=action,
+        entity_type=entity_type,
+        entity_id=row.id if target_type == 'result' else target.id,
+        project_id=project_id,
+        description=f'청크 업로드 완료: {filename}',
+        meta={'target_type': target_type, 'target_id': target.id, 'size': stored.size},
+    )
+    return jsonify({
+        'id': row.id,
+        'target_type': target_type,
+        'target_id': target.id,
+        'original_name': filename,
+        'size': stored.size,
+        'sha256': stored.sha256,
+        'deduplicated': stored.deduplicated,
+    }), 201
+
+
+@bp.route('/attachments/<int:attachment_id>/thumbnail', methods=['GET'])
+@login_required
+def get_attachment_thumbnail(attachment_id):
+    """첨부파일 썸네일 (WebP, 아직 없으면 404)"""
+    from app.utils.media_serving import send_media
+    from app.utils.thumbnails import thumbnail_path
+
+    attachment = Attachment.query.get_or_404(attachment_id)
+    path = thumbnail_path(attachment.file_path)
+    if not path or not os.path.exists(path):
+        return jsonify({'error': '썸네일이 없습니다'}), 404
+    return send_media(path, mimetype='image/webp')
+
+
 @bp.route('/attachments/<int:attachment_id>', methods=['GET', 'DELETE'])
 @login_required
 def get_attachment(attachment_id):
@@ -2641,17 +2983,20 @@ def get_attachment(attachment_id):
     attachment = Attachment.query.get_or_404(attachment_id)
 
     if request.method == 'DELETE':
-        run = attachment.result.run if attachment.result else None
+        owner = attachment.result or attachment.artifact
+        run = owner.run if owner else None
         if run and run.is_closed:
             return jsonify({'error': '완료된 런은 첨부파일을 삭제할 수 없습니다.'}), 400
 
-        # 권한: 업로더(result.executor) 또는 런 생성자 또는 admin/author
+        # 권한: 업로더(result.executor / artifact.creator) 또는 런 생성자 또는 admin/author
         allowed = False
         try:
             if current_user.role in ['admin', 'author']:
                 allowed = True
             if attachment.result and attachment.result.executor_id == current_user.id:
                 allowed = True
+            if attachment.artifact and attachment.artifact.created_by == current_user.id:
+                allowed = True
             if run and run.created_by == current_user.id:
                 allowed = True
         except Exception:
@@ -2665,14 +3010,18 @@ def get_attachment(attachment_id):
         original = attachment.original_name
         project_id = run.project_id if run else None
 
+        from app.utils.blob_store import release_paths
+
         db.session.delete(attachment)
+        released = release_paths([file_path])
         db.session.commit()
 
-        try:
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
-        except Exception:
-            pass
+        if not released:
+            try:
+                if file_path and os.path.exists(file_path):
+                    os.remove(file_path)
+            except Exception:
+                pass
 
         log_activity_safe(
             user_id=current_user.id,
@@ -2685,9 +3034,11 @@ def get_attachment(attachment_id):
 
         return jsonify({'success': True})
 
+    from app.utils.media_serving import send_media
+
     download = request.args.get('download', '0') in ['1', 'true', 'True', 'yes', 'y']
     guessed_type, _ = mimetypes.guess_type(attachment.original_name or attachment.file_path)
-    return send_file(
+    return send_media(
         attachment.file_path,
         as_attachment=download,
         download_name=attachment.original_name,
@@ -2828,40 +3179,12 @@ def create_run_from_template(template_id):
     # 템플릿의 케이스로 RunCase 생성 (Phase 1: 케이스 버전 및 내용 스냅샷)
     case_ids = [int(id) for id in template.case_ids.split(',') if id] if template.case_ids else []
 
-    jira_map = {}
-    media_map = {}
-    if case_ids:
-        for l in CaseJiraLink.query.filter(CaseJiraLink.case_id.in_(case_ids)).all():
-            jira_map.setdefault(l.case_id, []).append(l.url)
-        for m in CaseMedia.query.filter(CaseMedia.case_id.in_(case_ids)).all():
-            media_map.setdefault(m.case_id, []).append(m.original_name)
-
     translations = {}
     if language in ['ko', 'en'] and case_ids:
         translations, _, _ = _ensure_case_translations(case_ids, language, force=False)
 
-    for idx, case_id in enumerate(case_ids):
-        case = Case.query.get(case_id)
-        if case:
-            t = translations.get(case_id) if language in ['ko', 'en'] else None
-            title_snapshot = (t or {}).get('title') or case.title
-            steps_snapshot = (t or {}).get('steps') or case.steps
-            expected_snapshot = (t or {}).get('expected_result') or case.expected_result
-
-            run_case = RunCase(
-                run_id=run.id,
-                case_id=case_id,
-                order_index=idx,
-                case_version_snapshot=case.version,
-                title_snapshot=title_snapshot,
-                steps_snapshot=steps_snapshot,
-                expected_result_snapshot=expected_snapshot,
-                priority_snapshot=case.priority  # Phase 1 수정: 우선순위 스냅샷
-                ,
-                jira_links_snapshot=' | '.join(jira_map.get(case_id, [])),
-                media_names_snapshot=' | '.join(media_map.get(case_id, []))
-            )
-            db.session.add(run_case)
+    from app.utils.case_snapshots import add_run_cases
+    add_run_cases(run.id, case_ids, language, translations)
     
     db.session.commit()
     
@@ -2876,64 +3199,64 @@ def create_run_from_template(template_id):
 
 # ============ Analytics API (Phase 2) ============
 
+def _analytics_window_days(default: int) -> int:
+    """analytics 조회 기간 (?days=7|30|90 ..., 1~365일)"""
+    days = request.args.get('days', default, type=int) or default
+    return min(max(days, 1), 365)
+
+
 @bp.route('/projects/<int:project_id>/analytics/failed-cases', methods=['GET'])
 @login_required
 def get_failed_cases(project_id):
-    """최근 실패 많은 케이스 Top"""
+    """최근 실패 많은 케이스 Top (기본 30일, ?days=7/30/90)"""
     project = Project.query.get_or_404(project_id)
+    from app.utils.analytics_rollup import case_window_totals
     
-    # 최근 30일 내 결과 집계
-    from datetime import datetime, timedelta
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    
-    # 케이스별 실패 횟수 집계
+    # 일간 rollup에서 케이스별 실패 횟수 집계 (Result 스캔 없음)
+    totals = case_window_totals(project_id, _analytics_window_days(30))
     failed_results = db.session.query(
-        Result.case_id,
-        func.count(Result.id).label('fail_count'),
-        func.max(Result.created_at).label('last_failed')
-    ).filter(
-        Result.status == 'fail',
-        Result.created_at >= thirty_days_ago
+        Case.id,
+        Case.title,
+        Case.priority,
+        Section.name,
+        totals.c.fail_count,
+        totals.c.last_fail_at
+    ).join(
+        totals, totals.c.case_id == Case.id
     ).join(
-        Case, Result.case_id == Case.id
+        Section, Section.id == Case.section_id
     ).filter(
-        Case.project_id == project_id,
-        Case.status == 'active'
-    ).group_by(
-        Result.case_id
+        Case.status == 'active',
+        totals.c.fail_count > 0
     ).order_by(
-        func.count(Result.id).desc()
+        totals.c.fail_count.desc()
     ).limit(10).all()
     
-    result_list = []
-    for case_id, fail_count, last_failed in failed_results:
-        case = Case.query.get(case_id)
-        if case:
-            result_list.append({
-                'case_id': case.id,
-                'title': case.title,
-                'section_name': case.section.name,
-                'priority': case.priority,
-                'fail_count': fail_count,
-                'last_failed': last_failed.isoformat()
-            })
-    
-    return jsonify(result_list)
+    return jsonify([{
+        'case_id': case_id,
+        'title': title,
+        'section_name': section_name,
+        'priority': priority,
+        'fail_count': int(fail_count),
+        'last_failed': last_failed.isoformat() if last_failed else None
+    } for case_id, title, priority, section_name, fail_count, last_failed in failed_results])
 
 
 @bp.route('/projects/<int:project_id>/analytics/stale-cases', methods=['GET'])
 @login_required
 def get_stale_cases(project_id):
-    """오래된 케이스 (90일 이상 미수정)"""
+    """오래된 케이스 (기본 90일 이상 미수정, ?days=)"""
     project = Project.query.get_or_404(project_id)
     
     from datetime import datetime, timedelta
-    ninety_days_ago = datetime.utcnow() - timedelta(days=90)
+    since = datetime.utcnow() - timedelta(days=_analytics_window_days(90))
     
-    stale_cases = Case.query.filter(
+    stale_cases = Case.query.options(
+        joinedload(Case.section)  # section_name 접근 최적화
+    ).filter(
         Case.project_id == project_id,
         Case.status == 'active',
-        Case.updated_at < ninety_days_ago
+        Case.updated_at < since
     ).order_by(
         Case.updated_at.asc()
     ).limit(20).all()
@@ -2951,55 +3274,91 @@ def get_stale_cases(project_id):
 @bp.route('/projects/<int:project_id>/analytics/flaky-cases', methods=['GET'])
 @login_required
 def get_flaky_cases(project_id):
-    """불안정한 케이스 (Pass/Fail이 번갈아 나타나는 케이스)"""
+    """불안정한 케이스 (런 순서상 Pass <-> Fail 전환이 잦은 케이스)
+
+    - 저장된 flakiness 상태(CaseFlakiness)를 flaky_score 순으로 읽음 (인덱스 조회 1회)
+    - ?days=: 최근 N일 내 관측이 있는 케이스만 (기본 30일), ?limit= (기본 10, 최대 500)
+    """
     project = Project.query.get_or_404(project_id)
-    
     from datetime import datetime, timedelta
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    
-    # 최근 결과가 있는 케이스들
-    cases_with_results = db.session.query(
-        Result.case_id,
-        func.count(Result.id).label('total_count'),
-        func.sum(db.case((Result.status == 'pass', 1), else_=0)).label('pass_count'),
-        func.sum(db.case((Result.status == 'fail', 1), else_=0)).label('fail_count')
-    ).filter(
-        Result.created_at >= thirty_days_ago
+    from app.models import CaseFlakiness
+
+    since = datetime.utcnow() - timedelta(days=_analytics_window_days(30))
+    limit = min(max(request.args.get('limit', 10, type=int) or 10, 1), 500)
+    rows = db.session.query(
+        CaseFlakiness,
+        Case.title,
+        Case.priority,
+        Section.name
+    ).join(
+        Case, Case.id == CaseFlakiness.case_id
     ).join(
-        Case, Result.case_id == Case.id
+        Section, Section.id == Case.section_id
     ).filter(
-        Case.project_id == project_id,
+        CaseFlakiness.project_id == project_id,
+        CaseFlakiness.flaky_score > 0,
+        CaseFlakiness.observations >= 3,  # 최소 3번 이상 실행
+        CaseFlakiness.last_observed_at >= since,
         Case.status == 'active'
-    ).group_by(
-        Result.case_id
-    ).having(
-        func.count(Result.id) >= 3  # 최소 3번 이상 실행
-    ).all()
-    
-    flaky_list = []
-    for case_id, total, pass_count, fail_count in cases_with_results:
-        # Pass와 Fail이 모두 있고, 둘 다 20% 이상인 경우
-        if pass_count > 0 and fail_count > 0:
-            pass_rate = (pass_count / total) * 100
-            if 20 <= pass_rate <= 80:  # 불안정한 범위
-                case = Case.query.get(case_id)
-                if case:
-                    flaky_list.append({
-                        'case_id': case.id,
-                        'title': case.title,
-                        'section_name': case.section.name,
-                        'priority': case.priority,
-                        'total_runs': total,
-                        'pass_count': pass_count,
-                        'fail_count': fail_count,
-                        'pass_rate': round(pass_rate, 1),
-                        'flaky_score': round(abs(50 - pass_rate), 1)  # 50%에서 멀수록 덜 불안정
-                    })
-    
-    # Flaky score로 정렬 (50%에 가까울수록 더 불안정)
-    flaky_list.sort(key=lambda x: x['flaky_score'])
-    
-    return jsonify(flaky_list[:10])
+    ).order_by(
+        CaseFlakiness.flaky_score.desc()
+    ).limit(limit).all()
+
+    return jsonify([{
+        'case_id': f.case_id,
+        'title': title,
+        'section_name': section_name,
+        'priority': priority,
+        'total_runs': f.observations,
+        'pass_count': f.pass_observations,
+        'fail_count': f.observations - f.pass_observations,
+        'pass_rate': round(f.pass_observations / f.observations * 100, 1) if f.observations else 0.0,
+        'flips': f.flips,
+        'flip_rate': round(f.flips / (f.observations - 1), 3) if f.observations > 1 else 0.0,
+        'ewma_flip_rate': round(f.ewma_flip_rate, 3),
+        'confidence': round(f.confidence, 3),
+        'flaky_score': round(f.flaky_score, 3),
+        'last_flip_at': f.last_flip_at.isoformat() if f.last_flip_at else None
+    } for f, title, priority, section_name in rows])
+
+
+@bp.route('/projects/<int:project_id>/analytics/result-matrix', methods=['GET'])
+@login_required
+def get_result_matrix(project_id):
+    """케이스 x 런(빌드) 결과 매트릭스
+
+    Query:
+      - runs: 최근 런/빌드 개수 (기본 20, 최대 100)
+      - group_by: run(기본) | build  (build_label 단위, 같은 빌드는 마지막 런 기준)
+      - section_id: 해당 섹션 + 하위 섹션 케이스만
+      - encoding: dense(기본) | rle  (행별 [code, count, ...])
+    """
+    project = Project.query.get_or_404(project_id)
+    from app.utils.result_matrix import STATUS_CODES, build_result_matrix, rle_encode_rows
+
+    limit = min(max(request.args.get('runs', 20, type=int) or 20, 1), 100)
+    by_build = (request.args.get('group_by') or 'run') == 'build'
+    encoding = 'rle' if request.args.get('encoding') == 'rle' else 'dense'
+
+    section_ids = None
+    section_id = request.args.get('section_id', type=int)
+    if section_id:
+        from app.utils.section_delete import section_subtree_ids
+        section = Section.query.get_or_404(section_id)
+        if section.project_id != project_id:
+            return jsonify({'error': '프로젝트의 섹션이 아닙니다'}), 400
+        section_ids = section_subtree_ids(section_id)
+
+    result = build_result_matrix(project_id, section_ids=section_ids, limit=limit, by_build=by_build)
+    return jsonify({
+        'group_by': 'build' if by_build else 'run',
+        'columns': result.columns,
+        'case_ids': result.case_ids,
+        'case_titles': result.case_titles,
+        'status_codes': STATUS_CODES,
+        'encoding': encoding,
+        'matrix': rle_encode_rows(result.matrix) if encoding == 'rle' else result.matrix.tolist()
+    })
 
 
 # ============================================================
@@ -3803,46 +4162,28 @@ def import_cases_preview(project_id):
         return jsonify({'error': '지원하지 않는 파일 형식입니다. CSV 또는 Excel 파일만 가능합니다.'}), 400
     
     try:
-        import pandas as pd
-        import io
-        
-        # 파일 읽기
-        if file_ext == 'csv':
-            # CSV 파일 - 인코딩 자동 감지
-            content = file.read()
-            try:
-                # UTF-8 시도
-                df = pd.read_csv(io.BytesIO(content), encoding='utf-8')
-            except UnicodeDecodeError:
-                # CP949(한글 Windows) 시도
-                df = pd.read_csv(io.BytesIO(content), encoding='cp949')
-        else:
-            # Excel 파일
-            df = pd.read_excel(file, engine='openpyxl')
-        
-        # 원본 컬럼명 보존
-        original_columns = df.columns.tolist()
-        
-        # 컬럼명 정규화 (소문자, 공백 제거) - 내부 처리용
-        df.columns = df.columns.str.strip()
-        
-        # 첫 5개 행 샘플 데이터
-        sample_data = []
-        for idx, row in df.head(5).iterrows():
-            sample_row = {}
-            for col in df.columns:
-                val = row[col]
-                if pd.notna(val):
-                    sample_row[col] = str(val).strip()
-                else:
-                    sample_row[col] = ''
-            sample_data.append(sample_row)
-        
+        from app.utils.case_import import read_import_dataframe, frame_sample_rows
+        from app.utils.import_session import create_import_session
+
+        # 파일은 여기서 한 번만 읽고, 이후 parse/confirm은 import 세션의 캐시를 사용
+        raw_df = read_import_dataframe(
+            file.read(), file_ext, chunk_rows=current_app.config.get('IMPORT_CSV_CHUNK_ROWS')
+        )
+        session = create_import_session(
+            raw_df,
+            project_id=project_id,
+            user_id=current_user.id,
+            filename=filename,
+            file_ext=file_ext
+        )
+
         return jsonify({
             'success': True,
-            'total_rows': len(df),
-            'columns': original_columns,
-            'sample_data': sample_data
+            'import_session_id': session.id,
+            'total_rows': len(raw_df),
+            'columns': raw_df.columns.tolist(),
+            # 첫 5개 행 샘플 데이터
+            'sample_data': frame_sample_rows(raw_df, limit=5)
         })
         
     except Exception as e:
@@ -3853,109 +4194,71 @@ def import_cases_preview(project_id):
 @bp.route('/projects/<int:project_id>/cases/import/parse', methods=['POST'])
 @login_required
 def import_cases_parse(project_id):
-    """컬럼 매핑을 적용하여 데이터 파싱"""
+    """컬럼 매핑을 적용하여 데이터 파싱 (import_session_id 또는 파일 업로드)"""
     project = Project.query.get_or_404(project_id)
-    
-    if 'file' not in request.files:
-        return jsonify({'error': '파일이 없습니다'}), 400
-    
-    file = request.files['file']
-    data = request.form.get('column_mapping')
+
+    import json
+    payload = request.get_json(silent=True) or request.form
+    session_id = payload.get('import_session_id') or ''
+    data = payload.get('column_mapping')
     
     if not data:
         return jsonify({'error': '컬럼 매핑 정보가 없습니다'}), 400
-    
-    import json
-    column_mapping = json.loads(data)
-    
-    filename = secure_filename(file.filename)
-    file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    column_mapping = json.loads(data) if isinstance(data, str) else data
+
+    session = None
+    if session_id:
+        from app.utils.import_session import get_import_session
+        session = get_import_session(session_id, project_id=project_id, user_id=current_user.id)
+        if not session:
+            return jsonify({'error': 'Import 세션이 만료되었습니다. 파일을 다시 선택해주세요.'}), 404
+    elif 'file' not in request.files:
+        return jsonify({'error': '파일이 없습니다'}), 400
+
+    # include_cases=0이면 전체 케이스 목록 대신 앞부분 미리보기만 반환 (대용량 파일 응답 축소)
+    include_cases = payload.get('include_cases')
+    if include_cases is None:
+        include_cases = request.args.get('include_cases') or '1'
+    include_cases = str(include_cases) not in ['0', 'false', 'False', 'no', 'n']
     
     try:
-        import pandas as pd
-        import io
-        
-        # 파일 읽기
-        if file_ext == 'csv':
-            content = file.read()
-            try:
-                df = pd.read_csv(io.BytesIO(content), encoding='utf-8')
-            except UnicodeDecodeError:
-                df = pd.read_csv(io.BytesIO(content), encoding='cp949')
+        from app.utils.case_import import parse_case_frame, parse_import_file, collect_section_names
+
+        if session:
+            # 같은 매핑으로 이미 파싱했으면 캐시 재사용, 아니면 캐시된 원본 DataFrame에서 파싱
+            cases_df = session.load_parsed(column_mapping)
+            if cases_df is None:
+                cases_df = parse_case_frame(session.load_raw(), column_mapping).reset_index(drop=True)
+                session.save_parsed(column_mapping, cases_df)
+            total_rows = int(session.meta.get('total_rows') or 0)
         else:
-            df = pd.read_excel(file, engine='openpyxl')
-        
-        # 컬럼명 정규화
-        df.columns = df.columns.str.strip()
-        
-        # 데이터 파싱
-        cases_preview = []
-        section_names = set()  # 섹션 이름 수집
-        
-        for idx, row in df.iterrows():
-            case_data = {
-                'row_number': idx + 1,
-                'title': '',
-                'steps': '',
-                'expected_result': '',
-                'priority': 'Medium',
-                'jira_links': '',
-                'media': '',
-                'section_full': '',
-                'section_1': '',
-                'section_2': '',
-                'section_3': '',
-                'section_4': ''
-            }
-            
-            # 컬럼 매핑 적용
-            for target_field, source_column in column_mapping.items():
-                if source_column and source_column in df.columns:
-                    val = row[source_column]
-                    if pd.notna(val):
-                        case_data[target_field] = str(val).strip()
-
-            # 섹션 전체(section_full) 우선 적용: 'a > b > c' -> section_1..4
-            if case_data.get('section_full'):
-                parts = [p.strip() for p in str(case_data['section_full']).split('>')]
-                parts = [p for p in parts if p]
-                for i in range(1, 5):
-                    case_data[f'section_{i}'] = parts[i - 1] if (i - 1) < len(parts) else ''
-            
-            # 빈 제목은 건너뛰기
-            if not case_data['title'] or case_data['title'] == 'nan':
-                continue
-            
-            # 우선순위 정규화
-            priority_map = {
-                'blocker': 'Blocker',
-                'critical': 'Critical',
-                'high': 'High',
-                'medium': 'Medium',
-                'low': 'Low',
-                'p0': 'Blocker',
-                'p1': 'Critical',
-                'p2': 'High',
-                'p3': 'Medium',
-                'p4': 'Low'
-            }
-            case_data['priority'] = priority_map.get(case_data['priority'].lower(), 'Medium')
-            
-            # 섹션 정보 수집
-            for i in range(1, 5):
-                if case_data[f'section_{i}']:
-                    section_names.add(case_data[f'section_{i}'])
-            
-            cases_preview.append(case_data)
-        
-        return jsonify({
+            file = request.files['file']
+            filename = secure_filename(file.filename)
+            file_ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+            # 컬럼 연산(벡터화) 기반 파싱 - CSV는 chunk 단위로 처리
+            cases_df, total_rows = parse_import_file(
+                file.read(),
+                file_ext,
+                column_mapping,
+                chunk_rows=current_app.config.get('IMPORT_CSV_CHUNK_ROWS')
+            )
+        valid_cases = len(cases_df)
+
+        response_data = {
             'success': True,
-            'total_rows': len(df),
-            'valid_cases': len(cases_preview),
-            'skipped_rows': len(df) - len(cases_preview),
-            'cases': cases_preview,
-            'section_names': sorted(list(section_names))
-        })
+            'total_rows': total_rows,
+            'valid_cases': valid_cases,
+            'skipped_rows': total_rows - valid_cases,
+            'section_names': collect_section_names(cases_df)
+        }
+        if include_cases:
+            response_data['cases'] = cases_df.to_dict('records')
+        else:
+            preview_rows = int(current_app.config.get('IMPORT_PREVIEW_ROWS', 200) or 200)
+            response_data['preview_cases'] = cases_df.head(preview_rows).to_dict('records')
+            response_data['cases_truncated'] = valid_cases > preview_rows
+
+        return jsonify(response_data)
         
     except Exception as e:
         current_app.logger.error(f'데이터 파싱 실패: {e}')
@@ -3968,214 +4271,59 @@ def import_cases_confirm(project_id):
     """케이스 import 확정 (DB에 저장) - 섹션 자동 생성 지원"""
     project = Project.query.get_or_404(project_id)
     
-    data = request.get_json()
+    data = request.get_json() or {}
     cases_data = data.get('cases', [])
+
+    # import 세션이 있으면 케이스 목록을 다시 받지 않고 서버에 캐시된 파싱 결과 사용
+    session = None
+    if data.get('import_session_id'):
+        from app.utils.case_import import prepend_section_path
+        from app.utils.import_session import get_import_session
+        session = get_import_session(data['import_session_id'], project_id=project_id, user_id=current_user.id)
+        cases_df = session.load_parsed() if session else None
+        if cases_df is None:
+            return jsonify({'error': 'Import 세션이 만료되었습니다. 파일을 다시 선택해주세요.'}), 404
+        # 최상위 섹션 경로(선택 시)를 모든 케이스 섹션 경로 앞에 추가
+        cases_data = prepend_section_path(cases_df, data.get('root_section_path') or []).to_dict('records')
     
     if not cases_data:
         return jsonify({'error': '가져올 케이스가 없습니다'}), 400
     
     try:
-        # 섹션 캐시 (이름 -> Section 객체)
-        section_cache = {}
-        
-        def get_or_create_section(section_names, parent_id=None, depth=1):
-            """섹션 계층 구조 생성 또는 조회"""
-            if not section_names or depth > 4:
-                return parent_id
-            
-            section_name = section_names[0]
-            if not section_name:
-                return parent_id
-            
-            # 캐시 키 생성
-            cache_key = f"{parent_id}_{section_name}"
-            
-            if cache_key in section_cache:
-                section = section_cache[cache_key]
-            else:
-                # 기존 섹션 찾기
-                section = Section.query.filter_by(
-                    project_id=project_id,
-                    name=section_name,
-                    parent_id=parent_id
-                ).first()
-                
-                if not section:
-                    # 새 섹션 생성
-                    max_order = db.session.query(func.max(Section.order_index)).filter_by(
-                        project_id=project_id,
-                        parent_id=parent_id
-                    ).scalar() or 0
-                    
-                    section = Section(
-                        project_id=project_id,
-                        name=section_name,
-                        parent_id=parent_id,
-                        order_index=max_order + 1
-                    )
-                    db.session.add(section)
-                    db.session.flush()  # ID 생성
-                    current_app.logger.info(f'섹션 생성: {section_name} (depth: {depth}, parent: {parent_id})')
-                
-                section_cache[cache_key] = section
-            
-            # 다음 depth 처리
-            if len(section_names) > 1:
-                return get_or_create_section(section_names[1:], section.id, depth + 1)
-            else:
-                return section.id
-        
-        created_cases = []
-        
-        def _split_multi(value: str):
-            if not value:
-                return []
-            text = str(value).replace('\r', '\n')
-            # 흔한 구분자: 줄바꿈, 콤마, 파이프
-            parts = []
-            for chunk in text.split('\n'):
-                for p in chunk.split('|'):
-                    for q in p.split(','):
-                        s = q.strip()
-                        if s:
-                            parts.append(s)
-            # 중복 제거(순서 유지)
-            seen = set()
-            out = []
-            for x in parts:
-                if x not in seen:
-                    seen.add(x)
-                    out.append(x)
-            return out
-
-        def _download_media_to_case(media_url: str, case_id: int):
-            """미디어 URL을 다운로드하여 CaseMedia로 저장 (실패 시 None)"""
-            try:
-                if not media_url.startswith('http://') and not media_url.startswith('https://'):
-                    return None
-                resp = requests.get(media_url, stream=True, timeout=10)
-                if resp.status_code >= 400:
-                    return None
-                # 파일명 추출
-                from urllib.parse import urlparse
-                path = urlparse(media_url).path or ''
-                name = os.path.basename(path) or f'case_media_{case_id}'
-                name = secure_filename(name)
-                if not name:
-                    return None
-                if not allowed_file(name):
-                    return None
-                media_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'case_media')
-                os.makedirs(media_dir, exist_ok=True)
-                ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-                stored = f"{ts}_{name}"
-                filepath = os.path.join(media_dir, stored)
-                with open(filepath, 'wb') as f:
-                    for chunk in resp.iter_content(chunk_size=1024 * 1024):
-                        if chunk:
-                            f.write(chunk)
-                mime = resp.headers.get('Content-Type')
-                cm = CaseMedia(
-                    case_id=case_id,
-                    file_path=filepath,
-                    original_name=name,
-                    mime_type=mime,
-                    created_by=current_user.id
-                )
-                db.session.add(cm)
-                return cm
-            except Exception:
-                return None
-
-        for case_data in cases_data:
-            # 섹션 계층 구조 생성
-            section_names = []
-            for i in range(1, 5):
-                section_name = case_data.get(f'section_{i}', '').strip()
-                if section_name:
-                    section_names.append(section_name)
-                else:
-                    break
-            
-            # 섹션 ID 가져오기 (없으면 생성)
-            if section_names:
-                final_section_id = get_or_create_section(section_names)
-            else:
-                return jsonify({'error': '섹션 정보가 없습니다. 최소 1개의 섹션이 필요합니다.'}), 400
-            
-            # 현재 섹션의 최대 order_index 가져오기
-            max_order = db.session.query(func.max(Case.order_index)).filter_by(
-                section_id=final_section_id
-            ).scalar() or 0
-            
-            # 케이스 생성
-            new_case = Case(
-                project_id=project_id,
-                section_id=final_section_id,
-                title=case_data['title'],
-                steps=case_data.get('steps', ''),
-                expected_result=case_data.get('expected_result', ''),
-                priority=case_data.get('priority', 'Medium'),
-                status='active',
-                order_index=max_order + 1,
-                created_by=current_user.id,
-                updated_by=current_user.id
-            )
-            db.session.add(new_case)
-            db.session.flush()  # ID 생성
+        from app.utils.case_import import bulk_import_cases, download_import_media
+        from app.utils.jobs import submit_job
 
-            # Jira 링크 저장
-            try:
-                for u in _split_multi(case_data.get('jira_links', '')):
-                    db.session.add(CaseJiraLink(case_id=new_case.id, url=u, created_by=current_user.id))
-            except Exception:
-                pass
+        # 섹션 해석/생성 + 케이스/Jira/원본 번역 캐시 일괄 INSERT
+        try:
+            result = bulk_import_cases(project_id, cases_data, current_user.id)
+        except ValueError as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 400
+        created_cases = result.created_cases
 
-            # 미디어(URL) 저장: 다운로드 후 CaseMedia 생성
-            try:
-                for media_url in _split_multi(case_data.get('media', '')):
-                    _download_media_to_case(media_url, new_case.id)
-            except Exception:
-                pass
-            
-            # 원본 언어로 캐시 저장 (중복 체크)
-            try:
-                source_lang = detect_language(new_case.title)
-                
-                # 기존 번역이 있는지 확인
-                existing_translation = CaseTranslation.query.filter_by(
-                    case_id=new_case.id,
-                    target_lang=source_lang
-                ).first()
-                
-                if not existing_translation:
-                    original_translation = CaseTranslation(
-                        case_id=new_case.id,
-                        source_lang=source_lang,
-                        target_lang=source_lang,
-                        title=new_case.title,
-                        steps=new_case.steps,
-                        expected_result=new_case.expected_result
-                    )
-                    db.session.add(original_translation)
-            except Exception as e:
-                current_app.logger.warning(f'케이스 {new_case.id} 번역 캐시 저장 실패: {e}')
-            
-            created_cases.append({
-                'id': new_case.id,
-                'title': new_case.title,
-                'section_path': ' > '.join(section_names)
-            })
-        
         db.session.commit()
+        if session:
+            from app.utils.import_session import delete_import_session
+            delete_import_session(session)
         
         current_app.logger.info(f'{len(created_cases)}개 케이스 import 완료 (프로젝트: {project_id}) by {current_user.email}')
+
+        # 미디어(URL) 저장: 커밋 이후 백그라운드에서 동시 다운로드 -> CaseMedia 생성
+        media_job = None
+        if result.media_jobs:
+            media_job = submit_job(
+                'case_import_media', download_import_media, result.media_jobs, current_user.id,
+                user_id=current_user.id, project_id=project_id
+            )
         
         return jsonify({
             'success': True,
             'created_count': len(created_cases),
             'cases': created_cases,
-            'created_sections': len(section_cache)
+            'created_sections': result.touched_sections,
+            'new_sections': result.new_sections,
+            'media_count': len(result.media_jobs),
+            'media_job_id': media_job.id if media_job else None
         })
         
     except Exception as e:
@@ -1,10 +1,8 @@
-from flask import Blueprint, render_template, redirect, url_for, request, flash, abort, current_app, send_file
+from flask import Blueprint, render_template, redirect, url_for, request, flash, abort, current_app
 from flask_login import login_required, current_user
 from sqlalchemy.orm import joinedload, selectinload
 from app import db
-from app.models import Project, Section, Case, Run, Tag, User, TranslationPrompt, APIKey, Result, FeedbackPost, FeedbackAttachment, FeedbackPostView, CaseJiraLink, CaseMedia
-from werkzeug.utils import secure_filename
-from datetime import datetime
+from app.models import Project, Section, Case, Run, Tag, User, TranslationPrompt, APIKey, FeedbackPost, FeedbackAttachment, FeedbackPostView, CaseJiraLink, CaseMedia, RunCaseComment
 import os
 from sqlalchemy.exc import IntegrityError
 
@@ -45,10 +43,10 @@ def _save_feedback_attachments(post: FeedbackPost, files) -> tuple[int, list[str
     max_mb = int(current_app.config.get('FEEDBACK_ATTACHMENT_MAX_MB', 25) or 25)
     max_bytes = max(1, max_mb) * 1024 * 1024
 
+    from app.utils.blob_store import BlobTooLarge, put_upload
+
     saved = 0
     errors: list[str] = []
-    base_dir = os.path.join(upload_root, 'feedback', f'post_{post.id}')
-    os.makedirs(base_dir, exist_ok=True)
 
     for f in files:
         if not f or not getattr(f, 'filename', None):
@@ -59,26 +57,14 @@ def _save_feedback_attachments(post: FeedbackPost, files) -> tuple[int, list[str
 
         try:
             original_name = f.filename
-            safe = secure_filename(original_name) or 'file'
-            ts = datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')
-            filename = f'fb_{post.id}_{ts}_{safe}'
-            filepath = os.path.join(base_dir, filename)
-            f.save(filepath)
-
-            size = None
+            # 파일 1개당 용량 제한(기본 25MB): 저장 중 초과하면 중단
             try:
-                size = os.path.getsize(filepath)
-            except Exception:
-                size = None
-
-            # 파일 1개당 용량 제한(기본 25MB)
-            if size is not None and size > max_bytes:
-                try:
-                    os.remove(filepath)
-                except Exception:
-                    pass
+                stored = put_upload(f, max_bytes=max_bytes)
+            except BlobTooLarge:
                 errors.append(f'파일 용량 초과({max_mb}MB): {original_name}')
                 continue
+            filepath = stored.path
+            size = stored.size
 
             att = FeedbackAttachment(
                 post_id=post.id,
@@ -290,20 +276,21 @@ def feedback_delete(post_id: int):
     if post.created_by != current_user.id and not is_admin:
         abort(403)
 
-    # 첨부 파일(디스크) 정리
-    try:
-        atts = FeedbackAttachment.query.filter_by(post_id=post.id).all()
-        for a in atts:
-            try:
-                if a.file_path and os.path.exists(a.file_path):
-                    os.remove(a.file_path)
-            except Exception:
-                pass
-    except Exception:
-        pass
+    from app.utils.blob_store import release_paths, sha_from_path
 
+    # 첨부 파일 정리: blob은 참조 수만 줄이고(파일은 GC가 정리), 이전 방식 파일은 바로 삭제
+    paths = [a.file_path for a in FeedbackAttachment.query.filter_by(post_id=post.id).all()]
+    release_paths(paths)
     db.session.delete(post)
     db.session.commit()
+    for path in paths:
+        if sha_from_path(path):
+            continue
+        try:
+            if path and os.path.exists(path):
+                os.remove(path)
+        except Exception:
+            pass
     flash('게시글이 삭제되었습니다.', 'success')
     return redirect(url_for('main.feedback_list'))
 
@@ -324,9 +311,11 @@ def feedback_attachment_file(attachment_id: int):
     if not att.file_path or not os.path.exists(att.file_path):
         abort(404)
 
+    from app.utils.media_serving import send_media
+
     # download=1이면 강제 다운로드, 아니면 브라우저 inline(이미지/영상 미리보기)
     download = request.args.get('download') in ('1', 'true', 'True')
-    return send_file(
+    return send_media(
         att.file_path,
         as_attachment=download,
         download_name=att.original_name,
@@ -349,15 +338,20 @@ def feedback_attachment_delete(attachment_id: int):
     if post.created_by != current_user.id and not is_admin:
         abort(403)
 
-    # 파일 삭제
-    try:
-        if att.file_path and os.path.exists(att.file_path):
-            os.remove(att.file_path)
-    except Exception:
-        pass
+    from app.utils.blob_store import release_paths
 
+    file_path = att.file_path
     db.session.delete(att)
+    released = release_paths([file_path])
     db.session.commit()
+
+    # 이전 방식 파일은 바로 삭제 (blob은 GC가 정리)
+    if not released:
+        try:
+            if file_path and os.path.exists(file_path):
+                os.remove(file_path)
+        except Exception:
+            pass
     flash('첨부가 삭제되었습니다.', 'success')
     return redirect(url_for('main.feedback_edit', post_id=post.id))
 
@@ -511,24 +505,34 @@ def cases(project_id):
 @bp.route('/p/<int:project_id>/runs')
 @login_required
 def runs(project_id):
-    """런 목록"""
+    """런 목록 (진행 중/완료 각각 페이지네이션 + 필터)"""
+    from app.utils.run_listing import (
+        parse_run_filters, list_runs, run_filter_options, RunListFilters, RunListFilterError
+    )
     project = Project.query.get_or_404(project_id)
-    
-    # Open runs와 closed runs 분리
-    open_runs = Run.query.filter_by(
-        project_id=project_id,
-        is_closed=False
-    ).order_by(Run.created_at.desc()).all()
-    
-    closed_runs = Run.query.filter_by(
-        project_id=project_id,
-        is_closed=True
-    ).order_by(Run.created_at.desc()).limit(20).all()
-    
+
+    try:
+        filters = parse_run_filters(request.args)
+    except RunListFilterError as e:
+        flash(str(e), 'error')
+        filters = RunListFilters()
+
+    # Open runs와 closed runs 분리 (생성자 eager load + 페이지 단위 통계 1쿼리씩)
+    open_filters = RunListFilters(**{**filters.__dict__, 'status': 'open'})
+    closed_filters = RunListFilters(**{**filters.__dict__, 'status': 'closed'})
+    open_page = list_runs(project_id, open_filters, page=request.args.get('page', 1, type=int))
+    closed_page = list_runs(project_id, closed_filters, page=request.args.get('closed_page', 1, type=int))
+
     return render_template('main/runs.html',
                          project=project,
-                         open_runs=open_runs,
-                         closed_runs=closed_runs)
+                         open_runs=open_page.runs,
+                         closed_runs=closed_page.runs,
+                         open_page=open_page,
+                         closed_page=closed_page,
+                         stats_by_run={**open_page.stats, **closed_page.stats},
+                         filters=filters,
+                         filter_args=filters.as_args(),
+                         filter_options=run_filter_options(project_id))
 
 
 @bp.route('/p/<int:project_id>/runs/<int:run_id>')
@@ -545,16 +549,29 @@ def run_execute(project_id, run_id):
     # RunCase 목록
     run_cases = run.run_cases.order_by('order_index').all()
 
-    # Phase 1: 코멘트(status='comment')는 Result로 별도 저장되므로, 사이드바 프리뷰용으로
-    # 케이스별 최신 코멘트를 미리 로드한다 (1쿼리).
-    latest_comment_result_by_case_id = {}
-    comment_results = Result.query.filter_by(run_id=run_id, status='comment') \
-        .order_by(Result.created_at.desc()).all()
-    for cr in comment_results:
-        if cr.case_id not in latest_comment_result_by_case_id:
-            latest_comment_result_by_case_id[cr.case_id] = cr
+    # 사이드바 프리뷰용 케이스별 최신 코멘트 (run_case_comments (run_id, case_id, created_at) 인덱스, 1쿼리)
+    ranked_comments = db.session.query(
+        RunCaseComment.case_id.label('case_id'),
+        RunCaseComment.comment.label('comment'),
+        RunCaseComment.created_at.label('created_at'),
+        db.func.row_number().over(
+            partition_by=RunCaseComment.case_id,
+            order_by=(RunCaseComment.created_at.desc(), RunCaseComment.id.desc())
+        ).label('rn')
+    ).filter(
+        RunCaseComment.run_id == run_id,
+        db.func.trim(RunCaseComment.comment) != ''
+    ).subquery()
+    latest_comment_by_case_id = {
+        row.case_id: row for row in db.session.query(
+            ranked_comments.c.case_id, ranked_comments.c.comment, ranked_comments.c.created_at
+        ).filter(ranked_comments.c.rn == 1)
+    }
     
     # 케이스 Jira/미디어 사전 로드(1쿼리씩)
+    from app.utils.media_serving import versioned_url
+    from app.utils.thumbnails import thumbnail_url
+
     case_ids = [rc.case_id for rc in run_cases]
     jira_map = {}
     media_map = {}
@@ -565,7 +582,8 @@ def run_execute(project_id, run_id):
             media_map.setdefault(m.case_id, []).append({
                 'id': m.id,
                 'original_name': m.original_name,
-                'url': f'/api/case-media/{m.id}'
+                'url': versioned_url(f'/api/case-media/{m.id}', m.file_path),
+                'thumbnail_url': thumbnail_url(f'/api/case-media/{m.id}', m.file_path),
             })
 
     # 각 RunCase의 최신 결과 가져오기 (JSON 직렬화 가능하도록 딕셔너리로 변환)
@@ -591,14 +609,14 @@ def run_execute(project_id, run_id):
             case_priority = rc.case.priority
             case_version = rc.case.version or 1
         
-        # 사이드바 코멘트 프리뷰: 실행 결과 코멘트 vs 코멘트 전용 결과 중 "가장 최신의 non-empty 코멘트" 선택
+        # 사이드바 코멘트 프리뷰: 실행 결과 코멘트 vs 코멘트 중 "가장 최신의 non-empty 코멘트" 선택
         sidebar_comment = ''
         sidebar_comment_candidates = []
         if result and result.comment and str(result.comment).strip():
             sidebar_comment_candidates.append((result.created_at, result.comment))
-        latest_comment_result = latest_comment_result_by_case_id.get(rc.case_id)
-        if latest_comment_result and latest_comment_result.comment and str(latest_comment_result.comment).strip():
-            sidebar_comment_candidates.append((latest_comment_result.created_at, latest_comment_result.comment))
+        latest_comment = latest_comment_by_case_id.get(rc.case_id)
+        if latest_comment:
+            sidebar_comment_candidates.append((latest_comment.created_at, latest_comment.comment))
         if sidebar_comment_candidates:
             sidebar_comment = max(sidebar_comment_candidates, key=lambda x: x[0])[1]
 
@@ -658,13 +676,10 @@ def dashboard(project_id):
         project_id=project_id
     ).order_by(Run.created_at.desc()).limit(10).all()
     
-    # 각 런의 통계
-    runs_with_stats = []
-    for run in recent_runs:
-        runs_with_stats.append({
-            'run': run,
-            'stats': run.get_stats()
-        })
+    # 각 런의 통계 (그룹 쿼리 1회 + 프로젝트 단위 단기 캐시)
+    from app.utils.run_stats import cached_project_run_stats
+    stats_by_run = cached_project_run_stats(project_id, [run.id for run in recent_runs])
+    runs_with_stats = [{'run': run, 'stats': stats_by_run[run.id]} for run in recent_runs]
     
     return render_template('main/dashboard.html',
                          project=project,
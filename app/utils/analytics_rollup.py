@@ -0,0 +1,173 @@
+"""
+케이스별 일간 결과 rollup (CaseResultDaily) 유지/재구축
+
+- 결과가 기록/수정/삭제되면 영향을 받은 (case_id, day) 행만 실행 결과 이력에서 다시 집계한다.
+  (증감 방식 대신 버킷 재계산: 상태 변경/삭제/시간 이동에도 항상 정확)
+- backfill_result_rollups()는 기존 Result 이력 전체로 rollup을 다시 만든다.
+- analytics 엔드포인트는 Result를 스캔하지 않고 이 테이블만 읽는다.
+- 종료된 런에서 보관(result_archive)된 대체 결과도 집계에 포함한다.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional, Union
+
+from sqlalchemy import and_, delete, func, insert, select, union_all
+
+from app import db
+from app.models import Case, Result, ResultArchive, CaseResultDaily
+
+
+def _execution_history(*criteria_by_model):
+    """
+    실행 결과 이력 (results + result_archive) 서브쿼리 (case_id, status, created_at).
+    criteria_by_model: 모델(Result/ResultArchive)을 받아 WHERE 조건 목록을 돌려주는 함수
+    """
+    def _branch(model):
+        stmt = select(
+            model.case_id.label('case_id'),
+            model.status.label('status'),
+            model.created_at.label('created_at'),
+        )
+        for criteria in criteria_by_model:
+            stmt = stmt.where(*criteria(model))
+        return stmt
+
+    return union_all(
+        _branch(Result),
+        _branch(ResultArchive),
+    ).subquery('execution_history')
+
+
+def _count_status(history, status: str):
+    return func.coalesce(func.sum(db.case((history.c.status == status, 1), else_=0)), 0)
+
+
+def _as_day(value: Union[date, datetime]) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def refresh_result_rollups(touched: Iterable[tuple[int, Union[date, datetime]]]) -> None:
+    """
+    (case_id, day 또는 datetime) 목록의 rollup 행을 실행 결과 이력(results + result_archive)에서 다시 계산한다. (커밋은 호출 측에서)
+    """
+    keys = {(int(case_id), _as_day(ts)) for case_id, ts in touched if case_id and ts}
+    if not keys:
+        return
+
+    project_by_case = dict(db.session.execute(
+        select(Case.id, Case.project_id).where(Case.id.in_({case_id for case_id, _ in keys}))
+    ).all())
+
+    for case_id, day in keys:
+        start = datetime.combine(day, datetime.min.time())
+        history = _execution_history(lambda m: (
+            m.case_id == case_id,
+            m.created_at >= start,
+            m.created_at < start + timedelta(days=1),
+        ))
+        row = db.session.execute(
+            select(
+                func.count(),
+                _count_status(history, 'pass'),
+                _count_status(history, 'fail'),
+                _count_status(history, 'blocked'),
+                func.max(history.c.created_at),
+                func.max(db.case((history.c.status == 'fail', history.c.created_at), else_=None)),
+            )
+        ).one()
+
+        db.session.execute(
+            delete(CaseResultDaily).where(CaseResultDaily.case_id == case_id, CaseResultDaily.day == day),
+            execution_options={'synchronize_session': False}
+        )
+        total, pass_count, fail_count, blocked_count, last_result_at, last_fail_at = row
+        if total and case_id in project_by_case:
+            db.session.execute(insert(CaseResultDaily).values(
+                project_id=project_by_case[case_id],
+                case_id=case_id,
+                day=day,
+                total_count=total,
+                pass_count=pass_count,
+                fail_count=fail_count,
+                blocked_count=blocked_count,
+                last_result_at=last_result_at,
+                last_fail_at=last_fail_at,
+            ))
+
+
+def refresh_result_rollups_safe(touched: Iterable[tuple[int, Union[date, datetime]]]) -> None:
+    """결과 저장 흐름을 깨지 않도록, 실패 시 로그만 남기는 rollup 갱신 + 커밋"""
+    try:
+        refresh_result_rollups(touched)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        try:
+            from flask import current_app
+            current_app.logger.error(f'analytics rollup 갱신 실패: {e}')
+        except Exception:
+            pass
+
+
+def backfill_result_rollups(project_id: Optional[int] = None) -> int:
+    """
+    Result 이력으로 rollup 재구축 (project_id가 없으면 전체). 생성된 행 수 반환. (커밋은 호출 측에서)
+    """
+    history = _execution_history()
+    day = func.date(history.c.created_at)
+    source = (
+        select(
+            Case.project_id,
+            history.c.case_id,
+            day,
+            func.count(),
+            _count_status(history, 'pass'),
+            _count_status(history, 'fail'),
+            _count_status(history, 'blocked'),
+            func.max(history.c.created_at),
+            func.max(db.case((history.c.status == 'fail', history.c.created_at), else_=None)),
+        )
+        .join(Case, Case.id == history.c.case_id)
+        .group_by(Case.project_id, history.c.case_id, day)
+    )
+    clear = delete(CaseResultDaily)
+    if project_id is not None:
+        source = source.where(Case.project_id == project_id)
+        clear = clear.where(CaseResultDaily.project_id == project_id)
+
+    db.session.execute(clear, execution_options={'synchronize_session': False})
+    db.session.execute(insert(CaseResultDaily).from_select(
+        ['project_id', 'case_id', 'day', 'total_count', 'pass_count', 'fail_count', 'blocked_count',
+         'last_result_at', 'last_fail_at'],
+        source
+    ))
+    count_q = select(func.count(CaseResultDaily.id))
+    if project_id is not None:
+        count_q = count_q.where(CaseResultDaily.project_id == project_id)
+    return db.session.execute(count_q).scalar() or 0
+
+
+def rollup_window_start(days: int) -> date:
+    """최근 days일 윈도우의 시작일 (오늘 포함, UTC)"""
+    return datetime.utcnow().date() - timedelta(days=max(1, days) - 1)
+
+
+def case_window_totals(project_id: int, days: int):
+    """
+    윈도우 내 케이스별 합계 서브쿼리
+    (case_id, total_count, pass_count, fail_count, blocked_count, last_fail_at)
+    """
+    return (
+        select(
+            CaseResultDaily.case_id.label('case_id'),
+            func.sum(CaseResultDaily.total_count).label('total_count'),
+            func.sum(CaseResultDaily.pass_count).label('pass_count'),
+            func.sum(CaseResultDaily.fail_count).label('fail_count'),
+            func.sum(CaseResultDaily.blocked_count).label('blocked_count'),
+            func.max(CaseResultDaily.last_fail_at).label('last_fail_at'),
+        )
+        .where(and_(CaseResultDaily.project_id == project_id, CaseResultDaily.day >= rollup_window_start(days)))
+        .group_by(CaseResultDaily.case_id)
+        .subquery()
+    )
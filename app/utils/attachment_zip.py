@@ -0,0 +1,166 @@
+"""
+런 첨부파일 일괄 다운로드 (스트리밍 ZIP)
+
+- 파일을 미리 모으거나 임시 ZIP을 만들지 않고, 응답을 보내면서 ZIP을 만든다(제너레이터).
+  zipfile을 탐색 불가(non-seekable) 출력에 쓰면 항목 크기/CRC를 뒤쪽 data descriptor에 기록하므로
+  출력 버퍼는 블록 1~2개 크기로 유지되고, 첫 바이트가 바로 나간다.
+- 이미 압축된 미디어(이미지/영상/zip)는 STORED(재압축 없음), 텍스트/로그만 DEFLATED.
+- 폴더 구조: <순번>_C<case_id>_<케이스 제목>/<원본 파일명> (같은 이름은 ' (2)' 등으로 구분)
+- DB 조회(항목 목록)는 응답 전에 끝내고, 스트리밍 중에는 파일만 읽는다.
+"""
+from __future__ import annotations
+
+import io
+import os
+import re
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+from sqlalchemy import select
+
+from app import db
+from app.models import Attachment, Result, RunCaseArtifact
+from app.utils.run_diff import latest_status_rows
+
+# 이미 압축된 형식 (다시 압축해도 줄지 않고 CPU만 쓴다)
+STORED_EXTENSIONS = {
+    'png', 'jpg', 'jpeg', 'gif', 'webp',
+    'mp4', 'mov', 'webm', 'avi', 'mkv',
+    'zip', 'gz', '7z',
+}
+
+_READ_SIZE = 256 * 1024
+_TITLE_MAX = 60
+_UNSAFE_NAME_RE = re.compile(r'[\x00-\x1f\\/:*?"<>|]+')
+
+
+@dataclass
+class ZipEntry:
+    arcname: str
+    path: str
+    compress_type: int
+    created_at: Optional[datetime] = None
+
+
+def _safe_name(name: Optional[str], fallback: str) -> str:
+    name = _UNSAFE_NAME_RE.sub('_', (name or '').strip()).strip(' .')
+    return name or fallback
+
+
+def _compress_type(name: str) -> int:
+    ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    return zipfile.ZIP_STORED if ext in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+
+
+def _unique(arcname: str, used: set) -> str:
+    if arcname not in used:
+        used.add(arcname)
+        return arcname
+    stem, dot, ext = arcname.rpartition('.')
+    if not dot or '/' in ext:
+        stem, ext = arcname, ''
+    n = 2
+    while True:
+        candidate = f'{stem} ({n}).{ext}' if ext else f'{stem} ({n})'
+        if candidate not in used:
+            used.add(candidate)
+            return candidate
+        n += 1
+
+
+def run_attachment_entries(run_id: int, statuses: Optional[Iterable[str]] = None) -> list[ZipEntry]:
+    """
+    런의 첨부파일(실행 결과 첨부 + 산출물 첨부) -> ZIP 항목 목록 (런 케이스 순서)
+    statuses: 주어지면 최신 실행 상태가 그 안에 있는 케이스만 (미실행은 'notrun')
+    """
+    wanted = {s.strip().lower() for s in statuses or () if s and s.strip()}
+    # 순번은 필터와 관계없이 런 전체 순서 기준 (필터한 ZIP과 전체 ZIP의 폴더 이름이 같도록)
+    cases = [
+        (index, row) for index, row in enumerate(latest_status_rows(run_id), start=1)
+        if not wanted or (row.status or 'notrun') in wanted
+    ]
+    if not cases:
+        return []
+    case_ids = [row.case_id for _, row in cases]
+
+    by_case: dict = {}
+    for case_id, file_path, original_name, created_at in db.session.execute(
+        select(Result.case_id, Attachment.file_path, Attachment.original_name, Attachment.created_at)
+        .join(Result, Attachment.result_id == Result.id)
+        .where(Result.run_id == run_id, Result.case_id.in_(case_ids))
+        .union_all(
+            select(RunCaseArtifact.case_id, Attachment.file_path, Attachment.original_name, Attachment.created_at)
+            .join(RunCaseArtifact, Attachment.artifact_id == RunCaseArtifact.id)
+            .where(RunCaseArtifact.run_id == run_id, RunCaseArtifact.case_id.in_(case_ids))
+        )
+    ):
+        by_case.setdefault(case_id, []).append((file_path, original_name, created_at))
+
+    entries = []
+    used: set = set()
+    for index, row in cases:
+        files = by_case.get(row.case_id)
+        if not files:
+            continue
+        folder = f'{index:03d}_C{row.case_id}_{_safe_name(row.title, "case")[:_TITLE_MAX].rstrip()}'
+        for file_path, original_name, created_at in sorted(files, key=lambda f: (f[2] or datetime.min)):
+            if not file_path or not os.path.isfile(file_path):
+                continue
+            name = _safe_name(original_name, 'attachment')
+            entries.append(ZipEntry(
+                arcname=_unique(f'{folder}/{name}', used),
+                path=file_path,
+                compress_type=_compress_type(name),
+                created_at=created_at,
+            ))
+    return entries
+
+
+class _ZipSink(io.RawIOBase):
+    """zipfile 출력을 받아 두었다가 제너레이터가 꺼내 가는 버퍼 (탐색 불가)"""
+
+    def __init__(self):
+        super().__init__()
+        self._buf = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._buf += b
+        return len(b)
+
+    def take(self) -> bytes:
+        data = bytes(self._buf)
+        self._buf.clear()
+        return data
+
+
+def stream_zip(entries: Iterable[ZipEntry]) -> Iterator[bytes]:
+    """ZipEntry 목록을 ZIP 바이트 조각으로 내보낸다 (파일 크기와 무관하게 버퍼는 블록 1~2개)"""
+    sink = _ZipSink()
+    with zipfile.ZipFile(sink, 'w', allowZip64=True) as zf:
+        for entry in entries:
+            try:
+                f = open(entry.path, 'rb')
+            except OSError:
+                continue  # 조회 이후 삭제/GC된 파일
+            with f:
+                ts = entry.created_at or datetime.fromtimestamp(os.fstat(f.fileno()).st_mtime)
+                info = zipfile.ZipInfo(entry.arcname, date_time=max(ts, datetime(1980, 1, 1)).timetuple()[:6])
+                info.compress_type = entry.compress_type
+                info.file_size = os.fstat(f.fileno()).st_size  # 4GB 이상이면 ZIP64 헤더
+                with zf.open(info, 'w') as dst:
+                    for block in iter(lambda: f.read(_READ_SIZE), b''):
+                        dst.write(block)
+                        data = sink.take()
+                        if data:
+                            yield data
+            data = sink.take()
+            if data:
+                yield data
+    data = sink.take()  # 중앙 디렉터리
+    if data:
+        yield data
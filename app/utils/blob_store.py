@@ -0,0 +1,433 @@
+"""
+내용 주소(content-addressed) 파일 저장소
+
+- 파일은 SHA-256 해시로 저장한다: <BLOB_STORE_DIR>/<sha[:2]>/<sha[2:4]>/<sha>
+  (기본 <UPLOAD_FOLDER>/blobs, 디렉터리 하나에 파일이 몰리지 않도록 2단계 샤딩)
+- 같은 내용은 한 번만 저장되고, 여러 Attachment/CaseMedia/FeedbackAttachment/아바타가 같은 파일을 가리킨다.
+  각 행의 file_path에는 blob 절대 경로가 들어가므로 읽기/다운로드 경로는 그대로다.
+- 업로드 요청은 파싱 단계에서 BlobSpool로 청크를 바로 임시 파일에 쓰며 해시/크기를 계산한다
+  (메모리/별도 임시 파일 버퍼링 없음, 크기 제한 초과 시 즉시 중단). app.utils.upload_stream 참고.
+- blobs.ref_count로 참조 수를 센다. 행을 만들 때 put_*/retain_paths, 지울 때 release_paths.
+- 파일 삭제는 collect_garbage()만 한다. 실제 참조를 다시 세어 ref_count를 보정한 뒤,
+  참조가 0이고 유예 시간(BLOB_GC_GRACE_SEC)이 지난 blob만 지운다.
+- 저장소 이전 업로드(UPLOAD_FOLDER 평면 파일)는 그대로 읽히며, tools/blob_store.py migrate로 옮길 수 있다.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import shutil
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import BinaryIO, Iterable, Optional
+
+from flask import current_app
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app import db
+from app.models import Attachment, Blob, CaseMedia, FeedbackAttachment, User
+
+_CHUNK_SIZE = 1024 * 1024
+_SHA_RE = re.compile(r'^[0-9a-f]{64}$')
+_DEFAULT_GC_GRACE_SEC = 3600
+
+
+class BlobTooLarge(ValueError):
+    """저장 중 크기 제한 초과 (임시 파일은 이미 삭제됨)"""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f'파일 크기 제한 초과 ({max_bytes} bytes)')
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class StoredBlob:
+    """저장(또는 중복 재사용)된 blob"""
+    sha256: str
+    path: str
+    size: int
+    deduplicated: bool  # 이미 같은 내용이 저장되어 있었음
+
+
+def blob_root() -> str:
+    root = current_app.config.get('BLOB_STORE_DIR') or os.path.join(current_app.config['UPLOAD_FOLDER'], 'blobs')
+    return os.path.abspath(root)
+
+
+def blob_path(sha256: str) -> str:
+    return os.path.join(blob_root(), sha256[:2], sha256[2:4], sha256)
+
+
+def sha_from_path(path: Optional[str]) -> Optional[str]:
+    """blob 저장소 경로면 sha256, 아니면(이전 평면 업로드 등) None"""
+    if not path:
+        return None
+    name = os.path.basename(path)
+    if not _SHA_RE.match(name):
+        return None
+    return name if os.path.abspath(path) == blob_path(name) else None
+
+
+def derivative_path(sha256: str, name: str) -> str:
+    """blob 옆에 두는 파생 파일 경로 (<blob>.<name>, 예: 썸네일 <sha>.thumb.webp). blob과 함께 GC된다"""
+    return f'{blob_path(sha256)}.{name}'
+
+
+def derivative_source(path: Optional[str]) -> Optional[str]:
+    """파생 파일 경로면 원본 blob sha256, 아니면 None"""
+    if not path:
+        return None
+    sha, sep, name = os.path.basename(path).partition('.')
+    if not sep or not name or not _SHA_RE.match(sha):
+        return None
+    return sha if os.path.abspath(path) == derivative_path(sha, name) else None
+
+
+def _derivative_files(sha256: str) -> list[str]:
+    prefix = os.path.basename(blob_path(sha256)) + '.'
+    folder = os.path.dirname(blob_path(sha256))
+    try:
+        return [os.path.join(folder, n) for n in os.listdir(folder) if n.startswith(prefix)]
+    except OSError:
+        return []
+
+
+def _tmp_dir() -> str:
+    path = os.path.join(blob_root(), 'tmp')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        if path and os.path.exists(path):
+            os.remove(path)
+    except Exception:
+        pass
+
+
+def _retain_sha(sha256: str, size: int, count: int = 1) -> bool:
+    """ref_count += count (행이 없으면 생성). 기존 행이 있었으면 True"""
+    now = datetime.utcnow()
+    bump = update(Blob).where(Blob.sha256 == sha256).values(ref_count=Blob.ref_count + count, updated_at=now)
+    if db.session.execute(bump).rowcount:
+        return True
+    try:
+        with db.session.begin_nested():
+            db.session.execute(insert(Blob).values(
+                sha256=sha256, size=size, ref_count=count, created_at=now, updated_at=now
+            ))
+        return False
+    except IntegrityError:
+        # 동시에 같은 내용이 먼저 저장됨
+        db.session.execute(bump)
+        return True
+
+
+def _place(tmp_path: str, sha256: str, size: int, refs: int) -> StoredBlob:
+    """
+    임시 파일을 blob으로 확정. 참조 수를 먼저 올린 뒤(DB 쓰기 잠금) 파일을 둔다.
+    GC는 잠금을 잡은 채 행 삭제 -> 파일 삭제 -> 커밋 순으로 지우므로, 여기서 파일 존재를 확인하면 안전하다.
+    """
+    existed = _retain_sha(sha256, size, refs)
+    final_path = blob_path(sha256)
+    if os.path.exists(final_path):
+        _remove_quietly(tmp_path)
+        return StoredBlob(sha256, final_path, size, True)
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    os.replace(tmp_path, final_path)
+    os.utime(final_path)  # 가져온 오래된 파일이 GC의 고아 파일 유예 판정에 걸리지 않도록
+    return StoredBlob(sha256, final_path, size, existed)
+
+
+def put_stream(stream: BinaryIO, *, max_bytes: Optional[int] = None, refs: int = 1) -> StoredBlob:
+    """
+    스트림을 청크 단위로 임시 파일에 쓰며 SHA-256을 계산한 뒤 blob으로 저장하고 참조 수를 올린다.
+    max_bytes 초과 시 BlobTooLarge. (커밋은 호출 측에서)
+    """
+    tmp_path = os.path.join(_tmp_dir(), f'{uuid.uuid4().hex}.part')
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, 'wb') as out:
+            while True:
+                chunk = stream.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise BlobTooLarge(max_bytes)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        _remove_quietly(tmp_path)
+        raise
+    return _place(tmp_path, digest.hexdigest(), size, refs)
+
+
+class BlobSpool:
+    """
+    multipart 파일 파트를 받는 쓰기/읽기 가능한 임시 파일 (Werkzeug stream_factory 용, app.utils.upload_stream).
+
+    파서가 넘겨주는 청크를 blob 임시 파일에 바로 쓰면서 SHA-256/크기를 계산한다.
+    max_bytes를 넘으면 즉시 RequestEntityTooLarge(413)로 요청 본문 읽기를 중단한다.
+    put_upload()는 다시 읽지 않고 이 파일을 그대로 blob으로 옮긴다.
+    옮겨지지 않은 임시 파일은 요청 종료 시(close) 삭제된다.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.path = os.path.join(_tmp_dir(), f'{uuid.uuid4().hex}.part')
+        self.size = 0
+        self._file = open(self.path, 'w+b')
+        self._digest = hashlib.sha256()
+        self._placed = False
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            self.close()
+            raise RequestEntityTooLarge(f'파일 크기 제한 초과 ({self.max_bytes} bytes)')
+        self._digest.update(data)
+        return self._file.write(data)
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    def place(self) -> StoredBlob:
+        """받은 파일을 blob으로 확정하고 참조 수를 올린다 (1회만)"""
+        if self._placed:
+            raise ValueError('이미 저장된 업로드입니다')
+        self._file.close()
+        self._placed = True
+        return _place(self.path, self.sha256, self.size, 1)
+
+    def close(self) -> None:
+        self._file.close()
+        if not self._placed:
+            _remove_quietly(self.path)
+
+    def __getattr__(self, name):
+        # read/readline/seek/tell 등은 임시 파일로 위임 (FileStorage.save/read 호환)
+        return getattr(self._file, name)
+
+    def __iter__(self):
+        return iter(self._file)
+
+
+def put_upload(file_storage, *, max_bytes: Optional[int] = None) -> StoredBlob:
+    """
+    werkzeug FileStorage 업로드를 blob으로 저장 (참조 1).
+    요청 파싱 단계에서 BlobSpool로 받은 업로드는 다시 읽거나 복사하지 않고 그대로 옮긴다.
+    """
+    stream = file_storage.stream
+    if isinstance(stream, BlobSpool):
+        if max_bytes is not None and stream.size > max_bytes:
+            stream.close()
+            raise BlobTooLarge(max_bytes)
+        return stream.place()
+    return put_stream(stream, max_bytes=max_bytes)
+
+
+def put_file(path: str, *, sha256: Optional[str] = None, refs: int = 1, move: bool = True) -> StoredBlob:
+    """
+    로컬 파일을 blob으로 가져온다 (다운로드된 미디어, 이전 업로드 이관).
+    move=True면 원본을 옮기고, False면 하드링크(불가 시 복사)한다. (커밋은 호출 측에서)
+    """
+    size = os.path.getsize(path)
+    if sha256 is None:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+    tmp_path = os.path.join(_tmp_dir(), f'{uuid.uuid4().hex}.part')
+    if move:
+        try:
+            os.replace(path, tmp_path)
+        except OSError:
+            shutil.move(path, tmp_path)  # 다른 파일시스템
+    else:
+        try:
+            os.link(path, tmp_path)
+        except OSError:
+            shutil.copy2(path, tmp_path)
+    return _place(tmp_path, sha256, size, refs)
+
+
+def retain_paths(paths: Iterable[str]) -> int:
+    """이미 저장된 blob 경로들의 참조 수 증가 (행 복제 시). 증가한 참조 수 반환"""
+    counts = Counter(sha for sha in (sha_from_path(p) for p in paths) if sha)
+    for sha, n in counts.items():
+        path = blob_path(sha)
+        _retain_sha(sha, os.path.getsize(path) if os.path.exists(path) else 0, n)
+    return sum(counts.values())
+
+
+def release_paths(paths: Iterable[str]) -> int:
+    """
+    참조하던 행을 지울 때 호출. blob 경로의 참조 수를 줄이고 줄인 수를 반환한다.
+    blob이 아닌 경로(이전 평면 업로드)는 무시하므로, 0이면 호출 측이 기존 방식대로 파일을 정리한다.
+    """
+    counts = Counter(sha for sha in (sha_from_path(p) for p in paths) if sha)
+    now = datetime.utcnow()
+    for sha, n in counts.items():
+        db.session.execute(
+            update(Blob).where(Blob.sha256 == sha).values(
+                ref_count=case((Blob.ref_count > n, Blob.ref_count - n), else_=0),
+                updated_at=now,
+            )
+        )
+    return sum(counts.values())
+
+
+# ============ 아바타 (User.avatar_filename = '<sha256>.<ext>') ============
+
+def avatar_filename(stored: StoredBlob, ext: str) -> str:
+    return f'{stored.sha256}.{ext}'
+
+
+def avatar_file_path(filename: str) -> str:
+    """avatar_filename -> 실제 경로 (blob 또는 이전 uploads/avatars/<filename>)"""
+    stem = filename.rsplit('.', 1)[0]
+    if _SHA_RE.match(stem):
+        return blob_path(stem)
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'avatars', filename)
+
+
+def avatar_blob_path(filename: Optional[str]) -> Optional[str]:
+    """blob으로 저장된 아바타면 blob 경로 (release_paths용)"""
+    if not filename:
+        return None
+    stem = filename.rsplit('.', 1)[0]
+    return blob_path(stem) if _SHA_RE.match(stem) else None
+
+
+# ============ 참조 재계산 / GC ============
+
+def referenced_counts() -> Counter:
+    """실제 참조 수 {sha256: n} (Attachment/CaseMedia/FeedbackAttachment/아바타)"""
+    counts: Counter = Counter()
+    for model in (Attachment, CaseMedia, FeedbackAttachment):
+        for path, n in db.session.execute(
+            select(model.file_path, func.count()).group_by(model.file_path)
+        ):
+            sha = sha_from_path(path)
+            if sha:
+                counts[sha] += n
+    for (name,) in db.session.execute(select(User.avatar_filename).where(User.avatar_filename.isnot(None))):
+        path = avatar_blob_path(name)
+        if path:
+            counts[os.path.basename(path)] += 1
+    return counts
+
+
+def _walk_blob_files(root: str):
+    for first in os.listdir(root):
+        if len(first) != 2:
+            continue
+        first_dir = os.path.join(root, first)
+        if not os.path.isdir(first_dir):
+            continue
+        for second in os.listdir(first_dir):
+            second_dir = os.path.join(first_dir, second)
+            if not os.path.isdir(second_dir):
+                continue
+            for name in os.listdir(second_dir):
+                # 파생 파일(<sha>.<name>)은 원본 sha 기준으로 함께 판정
+                sha = name.partition('.')[0]
+                if _SHA_RE.match(sha):
+                    yield sha, os.path.join(second_dir, name)
+
+
+def collect_garbage(grace_sec: Optional[int] = None, dry_run: bool = False) -> dict:
+    """
+    참조 없는 blob 정리 (커밋 포함).
+
+    1) 실제 참조 수를 다시 세어 ref_count 보정 (cascade 삭제 등으로 어긋난 값)
+    2) ref_count=0 이고 마지막 참조 변경이 grace_sec보다 오래된 blob: 행 삭제 -> 파일 삭제 -> 커밋
+    3) 행이 없는 blob 파일(파생 파일 포함) / 오래된 임시 파일 삭제
+    """
+    if grace_sec is None:
+        grace_sec = int(current_app.config.get('BLOB_GC_GRACE_SEC', _DEFAULT_GC_GRACE_SEC))
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=max(0, grace_sec))
+    root = blob_root()
+    summary = {'blobs': 0, 'recounted': 0, 'deleted': 0, 'bytes_freed': 0, 'orphan_files': 0, 'tmp_files': 0}
+
+    actual = referenced_counts()
+    known = set()
+    for blob_id, sha, ref_count in db.session.execute(select(Blob.id, Blob.sha256, Blob.ref_count)).all():
+        known.add(sha)
+        summary['blobs'] += 1
+        n = actual.get(sha, 0)
+        if n != ref_count:
+            summary['recounted'] += 1
+            if not dry_run:
+                db.session.execute(update(Blob).where(Blob.id == blob_id).values(ref_count=n, updated_at=now))
+    # 참조는 있는데 행이 없는 blob (행 생성 전 중단 등) -> 행 복구
+    for sha in set(actual) - known:
+        path = blob_path(sha)
+        if os.path.exists(path) and not dry_run:
+            _retain_sha(sha, os.path.getsize(path), actual[sha])
+            known.add(sha)
+
+    candidates = db.session.execute(
+        select(Blob.id, Blob.sha256, Blob.size)
+        .where(Blob.ref_count <= 0, Blob.updated_at < cutoff)
+    ).all()
+    removed_paths = []
+    for blob_id, sha, size in candidates:
+        if dry_run:
+            summary['deleted'] += 1
+            summary['bytes_freed'] += size or 0
+            continue
+        # 조건부 삭제: 그 사이 다시 참조되었으면 건너뜀
+        deleted = db.session.execute(
+            delete(Blob).where(Blob.id == blob_id, Blob.ref_count <= 0, Blob.updated_at < cutoff),
+            execution_options={'synchronize_session': False}
+        ).rowcount
+        if deleted:
+            known.discard(sha)
+            removed_paths.append(blob_path(sha))
+            removed_paths.extend(_derivative_files(sha))
+            summary['deleted'] += 1
+            summary['bytes_freed'] += size or 0
+    for path in removed_paths:
+        _remove_quietly(path)
+    if not dry_run:
+        db.session.commit()
+
+    if os.path.isdir(root):
+        cutoff_ts = time.time() - max(0, grace_sec)
+        for sha, path in _walk_blob_files(root):
+            if sha in known:
+                continue
+            try:
+                if os.path.getmtime(path) >= cutoff_ts:
+                    continue
+            except OSError:
+                continue
+            summary['orphan_files'] += 1
+            if not dry_run:
+                _remove_quietly(path)
+        tmp_dir = os.path.join(root, 'tmp')
+        if os.path.isdir(tmp_dir):
+            for name in os.listdir(tmp_dir):
+                path = os.path.join(tmp_dir, name)
+                try:
+                    if os.path.getmtime(path) >= cutoff_ts:
+                        continue
+                except OSError:
+                    continue
+                summary['tmp_files'] += 1
+                if not dry_run:
+                    _remove_quietly(path)
+    return summary
@@ -0,0 +1,477 @@
+"""
+케이스 Import(CSV/Excel) 파싱/저장 유틸리티
+
+- 행 단위(iterrows) 처리 대신 pandas 컬럼 연산으로 매핑/정규화
+- 대용량 CSV는 chunk 단위로 읽어 메모리 사용량을 일정하게 유지
+- 확정(confirm)은 섹션 해석 -> 케이스/부가 데이터 일괄 INSERT 단계로 처리
+- 미디어 URL 다운로드는 커밋 이후 백그라운드 작업으로 분리
+"""
+from __future__ import annotations
+
+import io
+import os
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+import pandas as pd
+from sqlalchemy import func, insert
+
+from app import db
+from app.models import Section, Case, CaseJiraLink, CaseTranslation, CaseMedia
+from app.utils.translator import detect_language
+
+
+# 우선순위 정규화 테이블 (소문자 입력 -> 표준 값)
+PRIORITY_MAP = {
+    'blocker': 'Blocker',
+    'critical': 'Critical',
+    'high': 'High',
+    'medium': 'Medium',
+    'low': 'Low',
+    'p0': 'Blocker',
+    'p1': 'Critical',
+    'p2': 'High',
+    'p3': 'Medium',
+    'p4': 'Low'
+}
+
+# 파싱 결과 컬럼 (순서 = 응답 dict 키 순서)
+CASE_FIELDS = [
+    'row_number', 'title', 'steps', 'expected_result', 'priority',
+    'jira_links', 'media', 'section_full',
+    'section_1', 'section_2', 'section_3', 'section_4'
+]
+SECTION_FIELDS = ['section_1', 'section_2', 'section_3', 'section_4']
+MAX_SECTION_DEPTH = 4
+
+# chunk 크기 기본값 (행 수)
+DEFAULT_CHUNK_ROWS = 20000
+
+
+def detect_csv_encoding(content: bytes) -> str:
+    """CSV 인코딩 판별: UTF-8로 디코딩되면 utf-8, 아니면 CP949(한글 Windows)"""
+    try:
+        content.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def iter_import_frames(content: bytes, file_ext: str, chunk_rows: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """업로드 파일을 DataFrame chunk 단위로 순회 (컬럼명 strip 적용)
+
+    - CSV: chunk_rows 단위로 스트리밍 파싱 (인코딩은 한 번만 판별 -> 재파싱 없음)
+      모든 값을 문자열로 읽음: chunk마다 dtype을 추론하면 같은 컬럼이 chunk에 따라
+      int/float('1' vs '1.0')로 달라지고, 'NA'/'null' 같은 제목이 빈 값이 되기 때문
+    - Excel: openpyxl 특성상 한 번에 읽어 단일 chunk로 반환
+    """
+    if file_ext == 'csv':
+        encoding = detect_csv_encoding(content)
+        reader = pd.read_csv(
+            io.BytesIO(content),
+            encoding=encoding,
+            dtype=str,
+            keep_default_na=False,
+            chunksize=max(1, int(chunk_rows or DEFAULT_CHUNK_ROWS))
+        )
+        for chunk in reader:
+            chunk.columns = chunk.columns.str.strip()
+            yield chunk
+        return
+
+    df = pd.read_excel(io.BytesIO(content), engine='openpyxl')
+    df.columns = df.columns.str.strip()
+    yield df
+
+
+def read_import_dataframe(content: bytes, file_ext: str, chunk_rows: Optional[int] = None) -> pd.DataFrame:
+    """업로드 파일 전체를 하나의 DataFrame으로 읽기"""
+    frames = list(iter_import_frames(content, file_ext, chunk_rows=chunk_rows))
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+def _clean_text_column(col: pd.Series) -> pd.Series:
+    """NaN -> '', 나머지는 str 변환 후 strip (기존 str(val).strip()과 동일 결과)"""
+    return col.where(col.notna(), '').astype(str).str.strip()
+
+
+def frame_sample_rows(df: pd.DataFrame, limit: int = 5) -> list[dict]:
+    """미리보기용 샘플 행 (모든 값 문자열)"""
+    head = df.head(limit)
+    if head.empty:
+        return []
+    cleaned = pd.DataFrame({col: _clean_text_column(head[col]) for col in head.columns}, index=head.index)
+    return cleaned.to_dict('records')
+
+
+def _split_section_full(section_full: pd.Series) -> pd.DataFrame:
+    """'a > b > c' 형식을 section_1..4 컬럼으로 분해 (빈 단계는 제거)"""
+    normalized = (
+        section_full
+        .str.replace(r'\s*>\s*', '>', regex=True)
+        .str.replace(r'>{2,}', '>', regex=True)
+        .str.strip('>')
+        .str.strip()
+    )
+    parts = normalized.str.split('>', n=MAX_SECTION_DEPTH, expand=True)
+    out = pd.DataFrame(index=section_full.index)
+    for i, field_name in enumerate(SECTION_FIELDS):
+        if i in parts.columns:
+            out[field_name] = parts[i].fillna('').str.strip()
+        else:
+            out[field_name] = ''
+    return out
+
+
+def parse_case_frame(df: pd.DataFrame, column_mapping: dict, row_offset: int = 0) -> pd.DataFrame:
+    """컬럼 매핑을 적용하여 케이스 DataFrame(CASE_FIELDS 컬럼)을 반환
+
+    - 빈 제목(또는 'nan') 행은 제외
+    - section_full이 있으면 section_1..4보다 우선
+    - row_number는 원본 파일 기준(1-based, row_offset 반영)
+    """
+    n = len(df)
+    out = pd.DataFrame(index=df.index)
+    out['row_number'] = pd.RangeIndex(row_offset + 1, row_offset + n + 1)
+
+    for field_name in CASE_FIELDS[1:]:
+        source_column = (column_mapping or {}).get(field_name)
+        if source_column and source_column in df.columns:
+            out[field_name] = _clean_text_column(df[source_column])
+        else:
+            out[field_name] = 'Medium' if field_name == 'priority' else ''
+
+    # 섹션 전체(section_full) 우선 적용
+    has_full = out['section_full'] != ''
+    if has_full.any():
+        split = _split_section_full(out.loc[has_full, 'section_full'])
+        out.loc[has_full, SECTION_FIELDS] = split[SECTION_FIELDS]
+
+    # 빈 제목은 건너뛰기
+    out = out[(out['title'] != '') & (out['title'] != 'nan')]
+
+    # 우선순위 정규화 (미매핑/알 수 없는 값 -> Medium)
+    out['priority'] = out['priority'].str.lower().map(PRIORITY_MAP).fillna('Medium')
+
+    return out[CASE_FIELDS]
+
+
+def parse_import_file(content: bytes, file_ext: str, column_mapping: dict,
+                      chunk_rows: Optional[int] = None) -> tuple[pd.DataFrame, int]:
+    """파일 전체를 chunk 단위로 파싱하여 (케이스 DataFrame, 전체 행 수) 반환"""
+    parsed = []
+    total_rows = 0
+    for chunk in iter_import_frames(content, file_ext, chunk_rows=chunk_rows):
+        parsed.append(parse_case_frame(chunk.reset_index(drop=True), column_mapping, row_offset=total_rows))
+        total_rows += len(chunk)
+
+    if not parsed:
+        return pd.DataFrame(columns=CASE_FIELDS), 0
+    cases_df = parsed[0] if len(parsed) == 1 else pd.concat(parsed, ignore_index=True)
+    return cases_df.reset_index(drop=True), total_rows
+
+
+def prepend_section_path(cases_df: pd.DataFrame, root_path: list) -> pd.DataFrame:
+    """모든 케이스의 섹션 경로 앞에 최상위 섹션 경로(root_path) 추가
+
+    기존 section_1.. 값은 뒤로 밀리며, 최대 깊이(4)를 넘는 단계는 버린다.
+    (cases.html confirmImport()의 클라이언트 처리와 동일한 규칙)
+    """
+    root = [str(name).strip() for name in (root_path or []) if str(name).strip()][:MAX_SECTION_DEPTH]
+    if not root or cases_df.empty:
+        return cases_df
+    out = cases_df.copy()
+    depth = len(root)
+    for i in range(MAX_SECTION_DEPTH, 0, -1):
+        if i > depth:
+            out[f'section_{i}'] = cases_df[f'section_{i - depth}']
+        else:
+            out[f'section_{i}'] = root[i - 1]
+    return out
+
+
+def collect_section_names(cases_df: pd.DataFrame) -> list[str]:
+    """파싱 결과에 등장하는 섹션 이름(중복 제거, 정렬)"""
+    if cases_df.empty:
+        return []
+    values = pd.unique(cases_df[SECTION_FIELDS].to_numpy().ravel())
+    return sorted(str(v) for v in values if v)
+
+
+# ============================================================
+# Import 확정(confirm) - 단계별 set 기반 저장
+# ============================================================
+
+@dataclass
+class ImportResult:
+    created_cases: list = field(default_factory=list)  # [{id, title, section_path}]
+    touched_sections: int = 0  # 생성 또는 사용된 섹션 수
+    new_sections: int = 0  # 새로 생성된 섹션 수
+    media_jobs: list = field(default_factory=list)  # [(case_id, media_url)]
+
+
+def split_multi_values(value) -> list[str]:
+    """줄바꿈/파이프/콤마로 구분된 값을 분리 (중복 제거, 순서 유지)"""
+    if not value:
+        return []
+    text = str(value).replace('\r', '\n')
+    out = []
+    seen = set()
+    for chunk in text.split('\n'):
+        for p in chunk.split('|'):
+            for q in p.split(','):
+                s = q.strip()
+                if s and s not in seen:
+                    seen.add(s)
+                    out.append(s)
+    return out
+
+
+def case_section_path(case_data: dict) -> tuple:
+    """section_1..4에서 첫 빈 값 전까지의 섹션 경로"""
+    names = []
+    for field_name in SECTION_FIELDS:
+        name = str(case_data.get(field_name) or '').strip()
+        if not name:
+            break
+        names.append(name)
+    return tuple(names)
+
+
+def _resolve_section_paths(project_id: int, paths: list) -> tuple[dict, int]:
+    """섹션 경로 -> section_id 매핑 (없는 섹션은 depth별로 한 번에 생성)
+
+    - 프로젝트의 섹션을 1쿼리로 로드하여 (parent_id, name) -> id 맵 구성
+    - 부모별 order_index 최대값은 메모리에서 계산
+    - 누락 섹션은 depth마다 executemany INSERT + id 재조회 1회 (최대 4회)
+
+    Returns:
+      (path_ids: dict[tuple, int], new_count: int)
+    """
+    node_ids = {}
+    max_order = {}
+    existing = db.session.query(
+        Section.id, Section.parent_id, Section.name, Section.order_index
+    ).filter(Section.project_id == project_id).order_by(Section.id).all()
+    for sid, parent_id, name, order_index in existing:
+        node_ids.setdefault((parent_id, name), sid)
+        max_order[parent_id] = max(max_order.get(parent_id, 0), order_index or 0)
+
+    path_ids = {}
+    new_count = 0
+    for depth in range(1, MAX_SECTION_DEPTH + 1):
+        pending = []
+        pending_keys = set()
+        for path in paths:
+            if len(path) < depth:
+                continue
+            prefix = path[:depth]
+            if prefix in path_ids or prefix in pending_keys:
+                continue
+            parent_id = path_ids[prefix[:-1]] if depth > 1 else None
+            sid = node_ids.get((parent_id, prefix[-1]))
+            if sid is not None:
+                path_ids[prefix] = sid
+            else:
+                pending_keys.add(prefix)
+                pending.append((prefix, parent_id))
+
+        if not pending:
+            continue
+
+        rows = []
+        for prefix, parent_id in pending:
+            order_index = max_order.get(parent_id, 0) + 1
+            max_order[parent_id] = order_index
+            rows.append({
+                'project_id': project_id,
+                'parent_id': parent_id,
+                'name': prefix[-1],
+                'order_index': order_index
+            })
+        db.session.execute(insert(Section), rows)
+
+        # 방금 생성한 섹션 id를 (parent_id, name) 키로 재조회 (1쿼리)
+        created = db.session.query(Section.id, Section.parent_id, Section.name).filter(
+            Section.project_id == project_id,
+            Section.name.in_({prefix[-1] for prefix, _ in pending})
+        ).order_by(Section.id).all()
+        created_ids = {}
+        for sid, parent_id, name in created:
+            created_ids.setdefault((parent_id, name), sid)
+        for prefix, parent_id in pending:
+            sid = created_ids[(parent_id, prefix[-1])]
+            path_ids[prefix] = sid
+            node_ids[(parent_id, prefix[-1])] = sid
+        new_count += len(pending)
+
+    return path_ids, new_count
+
+
+def bulk_import_cases(project_id: int, cases_data: list, user_id: int) -> ImportResult:
+    """파싱된 케이스 목록을 set 기반으로 저장 (commit은 호출자 담당)
+
+    1) 섹션 경로 해석/누락 섹션 일괄 생성
+    2) 섹션별 order_index를 1쿼리로 조회 후 메모리에서 부여
+    3) Case / CaseJiraLink / 원본 언어 CaseTranslation을 executemany로 일괄 INSERT
+
+    미디어 URL은 다운로드하지 않고 media_jobs로 반환한다.
+
+    Raises:
+      ValueError: 섹션 정보가 없는 케이스가 있는 경우
+    """
+    case_paths = [case_section_path(c) for c in cases_data]
+    if any(not path for path in case_paths):
+        raise ValueError('섹션 정보가 없습니다. 최소 1개의 섹션이 필요합니다.')
+
+    unique_paths = list(dict.fromkeys(case_paths))
+    path_ids, new_sections = _resolve_section_paths(project_id, unique_paths)
+
+    # 섹션별 현재 최대 order_index (1쿼리)
+    target_section_ids = {path_ids[p] for p in unique_paths}
+    next_order = dict(
+        db.session.query(Case.section_id, func.max(Case.order_index))
+        .filter(Case.project_id == project_id, Case.section_id.in_(target_section_ids))
+        .group_by(Case.section_id)
+        .all()
+    )
+
+    case_rows = []
+    for case_data, path in zip(cases_data, case_paths):
+        section_id = path_ids[path]
+        order_index = (next_order.get(section_id) or 0) + 1
+        next_order[section_id] = order_index
+        case_rows.append({
+            'project_id': project_id,
+            'section_id': section_id,
+            'title': case_data['title'],
+            'steps': case_data.get('steps', ''),
+            'expected_result': case_data.get('expected_result', ''),
+            'priority': case_data.get('priority', 'Medium'),
+            'status': 'active',
+            'order_index': order_index,
+            'created_by': user_id,
+            'updated_by': user_id
+        })
+
+    # SQLite는 RETURNING 행 순서를 보장하지 않아(행마다 INSERT로 풀림) executemany 후
+    # (section_id, order_index) 키로 id를 재조회한다. 이번 import의 order_index는 섹션별로 유일하다.
+    db.session.execute(insert(Case), case_rows)
+    min_new_order = min(row['order_index'] for row in case_rows)
+    id_by_slot = {
+        (section_id, order_index): case_id
+        for case_id, section_id, order_index in db.session.query(Case.id, Case.section_id, Case.order_index).filter(
+            Case.project_id == project_id,
+            Case.section_id.in_(target_section_ids),
+            Case.order_index >= min_new_order
+        ).all()
+    }
+    case_ids = [id_by_slot[(row['section_id'], row['order_index'])] for row in case_rows]
+
+    result = ImportResult(touched_sections=len(path_ids), new_sections=new_sections)
+    jira_rows = []
+    translation_rows = []
+    for case_id, row, case_data, path in zip(case_ids, case_rows, cases_data, case_paths):
+        for url in split_multi_values(case_data.get('jira_links', '')):
+            jira_rows.append({'case_id': case_id, 'url': url, 'created_by': user_id})
+        for media_url in split_multi_values(case_data.get('media', '')):
+            result.media_jobs.append((case_id, media_url))
+
+        # 원본 언어로 캐시 저장 (신규 케이스이므로 기존 번역 존재 여부 조회 불필요)
+        source_lang = detect_language(row['title'])
+        translation_rows.append({
+            'case_id': case_id,
+            'source_lang': source_lang,
+            'target_lang': source_lang,
+            'title': row['title'],
+            'steps': row['steps'],
+            'expected_result': row['expected_result']
+        })
+
+        result.created_cases.append({
+            'id': case_id,
+            'title': row['title'],
+            'section_path': ' > '.join(path)
+        })
+
+    if jira_rows:
+        db.session.execute(insert(CaseJiraLink), jira_rows)
+    if translation_rows:
+        db.session.execute(insert(CaseTranslation), translation_rows)
+
+    return result
+
+
+# ============ 미디어 다운로드 단계 (케이스 저장 커밋 이후) ============
+
+def download_import_media(job, media_jobs: list, user_id: int) -> dict:
+    """
+    bulk_import_cases()가 모은 media_jobs[(case_id, url)]를 동시에 내려받아 CaseMedia로 연결한다.
+    백그라운드 작업(app.utils.jobs.submit_job)으로 실행되며, 진행률/실패 요약을 반환한다.
+    같은 URL/같은 내용의 파일은 blob 저장소에 한 번만 저장하고 여러 케이스가 같은 파일을 참조한다.
+    """
+    from collections import Counter
+
+    from flask import current_app
+    from app.utils.blob_store import put_file
+    from app.utils.media_download import download_media_batch
+
+    cfg = current_app.config
+    urls = [url for _, url in media_jobs]
+    job.set_total(len(set(u.strip() for u in urls if u and u.strip())))
+
+    summary = download_media_batch(
+        urls,
+        os.path.join(cfg['UPLOAD_FOLDER'], 'case_media'),
+        allowed_extensions=cfg['ALLOWED_EXTENSIONS'],
+        max_workers=int(cfg.get('IMPORT_MEDIA_WORKERS', 8) or 8),
+        per_host=int(cfg.get('IMPORT_MEDIA_PER_HOST', 4) or 4),
+        timeout=float(cfg.get('IMPORT_MEDIA_TIMEOUT_SEC', 10) or 10),
+        max_bytes=cfg.get('MAX_CONTENT_LENGTH'),
+        progress=lambda url, ok: job.advance(),
+    )
+
+    # 케이스가 그 사이 삭제되었을 수 있으므로 존재하는 케이스에만 연결
+    case_ids = {case_id for case_id, _ in media_jobs}
+    alive = {cid for (cid,) in db.session.query(Case.id).filter(Case.id.in_(case_ids)).all()} if case_ids else set()
+    rows = []
+    for case_id, url in media_jobs:
+        f = summary.files.get((url or '').strip())
+        if f is None or case_id not in alive:
+            continue
+        rows.append({
+            'case_id': case_id,
+            'file_path': f.file_path,
+            'original_name': f.original_name,
+            'mime_type': f.mime_type,
+            'created_by': user_id,
+        })
+    # 내려받은 파일을 blob 저장소로 옮기고, 연결된 행 수만큼 참조 수를 올린다
+    refs = Counter(row['file_path'] for row in rows)
+    downloaded = {f.file_path: f for f in summary.files.values()}
+    blob_paths = {}
+    for path, f in downloaded.items():
+        if refs[path]:
+            blob_paths[path] = put_file(path, sha256=f.sha256, refs=refs[path]).path
+        elif os.path.exists(path):
+            os.remove(path)  # 연결할 케이스가 없음
+    for row in rows:
+        row['file_path'] = blob_paths[row['file_path']]
+    if rows:
+        db.session.execute(insert(CaseMedia), rows)
+    db.session.commit()
+
+    from app.utils.thumbnails import schedule_thumbnails
+    schedule_thumbnails([(row['file_path'], row['original_name']) for row in rows], user_id=user_id)
+
+    out = summary.to_dict()
+    out['attached'] = len(rows)
+    current_app.logger.info(
+        f'Import 미디어 다운로드 완료: {out["downloaded"]}개 저장, {out["deduplicated"]}개 중복 재사용, '
+        f'{out["failed"]}개 실패, {len(rows)}개 연결'
+    )
+    return out
@@ -0,0 +1,231 @@
+"""
+런 케이스 내용 스냅샷 (내용 주소 기반 중복 제거)
+
+- 스냅샷 키: sha256(case_id, version, language, title/steps/expected_result/priority/jira_links/media_names)
+- 같은 내용은 case_snapshots에 한 번만 저장되고, 여러 런의 RunCase가 snapshot_id로 공유한다.
+  (매일 같은 회귀 런을 만들어도 케이스 본문은 중복 저장되지 않음)
+- 스냅샷 행은 불변이다. 내용이 바뀌면 새 해시 -> 새 행.
+- 런 종료 시에는 바뀌었을 수 있는 런 케이스만 조인 쿼리 1회로 골라(stale_run_cases) 그 행만 다시 스냅샷한다.
+  판단 기준: 케이스 버전/우선순위/언어, Jira 링크·미디어 개수와 최신 created_at, 번역 updated_at
+  (기준이 보수적이라 바뀌지 않은 행이 골라질 수는 있지만, 그 경우 해시가 같아 다시 쓰지 않는다)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import case, func, insert, or_, select, update
+
+from app import db
+from app.models import Case, CaseJiraLink, CaseMedia, CaseSnapshot, CaseTranslation, RunCase
+
+SNAPSHOT_FIELDS = ('title', 'steps', 'expected_result', 'priority', 'jira_links', 'media_names')
+
+# SQLite 변수 개수 제한을 피하기 위한 IN (...) 청크 크기
+_CHUNK = 500
+
+
+def snapshot_hash(case_id: int, version, language: Optional[str], content: dict) -> str:
+    """스냅샷 내용 해시 (필드 순서 고정 JSON -> sha256 hex)"""
+    payload = json.dumps(
+        [int(case_id), version, language or 'original', [content.get(f) for f in SNAPSHOT_FIELDS]],
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def case_link_names(case_ids: Iterable[int]) -> tuple[dict, dict]:
+    """케이스별 Jira 링크/미디어 파일명 스냅샷 문자열 ({case_id: 'a | b'}, {case_id: 'x | y'})"""
+    case_ids = list(case_ids)
+    jira_map: dict[int, list] = {}
+    media_map: dict[int, list] = {}
+    for start in range(0, len(case_ids), _CHUNK):
+        chunk = case_ids[start:start + _CHUNK]
+        for case_id, url in db.session.execute(
+            select(CaseJiraLink.case_id, CaseJiraLink.url)
+            .where(CaseJiraLink.case_id.in_(chunk)).order_by(CaseJiraLink.id)
+        ):
+            jira_map.setdefault(case_id, []).append(url)
+        for case_id, name in db.session.execute(
+            select(CaseMedia.case_id, CaseMedia.original_name)
+            .where(CaseMedia.case_id.in_(chunk)).order_by(CaseMedia.id)
+        ):
+            media_map.setdefault(case_id, []).append(name)
+    return (
+        {k: ' | '.join(v) for k, v in jira_map.items()},
+        {k: ' | '.join(v) for k, v in media_map.items()},
+    )
+
+
+def build_snapshot_rows(cases: Iterable[Case], language: Optional[str], translations: Optional[dict] = None) -> dict[int, dict]:
+    """
+    케이스 목록 -> {case_id: case_snapshots 행(dict, content_hash 포함)}
+    translations: {case_id: {'title','steps','expected_result'}} (ko/en 런일 때만)
+    """
+    cases = list(cases)
+    language = language or 'original'
+    translated = language in ('ko', 'en')
+    jira_map, media_map = case_link_names(c.id for c in cases)
+
+    rows = {}
+    for case_row in cases:
+        t = ((translations or {}).get(case_row.id) or {}) if translated else {}
+        content = {
+            'title': t.get('title') or case_row.title,
+            'steps': t.get('steps') or case_row.steps,
+            'expected_result': t.get('expected_result') or case_row.expected_result,
+            'priority': case_row.priority,
+            'jira_links': jira_map.get(case_row.id, ''),
+            'media_names': media_map.get(case_row.id, ''),
+        }
+        version = case_row.version or 1
+        rows[case_row.id] = {
+            'content_hash': snapshot_hash(case_row.id, version, language, content),
+            'case_id': case_row.id,
+            'case_version': version,
+            'language': language,
+            **content,
+        }
+    return rows
+
+
+def ensure_snapshots(rows: Iterable[dict]) -> dict[str, int]:
+    """
+    스냅샷 행들을 저장(이미 있는 해시는 재사용)하고 {content_hash: snapshot_id} 반환. (커밋은 호출 측에서)
+    """
+    by_hash = {r['content_hash']: r for r in rows}
+    hashes = list(by_hash)
+    ids: dict[str, int] = {}
+
+    def _lookup(keys):
+        for start in range(0, len(keys), _CHUNK):
+            chunk = keys[start:start + _CHUNK]
+            ids.update(db.session.execute(
+                select(CaseSnapshot.content_hash, CaseSnapshot.id).where(CaseSnapshot.content_hash.in_(chunk))
+            ).all())
+
+    _lookup(hashes)
+    missing = [h for h in hashes if h not in ids]
+    if missing:
+        db.session.execute(insert(CaseSnapshot), [by_hash[h] for h in missing])
+        _lookup(missing)
+    return ids
+
+
+def snapshot_ids_for_cases(cases: Iterable[Case], language: Optional[str], translations: Optional[dict] = None) -> dict[int, int]:
+    """케이스 목록 -> {case_id: snapshot_id} (필요한 스냅샷만 새로 저장)"""
+    rows = build_snapshot_rows(cases, language, translations)
+    ids = ensure_snapshots(rows.values())
+    return {case_id: ids[row['content_hash']] for case_id, row in rows.items()}
+
+
+def load_cases(case_ids: Iterable[int]) -> dict[int, Case]:
+    """{case_id: Case} (IN 청크 조회, 없는 id는 제외)"""
+    case_ids = list(dict.fromkeys(int(c) for c in case_ids))
+    out = {}
+    for start in range(0, len(case_ids), _CHUNK):
+        chunk = case_ids[start:start + _CHUNK]
+        out.update((c.id, c) for c in Case.query.filter(Case.id.in_(chunk)).all())
+    return out
+
+
+def add_run_cases(run_id: int, case_ids: Iterable[int], language: Optional[str], translations: Optional[dict] = None) -> int:
+    """
+    런에 케이스들을 스냅샷과 함께 추가 (case_ids 순서 = order_index, 없는 케이스는 건너뜀).
+    RunCase는 한 번에 bulk insert. 추가한 행 수 반환. (커밋은 호출 측에서)
+    """
+    case_ids = [int(c) for c in case_ids]
+    cases = load_cases(case_ids)
+    snapshot_ids = snapshot_ids_for_cases(cases.values(), language, translations)
+    rows = [
+        {'run_id': run_id, 'case_id': case_id, 'order_index': idx, 'snapshot_id': snapshot_ids[case_id]}
+        for idx, case_id in enumerate(case_ids)
+        if case_id in cases
+    ]
+    if rows:
+        db.session.execute(insert(RunCase), rows)
+    return len(rows)
+
+
+def _entry_count(column):
+    """' | ' 구분 스냅샷 문자열의 항목 수 (SQL 식)"""
+    return case(
+        (func.coalesce(column, '') == '', 0),
+        else_=(func.length(column) - func.length(func.replace(column, ' | ', ''))) / 3 + 1
+    )
+
+
+def stale_run_cases(run_id: int, language: Optional[str]) -> list:
+    """
+    스냅샷을 다시 떠야 할 수 있는 런 케이스 [(run_case_id, case_id, snapshot_id)] (조인 쿼리 1회)
+
+    - 스냅샷 없음, 케이스 버전/우선순위/언어 불일치
+    - Jira 링크/미디어: 개수가 다르거나 스냅샷 이후 추가된 항목이 있음
+    - ko/en 런: 스냅샷 이후 번역이 갱신됨
+    """
+    language = language or 'original'
+    run_case_ids = select(RunCase.case_id).where(RunCase.run_id == run_id)
+
+    def _links(model):
+        return (
+            select(model.case_id.label('case_id'), func.count().label('n'), func.max(model.created_at).label('stamp'))
+            .where(model.case_id.in_(run_case_ids))
+            .group_by(model.case_id)
+            .subquery()
+        )
+
+    jira = _links(CaseJiraLink)
+    media = _links(CaseMedia)
+    conditions = [
+        CaseSnapshot.id.is_(None),
+        CaseSnapshot.case_version != func.coalesce(Case.version, 1),
+        func.coalesce(CaseSnapshot.priority, '') != func.coalesce(Case.priority, ''),
+        func.coalesce(CaseSnapshot.language, 'original') != language,
+        _entry_count(CaseSnapshot.jira_links) != func.coalesce(jira.c.n, 0),
+        _entry_count(CaseSnapshot.media_names) != func.coalesce(media.c.n, 0),
+        jira.c.stamp > CaseSnapshot.created_at,
+        media.c.stamp > CaseSnapshot.created_at,
+    ]
+    stmt = (
+        select(RunCase.id, RunCase.case_id, RunCase.snapshot_id)
+        .join(Case, Case.id == RunCase.case_id)
+        .outerjoin(CaseSnapshot, CaseSnapshot.id == RunCase.snapshot_id)
+        .outerjoin(jira, jira.c.case_id == RunCase.case_id)
+        .outerjoin(media, media.c.case_id == RunCase.case_id)
+    )
+    if language in ('ko', 'en'):
+        translated = (
+            select(CaseTranslation.case_id.label('case_id'), func.max(CaseTranslation.updated_at).label('stamp'))
+            .where(CaseTranslation.case_id.in_(run_case_ids), CaseTranslation.target_lang == language)
+            .group_by(CaseTranslation.case_id)
+            .subquery()
+        )
+        stmt = stmt.outerjoin(translated, translated.c.case_id == RunCase.case_id)
+        conditions.append(translated.c.stamp > CaseSnapshot.created_at)
+    return db.session.execute(
+        stmt.where(RunCase.run_id == run_id, or_(*conditions)).order_by(RunCase.id)
+    ).all()
+
+
+def refresh_run_snapshots(run_id: int, language: Optional[str],
+                          translate: Optional[Callable[[list], dict]] = None) -> int:
+    """
+    바뀐 케이스만 다시 스냅샷하고 snapshot_id를 일괄 UPDATE. 실제로 바뀐 런 케이스 수 반환. (커밋은 호출 측에서)
+    translate: ko/en 런에서 case_ids -> {case_id: 번역} (골라진 케이스에 대해서만 호출)
+    """
+    stale = stale_run_cases(run_id, language)
+    if not stale:
+        return 0
+    case_ids = list(dict.fromkeys(row.case_id for row in stale))
+    translations = translate(case_ids) if translate and (language or 'original') in ('ko', 'en') else None
+    snapshot_ids = snapshot_ids_for_cases(load_cases(case_ids).values(), language, translations)
+    updates = [
+        {'id': row.id, 'snapshot_id': snapshot_ids[row.case_id]}
+        for row in stale
+        if row.case_id in snapshot_ids and row.snapshot_id != snapshot_ids[row.case_id]
+    ]
+    if updates:
+        db.session.execute(update(RunCase), updates)
+    return len(updates)
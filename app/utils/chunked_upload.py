@@ -0,0 +1,256 @@
+"""
+이어받기(resumable) 청크 업로드 세션
+
+수백 MB 영상처럼 큰 파일을 한 요청으로 올리다 연결이 끊기면 처음부터 다시 올려야 하므로,
+파일을 고정 크기 청크로 나눠 올리고 받은 청크만 기록한다.
+
+흐름: 세션 생성 -> 청크 PUT(offset, 청크별 SHA-256, 병렬 가능) -> 상태 조회(받은/빠진 청크) -> 완료
+완료 시 전체 SHA-256을 확인하고 blob 저장소로 옮긴다(put_file, 복사 없이 이동).
+
+저장 구조: <BLOB_STORE_DIR>/uploads/<session_id>/
+- meta.json : 사용자, 대상(target_type/target_id), 파일명, 전체 크기, 청크 크기, 기대 SHA-256
+- data.part : 전체 크기 파일. 청크는 자기 offset 위치에 쓴다(청크끼리 겹치지 않아 병렬 PUT 안전)
+- chunks/<index> : 받은 청크 표시(원자적 생성). 상태 조회는 이 목록만 본다.
+
+TTL(UPLOAD_SESSION_TTL_SEC)이 지난 세션은 새 세션을 만들 때 정리한다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from flask import current_app
+
+from app.utils.blob_store import StoredBlob, blob_root, put_file
+
+TARGET_TYPES = ('result', 'case_media', 'feedback')
+
+_DEFAULT_CHUNK_MB = 8
+_DEFAULT_TTL_SEC = 24 * 60 * 60
+_READ_SIZE = 1024 * 1024
+
+
+class ChunkError(ValueError):
+    """청크/세션 요청 오류 (status: 응답 HTTP 상태 코드)"""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class UploadSession:
+    id: str
+    path: str
+    meta: dict
+
+    @property
+    def user_id(self) -> int:
+        return int(self.meta.get('user_id') or 0)
+
+    @property
+    def total_size(self) -> int:
+        return int(self.meta['size'])
+
+    @property
+    def chunk_size(self) -> int:
+        return int(self.meta['chunk_size'])
+
+    @property
+    def total_chunks(self) -> int:
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    @property
+    def data_path(self) -> str:
+        return os.path.join(self.path, 'data.part')
+
+    def chunk_length(self, index: int) -> int:
+        return min(self.chunk_size, self.total_size - index * self.chunk_size)
+
+    def received(self) -> list[int]:
+        chunks_dir = os.path.join(self.path, 'chunks')
+        try:
+            names = os.listdir(chunks_dir)
+        except OSError:
+            return []
+        return sorted(int(n) for n in names if n.isdigit())
+
+    def status(self) -> dict:
+        received = self.received()
+        have = set(received)
+        missing = [i for i in range(self.total_chunks) if i not in have]
+        return {
+            'upload_id': self.id,
+            'target_type': self.meta['target_type'],
+            'target_id': self.meta['target_id'],
+            'filename': self.meta['filename'],
+            'size': self.total_size,
+            'chunk_size': self.chunk_size,
+            'total_chunks': self.total_chunks,
+            'received_chunks': received,
+            'missing_chunks': missing[:1000],
+            'received_bytes': sum(self.chunk_length(i) for i in received),
+            'complete': not missing,
+        }
+
+
+def _sessions_root() -> str:
+    return os.path.join(blob_root(), 'uploads')
+
+
+def _read_json(path: str):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_json(path: str, data) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def _ttl_sec() -> int:
+    return int(current_app.config.get('UPLOAD_SESSION_TTL_SEC', _DEFAULT_TTL_SEC) or _DEFAULT_TTL_SEC)
+
+
+def cleanup_upload_sessions(now: Optional[float] = None) -> None:
+    """TTL 동안 청크가 오지 않은 세션 디렉터리 삭제 (실패는 무시)"""
+    root = _sessions_root()
+    if not os.path.isdir(root):
+        return
+    now = now or time.time()
+    ttl = _ttl_sec()
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if now - os.path.getmtime(path) > ttl:
+                shutil.rmtree(path, ignore_errors=True)
+        except Exception:
+            pass
+
+
+def create_upload_session(*, user_id: int, target_type: str, target_id: int, filename: str,
+                          size: int, mime_type: Optional[str] = None,
+                          sha256: Optional[str] = None) -> UploadSession:
+    """세션 디렉터리와 전체 크기의 data.part(희소 파일)를 만든다"""
+    cleanup_upload_sessions()
+    chunk_mb = int(current_app.config.get('UPLOAD_CHUNK_MB', _DEFAULT_CHUNK_MB) or _DEFAULT_CHUNK_MB)
+    session_id = uuid.uuid4().hex
+    path = os.path.join(_sessions_root(), session_id)
+    os.makedirs(os.path.join(path, 'chunks'), exist_ok=True)
+    with open(os.path.join(path, 'data.part'), 'wb') as f:
+        f.truncate(size)
+    meta = {
+        'user_id': user_id,
+        'target_type': target_type,
+        'target_id': target_id,
+        'filename': filename,
+        'mime_type': mime_type,
+        'size': size,
+        'chunk_size': max(1, chunk_mb) * 1024 * 1024,
+        'sha256': (sha256 or '').lower() or None,
+        'created_at': time.time(),
+    }
+    _write_json(os.path.join(path, 'meta.json'), meta)
+    return UploadSession(id=session_id, path=path, meta=meta)
+
+
+def get_upload_session(session_id: str, *, user_id: int) -> Optional[UploadSession]:
+    """세션 조회 (다른 사용자의 세션이거나 없으면 None)"""
+    if not session_id or not all(c in '0123456789abcdef' for c in session_id):
+        return None
+    path = os.path.join(_sessions_root(), session_id)
+    meta = _read_json(os.path.join(path, 'meta.json'))
+    if not meta:
+        return None
+    session = UploadSession(id=session_id, path=path, meta=meta)
+    if session.user_id != user_id:
+        return None
+    return session
+
+
+def delete_upload_session(session: UploadSession) -> None:
+    shutil.rmtree(session.path, ignore_errors=True)
+
+
+def write_chunk(session: UploadSession, offset: int, stream: BinaryIO, length: Optional[int],
+                sha256: Optional[str] = None) -> int:
+    """
+    offset 위치의 청크 1개를 받아 data.part에 쓴다. 받은 청크 index 반환.
+
+    - offset은 chunk_size 배수, 길이는 chunk_size(마지막 청크만 나머지 크기)여야 한다.
+    - sha256(청크 본문의 hex)이 주어지면 쓰기 전에 검증한다. 불일치면 아무것도 쓰지 않는다.
+    - 같은 청크를 다시 보내도 된다(덮어쓰기, 재시도/중복 전송 안전).
+    """
+    if offset < 0 or offset % session.chunk_size or offset >= max(1, session.total_size):
+        raise ChunkError(f'offset은 chunk_size({session.chunk_size})의 배수여야 합니다')
+    index = offset // session.chunk_size
+    expected = session.chunk_length(index)
+    if length is not None and length != expected:
+        raise ChunkError(f'청크 크기가 올바르지 않습니다 (기대: {expected} bytes)')
+
+    # 청크 1개(기본 8MB)는 메모리에서 검증한 뒤 한 번에 쓴다
+    buf = bytearray()
+    while len(buf) <= expected:
+        data = stream.read(min(_READ_SIZE, expected + 1 - len(buf)))
+        if not data:
+            break
+        buf.extend(data)
+    if len(buf) != expected:
+        raise ChunkError(f'청크 크기가 올바르지 않습니다 (기대: {expected} bytes, 받음: {len(buf)} bytes)')
+    if sha256 and hashlib.sha256(buf).hexdigest() != sha256.strip().lower():
+        raise ChunkError('청크 SHA-256이 일치하지 않습니다', status=422)
+
+    # 청크 구간은 서로 겹치지 않으므로 병렬 PUT이 같은 파일에 각자 seek 후 써도 안전하다
+    try:
+        f = open(session.data_path, 'r+b')
+    except FileNotFoundError:
+        raise ChunkError('이미 완료된 업로드입니다', status=409)
+    with f:
+        f.seek(offset)
+        f.write(buf)
+    marker = os.path.join(session.path, 'chunks', str(index))
+    with open(marker, 'w'):
+        pass
+    os.utime(session.path)  # TTL은 마지막 청크 수신 기준
+    return index
+
+
+def finalize_upload(session: UploadSession) -> StoredBlob:
+    """
+    모든 청크를 받았으면 전체 SHA-256을 확인하고 blob으로 옮긴다 (참조 1, 커밋은 호출 측에서).
+    성공하면 세션 디렉터리는 지운다.
+    """
+    status = session.status()
+    if not status['complete']:
+        raise ChunkError(f'아직 받지 못한 청크가 있습니다 ({len(status["missing_chunks"])}개)', status=409)
+
+    # 동시에 완료 요청이 오면 하나만 진행 (원자적 rename으로 선점)
+    claimed = os.path.join(session.path, 'data.final')
+    try:
+        os.rename(session.data_path, claimed)
+    except FileNotFoundError:
+        raise ChunkError('이미 완료 처리 중인 업로드입니다', status=409)
+
+    digest = hashlib.sha256()
+    with open(claimed, 'rb') as f:
+        for block in iter(lambda: f.read(_READ_SIZE), b''):
+            digest.update(block)
+    sha = digest.hexdigest()
+    expected = session.meta.get('sha256')
+    if expected and sha != expected:
+        # 어느 청크가 잘못됐는지 알 수 없으므로 세션을 버리고 다시 올리게 한다
+        delete_upload_session(session)
+        raise ChunkError('파일 SHA-256이 일치하지 않습니다. 다시 업로드해주세요.', status=422)
+
+    stored = put_file(claimed, sha256=sha, refs=1, move=True)
+    delete_upload_session(session)
+    return stored
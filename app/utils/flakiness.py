@@ -0,0 +1,202 @@
+"""
+케이스 불안정성(flakiness) 엔진
+
+관측(observation) = 런 1개에서 케이스의 최종 실행 결과가 pass 또는 fail인 경우.
+(blocked/retest/na 등으로 끝난 런은 관측에서 제외)
+
+관측을 런 순서(run_id 오름차순 = 생성 시간 순)로 보며:
+- flips: 직전 관측과 상태가 다른(pass <-> fail) 횟수
+- ewma_flip_rate: 전환 여부(0/1)의 지수 가중 이동 평균 (최근 전환일수록 큰 비중)
+- confidence: 전환 기회(관측 - 1) 수 기반 신뢰도 n / (n + CONFIDENCE_PRIOR)
+- flaky_score = ewma_flip_rate * confidence
+
+갱신:
+- 새 런의 결과가 들어오면(가장 최근 관측 런보다 뒤) 저장된 상태에 관측 1개만 이어 붙인다. O(1)
+- 이미 관측한 런의 결과가 바뀌거나 삭제되면 해당 케이스 이력만 다시 계산한다.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, insert, select
+
+from app import db
+from app.models import Case, Result, CaseFlakiness
+
+EWMA_ALPHA = 0.3
+CONFIDENCE_PRIOR = 5
+OBSERVED_STATUSES = ('pass', 'fail')
+
+
+def _empty_state(case_id: int, project_id: int) -> dict:
+    return {
+        'case_id': case_id,
+        'project_id': project_id,
+        'observations': 0,
+        'pass_observations': 0,
+        'flips': 0,
+        'ewma_flip_rate': 0.0,
+        'confidence': 0.0,
+        'flaky_score': 0.0,
+        'last_run_id': None,
+        'last_status': None,
+        'last_observed_at': None,
+        'last_flip_at': None,
+    }
+
+
+def apply_observation(state: dict, run_id: int, status: str, observed_at: Optional[datetime]) -> dict:
+    """상태에 관측 1개(run_id 순서상 마지막)를 반영"""
+    if state['observations'] > 0:
+        flipped = 1 if status != state['last_status'] else 0
+        state['flips'] += flipped
+        state['ewma_flip_rate'] = EWMA_ALPHA * flipped + (1 - EWMA_ALPHA) * state['ewma_flip_rate']
+        if flipped:
+            state['last_flip_at'] = observed_at
+    state['observations'] += 1
+    if status == 'pass':
+        state['pass_observations'] += 1
+    transitions = state['observations'] - 1
+    state['confidence'] = transitions / (transitions + CONFIDENCE_PRIOR)
+    state['flaky_score'] = state['ewma_flip_rate'] * state['confidence']
+    state['last_run_id'] = run_id
+    state['last_status'] = status
+    state['last_observed_at'] = observed_at
+    return state
+
+
+def fold_observations(rows: Iterable[tuple]) -> dict[int, list[tuple]]:
+    """
+    (case_id, run_id, status, created_at) 행(케이스/런/시간 순 정렬)을
+    케이스별 관측 목록 [(run_id, status, created_at)]으로 변환 (런마다 마지막 결과만 사용)
+    """
+    latest: dict[tuple[int, int], tuple] = {}
+    for case_id, run_id, status, created_at in rows:
+        latest[(case_id, run_id)] = (status, created_at)
+    out: dict[int, list[tuple]] = {}
+    for (case_id, run_id), (status, created_at) in sorted(latest.items()):
+        if status in OBSERVED_STATUSES:
+            out.setdefault(case_id, []).append((run_id, status, created_at))
+    return out
+
+
+def _execution_rows(case_filter):
+    return db.session.execute(
+        select(Result.case_id, Result.run_id, Result.status, Result.created_at)
+        .where(case_filter)
+        .order_by(Result.case_id, Result.run_id, Result.created_at, Result.id)
+    ).all()
+
+
+def _save_states(states: list[dict], case_ids: list[int]) -> None:
+    if case_ids:
+        db.session.execute(
+            delete(CaseFlakiness).where(CaseFlakiness.case_id.in_(case_ids)),
+            execution_options={'synchronize_session': False}
+        )
+    if states:
+        db.session.execute(insert(CaseFlakiness), states)
+
+
+def recompute_case_flakiness(case_ids: list[int]) -> None:
+    """케이스들의 flakiness를 결과 이력 전체로 다시 계산 (커밋은 호출 측에서)"""
+    case_ids = sorted({int(c) for c in case_ids if c})
+    if not case_ids:
+        return
+    project_by_case = dict(db.session.execute(
+        select(Case.id, Case.project_id).where(Case.id.in_(case_ids))
+    ).all())
+    observations = fold_observations(_execution_rows(Result.case_id.in_(case_ids)))
+
+    states = []
+    for case_id in case_ids:
+        if case_id not in project_by_case or case_id not in observations:
+            continue
+        state = _empty_state(case_id, project_by_case[case_id])
+        for run_id, status, created_at in observations[case_id]:
+            apply_observation(state, run_id, status, created_at)
+        states.append(state)
+    _save_states(states, case_ids)
+
+
+def backfill_case_flakiness(project_id: Optional[int] = None) -> int:
+    """flakiness 전체 재계산 (project_id가 없으면 전체). 저장된 케이스 수 반환. (커밋은 호출 측에서)"""
+    case_q = select(Case.id, Case.project_id)
+    if project_id is not None:
+        case_q = case_q.where(Case.project_id == project_id)
+    project_by_case = dict(db.session.execute(case_q).all())
+
+    case_filter = Result.case_id.in_(select(Case.id).where(Case.project_id == project_id)) \
+        if project_id is not None else Result.case_id.isnot(None)
+    observations = fold_observations(_execution_rows(case_filter))
+
+    states = []
+    for case_id, obs in observations.items():
+        if case_id not in project_by_case:
+            continue
+        state = _empty_state(case_id, project_by_case[case_id])
+        for run_id, status, created_at in obs:
+            apply_observation(state, run_id, status, created_at)
+        states.append(state)
+
+    clear = delete(CaseFlakiness)
+    if project_id is not None:
+        clear = clear.where(CaseFlakiness.project_id == project_id)
+    db.session.execute(clear, execution_options={'synchronize_session': False})
+    if states:
+        db.session.execute(insert(CaseFlakiness), states)
+    return len(states)
+
+
+def record_result_flakiness(run_id: int, case_id: int) -> None:
+    """
+    (run_id, case_id) 결과가 기록/수정/삭제된 뒤 호출. (커밋은 호출 측에서)
+    새 런이면 관측 1개만 이어 붙이고, 이미 관측한 런이면 케이스 이력을 다시 계산한다.
+    """
+    state_row = db.session.get(CaseFlakiness, case_id)
+    if state_row is None or state_row.last_run_id is None or run_id <= state_row.last_run_id:
+        recompute_case_flakiness([case_id])
+        return
+
+    latest = db.session.execute(
+        select(Result.status, Result.created_at).where(
+            Result.run_id == run_id,
+            Result.case_id == case_id
+        ).order_by(Result.created_at.desc(), Result.id.desc()).limit(1)
+    ).first()
+    if latest is None or latest.status not in OBSERVED_STATUSES:
+        return
+
+    state = {c.name: getattr(state_row, c.name) for c in CaseFlakiness.__table__.columns}
+    apply_observation(state, run_id, latest.status, latest.created_at)
+    for key, value in state.items():
+        setattr(state_row, key, value)
+
+
+def record_result_flakiness_safe(run_id: int, case_id: int) -> None:
+    """결과 저장 흐름을 깨지 않도록, 실패 시 로그만 남기는 flakiness 갱신 + 커밋"""
+    try:
+        record_result_flakiness(run_id, case_id)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        try:
+            from flask import current_app
+            current_app.logger.error(f'flakiness 갱신 실패: {e}')
+        except Exception:
+            pass
+
+
+def recompute_case_flakiness_safe(case_ids: list[int]) -> None:
+    """런 초기화/삭제처럼 결과가 한꺼번에 지워진 뒤 호출. 실패 시 로그만 남기는 재계산 + 커밋"""
+    try:
+        recompute_case_flakiness(case_ids)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        try:
+            from flask import current_app
+            current_app.logger.error(f'flakiness 재계산 실패: {e}')
+        except Exception:
+            pass
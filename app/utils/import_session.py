@@ -0,0 +1,130 @@
+"""
+케이스 Import 세션 (서버 측 캐시)
+
+preview -> parse(컬럼 매핑) -> confirm 단계마다 같은 파일/케이스 목록을 다시 보내고
+pandas로 재파싱하던 흐름을 줄이기 위해, 업로드 1회 + 파싱 1회 결과를 디스크에 보관한다.
+
+저장 구조: <UPLOAD_FOLDER>/import_sessions/<session_id>/
+- meta.json    : project_id, user_id, 원본 파일명/확장자, 컬럼, 전체 행 수
+- raw.pkl      : 원본 파일을 읽은 DataFrame (preview에서 1회 생성)
+- parsed.pkl   : 컬럼 매핑 적용 결과 DataFrame (parse에서 생성, 매핑이 바뀌면 갱신)
+- mapping.json : parsed.pkl을 만든 컬럼 매핑
+
+pyarrow가 requirements에 없으므로 pandas pickle 포맷을 사용한다(서버가 직접 만든 파일만 읽음).
+"""
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+import pandas as pd
+from flask import current_app
+
+_SESSION_TTL_SEC = 6 * 60 * 60  # 6시간 지난 세션은 정리
+
+
+@dataclass
+class ImportSession:
+    id: str
+    path: str
+    meta: dict
+
+    @property
+    def project_id(self) -> int:
+        return int(self.meta.get('project_id') or 0)
+
+    @property
+    def user_id(self) -> int:
+        return int(self.meta.get('user_id') or 0)
+
+    def load_raw(self) -> pd.DataFrame:
+        return pd.read_pickle(os.path.join(self.path, 'raw.pkl'))
+
+    def load_parsed(self, column_mapping: Optional[dict] = None) -> Optional[pd.DataFrame]:
+        """캐시된 파싱 결과 (column_mapping이 주어지면 같은 매핑일 때만 반환)"""
+        parsed_path = os.path.join(self.path, 'parsed.pkl')
+        if not os.path.exists(parsed_path):
+            return None
+        if column_mapping is not None and _read_json(os.path.join(self.path, 'mapping.json')) != column_mapping:
+            return None
+        return pd.read_pickle(parsed_path)
+
+    def save_parsed(self, column_mapping: dict, cases_df: pd.DataFrame) -> None:
+        cases_df.to_pickle(os.path.join(self.path, 'parsed.pkl'))
+        _write_json(os.path.join(self.path, 'mapping.json'), column_mapping)
+
+
+def _sessions_root() -> str:
+    return os.path.join(current_app.config['UPLOAD_FOLDER'], 'import_sessions')
+
+
+def _read_json(path: str):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_json(path: str, data) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def cleanup_import_sessions(now: Optional[float] = None) -> None:
+    """TTL이 지난 세션 디렉터리 삭제 (실패는 무시)"""
+    root = _sessions_root()
+    if not os.path.isdir(root):
+        return
+    now = now or time.time()
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if now - os.path.getmtime(path) > _SESSION_TTL_SEC:
+                shutil.rmtree(path, ignore_errors=True)
+        except Exception:
+            pass
+
+
+def create_import_session(raw_df: pd.DataFrame, *, project_id: int, user_id: int,
+                          filename: str, file_ext: str) -> ImportSession:
+    """원본 DataFrame을 저장하고 새 세션 생성"""
+    cleanup_import_sessions()
+    session_id = uuid.uuid4().hex
+    path = os.path.join(_sessions_root(), session_id)
+    os.makedirs(path, exist_ok=True)
+    raw_df.to_pickle(os.path.join(path, 'raw.pkl'))
+    meta = {
+        'project_id': project_id,
+        'user_id': user_id,
+        'filename': filename,
+        'file_ext': file_ext,
+        'columns': [str(c) for c in raw_df.columns],
+        'total_rows': int(len(raw_df)),
+        'created_at': time.time(),
+    }
+    _write_json(os.path.join(path, 'meta.json'), meta)
+    return ImportSession(id=session_id, path=path, meta=meta)
+
+
+def get_import_session(session_id: str, *, project_id: int, user_id: int) -> Optional[ImportSession]:
+    """세션 조회 (다른 프로젝트/사용자의 세션이거나 없으면 None)"""
+    if not session_id or not all(c in '0123456789abcdef' for c in session_id):
+        return None
+    path = os.path.join(_sessions_root(), session_id)
+    meta = _read_json(os.path.join(path, 'meta.json'))
+    if not meta:
+        return None
+    session = ImportSession(id=session_id, path=path, meta=meta)
+    if session.project_id != project_id or session.user_id != user_id:
+        return None
+    return session
+
+
+def delete_import_session(session: ImportSession) -> None:
+    shutil.rmtree(session.path, ignore_errors=True)
@@ -0,0 +1,130 @@
+"""
+백그라운드 작업(Job) 실행기 + 진행 상태 레지스트리.
+
+- 요청 스레드를 오래 붙잡는 작업(미디어 다운로드 등)을 스레드 풀에서 실행한다.
+- 작업 함수는 app_context 안에서 실행되며, 첫 번째 인자로 JobState를 받아 진행률을 갱신한다.
+- 상태는 프로세스 메모리에만 보관한다.
+  NOTE: 개발/단일 프로세스 기준. 멀티프로세스/멀티서버 환경에서는 Redis/DB 기반으로 교체 필요.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from flask import current_app
+
+_JOB_WORKERS = 2
+_JOB_TTL_SEC = 60 * 60  # 완료 후 1시간 동안 상태 조회 가능
+
+_JOBS: dict[str, "JobState"] = {}
+_JOBS_LOCK = threading.Lock()
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+@dataclass
+class JobState:
+    """작업 1건의 진행 상태"""
+    id: str
+    kind: str
+    user_id: Optional[int] = None
+    project_id: Optional[int] = None
+    status: str = 'queued'  # queued | running | done | failed
+    total: int = 0
+    done: int = 0
+    message: str = ''
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def set_total(self, total: int) -> None:
+        with self._lock:
+            self.total = int(total)
+
+    def advance(self, n: int = 1, message: Optional[str] = None) -> None:
+        with self._lock:
+            self.done += n
+            if message is not None:
+                self.message = message
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                'id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'total': self.total,
+                'done': self.done,
+                'message': self.message,
+                'result': self.result,
+                'error': self.error,
+                'project_id': self.project_id,
+            }
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _JOBS_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=_JOB_WORKERS, thread_name_prefix='quickrail-job')
+    return _EXECUTOR
+
+
+def _cleanup_jobs(now: float) -> None:
+    stale = [jid for jid, j in _JOBS.items() if j.finished_at and now - j.finished_at > _JOB_TTL_SEC]
+    for jid in stale:
+        _JOBS.pop(jid, None)
+
+
+def submit_job(
+    kind: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    user_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+    **kwargs: Any,
+) -> JobState:
+    """
+    fn(job, *args, **kwargs)를 백그라운드에서 실행하고 JobState를 반환한다.
+    반드시 요청/앱 컨텍스트 안에서 호출해야 한다(현재 app 객체를 작업 스레드로 넘김).
+    fn의 반환값은 job.result에 저장된다.
+    """
+    app = current_app._get_current_object()
+    job = JobState(id=uuid.uuid4().hex, kind=kind, user_id=user_id, project_id=project_id)
+    with _JOBS_LOCK:
+        _cleanup_jobs(time.time())
+        _JOBS[job.id] = job
+
+    def _runner():
+        with app.app_context():
+            from app import db
+            job.status = 'running'
+            try:
+                job.result = fn(job, *args, **kwargs)
+                job.status = 'done'
+            except Exception as e:
+                job.error = str(e)
+                job.status = 'failed'
+                app.logger.error(f'백그라운드 작업 실패 ({kind}, {job.id}): {e}')
+                try:
+                    db.session.rollback()
+                except Exception:
+                    pass
+            finally:
+                job.finished_at = time.time()
+                db.session.remove()
+
+    _get_executor().submit(_runner)
+    return job
+
+
+def get_job(job_id: str) -> Optional[JobState]:
+    """작업 상태 조회 (없거나 만료되면 None)"""
+    with _JOBS_LOCK:
+        return _JOBS.get(job_id)
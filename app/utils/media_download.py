@@ -0,0 +1,190 @@
+"""
+외부 미디어 URL 일괄 다운로드.
+
+- requests.Session 1개를 공유(커넥션 풀 재사용)하고, 스레드 풀로 동시에 내려받는다.
+- 호스트별 동시 연결 수를 세마포어로 제한한다(한 서버에 요청이 몰리지 않도록).
+- 응답은 메모리에 올리지 않고 임시 파일로 스트리밍하면서 SHA-256을 계산한다.
+- 같은 URL은 한 번만 받고, 내용(해시)이 같은 파일은 하나만 남긴다.
+- DB 작업은 하지 않는다. 결과(MediaDownloadSummary)를 보고 호출 측에서 CaseMedia를 만든다.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from werkzeug.utils import secure_filename
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class DownloadedFile:
+    """다운로드(또는 중복 재사용)된 파일 1개"""
+    url: str
+    file_path: str
+    original_name: str
+    mime_type: Optional[str]
+    sha256: str
+    size: int
+
+
+@dataclass
+class MediaDownloadSummary:
+    """다운로드 결과 요약"""
+    total_urls: int = 0
+    downloaded: int = 0       # 실제로 새 파일로 저장된 수
+    deduplicated: int = 0     # 내용 해시가 같아 기존 파일을 재사용한 수
+    bytes_written: int = 0
+    files: dict[str, DownloadedFile] = field(default_factory=dict)  # url -> 파일
+    failures: list[dict] = field(default_factory=list)              # [{url, error}]
+
+    def to_dict(self) -> dict:
+        return {
+            'total_urls': self.total_urls,
+            'downloaded': self.downloaded,
+            'deduplicated': self.deduplicated,
+            'failed': len(self.failures),
+            'bytes_written': self.bytes_written,
+            'failures': self.failures[:50],
+        }
+
+
+def media_name_from_url(url: str, fallback: str) -> str:
+    """URL 경로에서 저장용 파일명 추출 (secure_filename 적용, 실패 시 빈 문자열)"""
+    path = urlparse(url).path or ''
+    name = os.path.basename(path) or fallback
+    return secure_filename(name)
+
+
+def _new_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def download_media_batch(
+    urls: Iterable[str],
+    media_dir: str,
+    *,
+    allowed_extensions: set[str],
+    max_workers: int = 8,
+    per_host: int = 4,
+    timeout: float = 10,
+    max_bytes: Optional[int] = None,
+    progress: Optional[Callable[[str, bool], None]] = None,
+) -> MediaDownloadSummary:
+    """
+    URL 목록을 동시에 내려받아 media_dir에 저장한다.
+
+    Args:
+      urls: 다운로드할 URL들 (중복은 1회만 처리)
+      allowed_extensions: 허용 확장자 (config ALLOWED_EXTENSIONS)
+      max_workers: 전체 동시 다운로드 수
+      per_host: 호스트별 동시 다운로드 수
+      max_bytes: 파일 1개 최대 크기 (초과 시 실패 처리)
+      progress: URL 1개 처리 완료마다 호출 (url, ok)
+    """
+    unique_urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+    summary = MediaDownloadSummary(total_urls=len(unique_urls))
+    if not unique_urls:
+        return summary
+
+    os.makedirs(media_dir, exist_ok=True)
+    lock = threading.Lock()
+    host_limits: dict[str, threading.Semaphore] = {}
+    by_hash: dict[str, DownloadedFile] = {}
+    session = _new_session(max(max_workers, per_host))
+
+    def _fail(url: str, error: str) -> None:
+        with lock:
+            summary.failures.append({'url': url, 'error': error})
+
+    def _host_limit(host: str) -> threading.Semaphore:
+        with lock:
+            sem = host_limits.get(host)
+            if sem is None:
+                sem = host_limits[host] = threading.Semaphore(max(1, per_host))
+            return sem
+
+    def _fetch(url: str) -> bool:
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+            _fail(url, 'http(s) URL이 아닙니다')
+            return False
+        name = media_name_from_url(url, 'case_media')
+        ext = name.rsplit('.', 1)[1].lower() if '.' in name else ''
+        if not name or ext not in allowed_extensions:
+            _fail(url, '허용되지 않은 파일 형식입니다')
+            return False
+
+        tmp_path = os.path.join(media_dir, f'.download_{uuid.uuid4().hex}.part')
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with _host_limit(parsed.netloc.lower()):
+                with session.get(url, stream=True, timeout=timeout) as resp:
+                    if resp.status_code >= 400:
+                        _fail(url, f'HTTP {resp.status_code}')
+                        return False
+                    mime = resp.headers.get('Content-Type')
+                    with open(tmp_path, 'wb') as f:
+                        for chunk in resp.iter_content(chunk_size=_CHUNK_SIZE):
+                            if not chunk:
+                                continue
+                            size += len(chunk)
+                            if max_bytes is not None and size > max_bytes:
+                                raise ValueError(f'파일 크기 제한 초과 ({max_bytes} bytes)')
+                            digest.update(chunk)
+                            f.write(chunk)
+        except Exception as e:
+            _remove_quietly(tmp_path)
+            _fail(url, str(e))
+            return False
+
+        sha = digest.hexdigest()
+        with lock:
+            existing = by_hash.get(sha)
+            if existing is None:
+                ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+                final_path = os.path.join(media_dir, f'{ts}_{sha[:12]}_{name}')
+                os.replace(tmp_path, final_path)
+                existing = by_hash[sha] = DownloadedFile(url, final_path, name, mime, sha, size)
+                summary.downloaded += 1
+                summary.bytes_written += size
+                summary.files[url] = existing
+                return True
+            summary.deduplicated += 1
+            summary.files[url] = DownloadedFile(url, existing.file_path, name, mime or existing.mime_type, sha, size)
+        _remove_quietly(tmp_path)
+        return True
+
+    def _task(url: str) -> None:
+        ok = _fetch(url)
+        if progress is not None:
+            progress(url, ok)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='media-dl') as pool:
+            list(pool.map(_task, unique_urls))
+    finally:
+        session.close()
+    return summary
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        if path and os.path.exists(path):
+            os.remove(path)
+    except Exception:
+        pass
@@ -0,0 +1,104 @@
+"""
+첨부/미디어/아바타 파일 응답
+
+- send_file(conditional=True)로 Range(영상 탐색)와 If-None-Match/If-Modified-Since(304)를 처리한다.
+- blob 저장소 파일은 내용 해시(SHA-256)를 강한 ETag로 쓴다. (썸네일 등 파생 파일은 '<sha>.<이름>')
+- 목록/템플릿은 URL에 ?v=<sha 앞 16자>를 붙인다(media_version). 요청의 v가 실제 파일 해시와 같으면
+  내용이 바뀔 수 없으므로 1년 immutable 캐시, 아니면 no-cache(매번 ETag 재검증, 바뀌지 않았으면 304).
+  (로그인한 사용자만 볼 수 있는 파일이므로 항상 private)
+- MEDIA_OFFLOAD 설정 시 파일 전송은 리버스 프록시에 맡기고 Python은 권한 확인 + 헤더만 만든다.
+  - 'x-accel-redirect' (nginx): X-Accel-Redirect: <MEDIA_ACCEL_PREFIX>/<sha[:2]>/<sha[2:4]>/<sha>
+      location /_blobs/ { internal; alias <BLOB_STORE_DIR>/; }
+  - 'x-sendfile' (Apache mod_xsendfile, lighttpd): Flask USE_X_SENDFILE로 절대 경로 전달
+  blob이 아닌 이전 평면 업로드 파일은 X-Accel 대상이 아니므로 항상 Flask가 직접 보낸다.
+"""
+from __future__ import annotations
+
+import mimetypes
+import os
+import re
+import unicodedata
+from typing import Optional
+from urllib.parse import quote
+
+from flask import current_app, request, send_file
+
+from app.utils.blob_store import blob_root, derivative_source, sha_from_path
+
+_VERSION_LEN = 16
+_SHA_STEM_RE = re.compile(r'^[0-9a-f]{64}$')
+_IMMUTABLE = 'private, max-age=31536000, immutable'
+_REVALIDATE = 'private, no-cache'
+
+
+def media_version(path_or_name: Optional[str]) -> Optional[str]:
+    """blob 경로/아바타 파일명('<sha>.<ext>') -> URL 캐시 버전(v), blob이 아니면 None"""
+    if not path_or_name:
+        return None
+    stem = os.path.basename(path_or_name).split('.', 1)[0]
+    return stem[:_VERSION_LEN] if _SHA_STEM_RE.match(stem) else None
+
+
+def versioned_url(url: str, path: Optional[str]) -> str:
+    """blob 파일이면 url에 ?v=<버전>을 붙인다"""
+    version = media_version(path)
+    if not version:
+        return url
+    return f'{url}{"&" if "?" in url else "?"}v={version}'
+
+
+def _content_disposition(as_attachment: bool, download_name: Optional[str]) -> dict:
+    # werkzeug.utils.send_file과 같은 규칙 (비 ASCII 파일명은 filename*로 전달)
+    if not download_name:
+        return {}
+    try:
+        download_name.encode('ascii')
+    except UnicodeEncodeError:
+        simple = unicodedata.normalize('NFKD', download_name).encode('ascii', 'ignore').decode('ascii')
+        value = {'filename': simple, 'filename*': f"UTF-8''{quote(download_name, safe='!#$&+^`|~')}"}
+    else:
+        value = {'filename': download_name}
+    return {'disposition': 'attachment' if as_attachment else 'inline', **value}
+
+
+def send_media(path: str, *, mimetype: Optional[str] = None, download_name: Optional[str] = None,
+               as_attachment: bool = False):
+    """권한 확인이 끝난 파일 1개 응답 (Range/ETag/캐시 헤더, 설정 시 프록시 전송)"""
+    sha = sha_from_path(path)
+    etag = sha
+    if not sha:
+        # 썸네일 등 blob 파생 파일: 원본 해시 + 파생 이름으로 식별 (원본과 같이 불변)
+        sha = derivative_source(path)
+        etag = os.path.basename(path) if sha else None
+    if not mimetype:
+        # blob 경로에는 확장자가 없으므로 원래 파일명 기준으로 추정
+        mimetype = mimetypes.guess_type(download_name or path)[0] or 'application/octet-stream'
+    offload = (current_app.config.get('MEDIA_OFFLOAD') or '').lower()
+
+    if sha and offload == 'x-accel-redirect':
+        prefix = (current_app.config.get('MEDIA_ACCEL_PREFIX') or '/_blobs').rstrip('/')
+        rel = os.path.relpath(path, blob_root()).replace(os.sep, '/')
+        response = current_app.response_class(mimetype=mimetype)
+        response.headers['X-Accel-Redirect'] = f'{prefix}/{rel}'
+        disposition = _content_disposition(as_attachment, download_name)
+        if disposition:
+            response.headers.set('Content-Disposition', disposition.pop('disposition'), **disposition)
+        response.set_etag(etag)
+        # 바디는 프록시가 채우므로 여기서는 304 판정만 (Range는 프록시가 처리)
+        response.make_conditional(request, accept_ranges=False)
+    else:
+        response = send_file(
+            path,
+            mimetype=mimetype,
+            as_attachment=as_attachment,
+            download_name=download_name,
+            conditional=True,
+            etag=etag or True,
+            max_age=None,
+        )
+
+    if sha and request.args.get('v') == sha[:_VERSION_LEN]:
+        response.headers['Cache-Control'] = _IMMUTABLE
+    else:
+        response.headers['Cache-Control'] = _REVALIDATE
+    return response
@@ -0,0 +1,191 @@
+"""
+프로젝트 복제 엔진 (set 기반)
+
+- 섹션은 깊이(level) 단위로 한 번에 INSERT 하고, old -> new id 매핑을 만든다.
+- 케이스/태그(CaseTag)/Jira 링크/미디어(CaseMedia)는 배치 단위 executemany로 복사한다.
+- 배치마다 커밋하여 쓰기 잠금을 짧게 유지하고, 진행률을 JobState에 기록한다.
+- 미디어 파일 자체는 복사하지 않고 같은 파일을 참조한다(blob 참조 수만 늘리고, 파일은 blob GC가 정리).
+
+새 id는 INSERT ... RETURNING(sort_by_parameter_order=True)으로 입력 행 순서대로 받아 매핑한다.
+복제 중에 다른 사용자가 새 프로젝트에 섹션/케이스를 추가해도 매핑이 어긋나지 않는다. (SQLite 3.35 이상)
+SQLite에서는 순서 보장을 위해 SQLAlchemy가 섹션/케이스를 행 단위 INSERT로 보내지만, 배치당 트랜잭션 1개라 비용은 작다.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, update
+
+from app import db
+from app.models import Project, Section, Case, Tag, CaseTag, CaseJiraLink, CaseMedia, CaseTranslation
+from app.utils.blob_store import release_paths, retain_paths
+
+COPY_BATCH_SIZE = 5000
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _insert_returning_ids(model, rows: list[dict]) -> list[int]:
+    """rows를 INSERT 하고 새 id를 rows와 같은 순서로 반환"""
+    ids = list(db.session.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True), rows
+    ).scalars())
+    if len(ids) != len(rows):
+        raise RuntimeError(f'복제 id 매핑 실패 ({model.__tablename__}: {len(ids)}/{len(rows)})')
+    return ids
+
+
+def _copy_sections(src_id: int, dst_id: int) -> dict[int, int]:
+    """섹션 트리를 level 단위로 복제하고 {old_section_id: new_section_id} 반환"""
+    rows = db.session.execute(
+        select(Section.id, Section.parent_id, Section.name, Section.order_index)
+        .where(Section.project_id == src_id)
+        .order_by(Section.id)
+    ).all()
+
+    children: dict[Optional[int], list] = {}
+    for row in rows:
+        children.setdefault(row.parent_id, []).append(row)
+
+    section_map: dict[int, int] = {}
+    level = children.get(None, [])
+    while level:
+        new_ids = _insert_returning_ids(Section, [{
+            'project_id': dst_id,
+            'parent_id': section_map.get(row.parent_id) if row.parent_id else None,
+            'name': row.name,
+            'order_index': row.order_index,
+        } for row in level])
+        section_map.update({row.id: new_id for row, new_id in zip(level, new_ids)})
+        level = [child for row in level for child in children.get(row.id, [])]
+    return section_map
+
+
+def _copy_tags(src_id: int, dst_id: int) -> dict[int, int]:
+    """프로젝트 태그 복제 {old_tag_id: new_tag_id} (태그명은 프로젝트 내 unique)"""
+    tags = db.session.execute(select(Tag.id, Tag.name).where(Tag.project_id == src_id)).all()
+    if not tags:
+        return {}
+    db.session.execute(insert(Tag), [{'project_id': dst_id, 'name': t.name} for t in tags])
+    new_by_name = dict(db.session.execute(select(Tag.name, Tag.id).where(Tag.project_id == dst_id)).all())
+    return {t.id: new_by_name[t.name] for t in tags}
+
+
+def copy_project_contents(job, src_project_id: int, dst_project_id: int, user_id: int) -> dict:
+    """
+    src 프로젝트의 섹션/케이스/태그/Jira 링크/미디어 참조를 dst 프로젝트로 복제한다.
+    백그라운드 작업(app.utils.jobs.submit_job)으로 실행된다. 실패하면 부분 복제본을 정리한다.
+    """
+    try:
+        return _copy_project_contents(job, src_project_id, dst_project_id, user_id)
+    except Exception:
+        db.session.rollback()
+        discard_project_copy(dst_project_id)
+        raise
+
+
+def _copy_project_contents(job, src_id: int, dst_id: int, user_id: int) -> dict:
+    case_rows = db.session.execute(
+        select(
+            Case.id, Case.section_id, Case.title, Case.steps, Case.expected_result,
+            Case.priority, Case.owner_id, Case.status, Case.order_index
+        ).where(Case.project_id == src_id).order_by(Case.id)
+    ).all()
+
+    job.message = '섹션 복제 중'
+    section_map = _copy_sections(src_id, dst_id)
+    tag_map = _copy_tags(src_id, dst_id)
+    db.session.commit()
+
+    # 섹션이 없는(다른 프로젝트 섹션을 가리키는 등) 케이스는 복제 대상에서 제외
+    case_rows = [row for row in case_rows if row.section_id in section_map]
+    job.set_total(len(case_rows))
+
+    counts = {'sections': len(section_map), 'cases': 0, 'tags': 0, 'jira_links': 0, 'media': 0}
+    job.message = '케이스 복제 중'
+    for batch in _chunks(case_rows, COPY_BATCH_SIZE):
+        new_ids = _insert_returning_ids(Case, [{
+            'project_id': dst_id,
+            'section_id': section_map[row.section_id],
+            'title': row.title,
+            'steps': row.steps,
+            'expected_result': row.expected_result,
+            'priority': row.priority,
+            'owner_id': row.owner_id,
+            'status': row.status,
+            'order_index': row.order_index,
+            'created_by': user_id,
+            'updated_by': user_id,
+        } for row in batch])
+        case_map = {row.id: new_id for row, new_id in zip(batch, new_ids)}
+        old_ids = list(case_map)
+
+        tag_rows = [
+            {'case_id': case_map[case_id], 'tag_id': tag_map[tag_id]}
+            for case_id, tag_id in db.session.execute(
+                select(CaseTag.case_id, CaseTag.tag_id).where(CaseTag.case_id.in_(old_ids))
+            ).all()
+            if tag_id in tag_map
+        ]
+        jira_rows = [
+            {'case_id': case_map[link.case_id], 'url': link.url, 'created_by': link.created_by}
+            for link in db.session.execute(
+                select(CaseJiraLink.case_id, CaseJiraLink.url, CaseJiraLink.created_by)
+                .where(CaseJiraLink.case_id.in_(old_ids)).order_by(CaseJiraLink.id)
+            ).all()
+        ]
+        media_rows = [
+            {
+                'case_id': case_map[m.case_id],
+                'file_path': m.file_path,
+                'original_name': m.original_name,
+                'mime_type': m.mime_type,
+                'created_by': m.created_by,
+            }
+            for m in db.session.execute(
+                select(CaseMedia.case_id, CaseMedia.file_path, CaseMedia.original_name,
+                       CaseMedia.mime_type, CaseMedia.created_by)
+                .where(CaseMedia.case_id.in_(old_ids)).order_by(CaseMedia.id)
+            ).all()
+        ]
+        if tag_rows:
+            db.session.execute(insert(CaseTag), tag_rows)
+        if jira_rows:
+            db.session.execute(insert(CaseJiraLink), jira_rows)
+        if media_rows:
+            db.session.execute(insert(CaseMedia), media_rows)
+            # 미디어 파일은 복사하지 않고 같은 blob을 공유 (참조 수만 증가)
+            retain_paths(r['file_path'] for r in media_rows)
+        db.session.commit()
+
+        counts['cases'] += len(batch)
+        counts['tags'] += len(tag_rows)
+        counts['jira_links'] += len(jira_rows)
+        counts['media'] += len(media_rows)
+        job.advance(len(batch))
+
+    job.message = '완료'
+    return counts
+
+
+def discard_project_copy(project_id: int) -> None:
+    """복제 실패 시 부분 복제본 삭제 (실패는 무시)"""
+    try:
+        case_ids = select(Case.id).where(Case.project_id == project_id).scalar_subquery()
+        release_paths(db.session.execute(
+            select(CaseMedia.file_path).where(CaseMedia.case_id.in_(case_ids))
+        ).scalars())
+        for model in (CaseTag, CaseJiraLink, CaseMedia, CaseTranslation):
+            db.session.execute(delete(model).where(model.case_id.in_(case_ids)))
+        db.session.execute(delete(Case).where(Case.project_id == project_id))
+        # 자식 섹션부터 지우도록 parent_id를 먼저 끊는다
+        db.session.execute(update(Section).where(Section.project_id == project_id).values(parent_id=None))
+        db.session.execute(delete(Section).where(Section.project_id == project_id))
+        db.session.execute(delete(Tag).where(Tag.project_id == project_id))
+        db.session.execute(delete(Project).where(Project.id == project_id))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
@@ -0,0 +1,101 @@
+"""
+종료된 런의 결과 이력 보관(archive)
+
+- close_run 시 (run, case)별 최신 실행 결과만 results에 남기고,
+  대체된(superseded) 실행 결과는 result_archive로 옮긴다. (대상 id 조회 후 INSERT ... SELECT + DELETE)
+- 옮기지 않는 결과:
+  - (run, case)별 최신 실행 결과 (상태/통계/flakiness의 기준)
+  - 첨부파일이 달린 결과 (Attachment.result_id 참조 유지)
+  - 버그 링크가 있는 결과 (최신 버그 링크 조회 유지)
+- 히스토리/결과 목록 API는 results + result_archive를 합쳐서 보여준다 (읽기 경로는 그대로 투명).
+"""
+from __future__ import annotations
+
+from sqlalchemy import delete, exists, func, insert, or_, select
+
+from app import db
+from app.models import Result, ResultArchive, Attachment
+
+_ARCHIVE_COLUMNS = ['id', 'run_id', 'case_id', 'executor_id', 'status', 'comment', 'bug_links', 'created_at']
+
+
+def _superseded_result_ids(run_id: int):
+    ranked = (
+        select(
+            Result.id.label('id'),
+            func.row_number().over(
+                partition_by=Result.case_id,
+                order_by=(Result.created_at.desc(), Result.id.desc())
+            ).label('rn')
+        )
+        .where(Result.run_id == run_id)
+        .subquery()
+    )
+    return (
+        select(Result.id)
+        .join(ranked, ranked.c.id == Result.id)
+        .where(
+            ranked.c.rn > 1,
+            or_(Result.bug_links.is_(None), Result.bug_links == ''),
+            ~exists().where(Attachment.result_id == Result.id)
+        )
+    )
+
+
+def archive_superseded_results(run_id: int) -> int:
+    """런의 대체된 실행 결과를 result_archive로 이동. 이동한 행 수 반환. (커밋은 호출 측에서)"""
+    ids = list(db.session.execute(_superseded_result_ids(run_id)).scalars())
+    if not ids:
+        return 0
+    moved = 0
+    # SQLite 변수 개수 제한을 피하기 위해 나눠서 처리
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        db.session.execute(insert(ResultArchive).from_select(
+            _ARCHIVE_COLUMNS,
+            select(*[getattr(Result, c) for c in _ARCHIVE_COLUMNS]).where(Result.id.in_(chunk))
+        ))
+        moved += db.session.execute(
+            delete(Result).where(Result.id.in_(chunk)),
+            execution_options={'synchronize_session': False}
+        ).rowcount or 0
+    return moved
+
+
+def archive_superseded_results_safe(run_id: int) -> int:
+    """런 종료 흐름을 깨지 않도록, 실패 시 로그만 남기는 보관 + 커밋"""
+    try:
+        moved = archive_superseded_results(run_id)
+        db.session.commit()
+        return moved
+    except Exception as e:
+        db.session.rollback()
+        try:
+            from flask import current_app
+            current_app.logger.error(f'결과 보관 실패(run_id={run_id}): {e}')
+        except Exception:
+            pass
+        return 0
+
+
+def result_history(run_id: int, case_id=None) -> list:
+    """
+    results + result_archive를 합친 이력 (created_at 내림차순).
+    두 모델 모두 id/case/executor/status/comment/bug_links/created_at 속성을 가진다.
+    """
+    hot = Result.query.filter(Result.run_id == run_id)
+    archived = ResultArchive.query.filter(ResultArchive.run_id == run_id)
+    if case_id is not None:
+        hot = hot.filter(Result.case_id == case_id)
+        archived = archived.filter(ResultArchive.case_id == case_id)
+    rows = hot.all() + archived.all()
+    rows.sort(key=lambda r: (r.created_at is not None, r.created_at, r.id), reverse=True)
+    return rows
+
+
+def clear_run_archive(run_id: int) -> int:
+    """런 결과 초기화 시 보관 이력도 삭제 (커밋은 호출 측에서)"""
+    return db.session.execute(
+        delete(ResultArchive).where(ResultArchive.run_id == run_id),
+        execution_options={'synchronize_session': False}
+    ).rowcount or 0
@@ -0,0 +1,178 @@
+"""
+케이스 x 런(또는 빌드) 결과 매트릭스
+
+- 최근 N개 런(또는 build_label N개)에 대해 RunCase 포함 여부와 실행 결과를
+  정수 컬럼(run_id, case_id, 상태 코드)만 SELECT 하여 ORM 객체 없이 튜플로 받아 numpy 배열로 만든다.
+- 결과는 created_at 순으로 읽어 (run, case)별 마지막(최신) 행만 int8 배열(케이스 x 컬럼)에 넣는다.
+  (윈도 함수 서브쿼리를 materialize 하는 것보다 SQLite에서 훨씬 빠름)
+- 선택적으로 행 단위 run-length encoding([code, count, code, count, ...])으로 응답 크기를 줄인다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app import db
+from app.models import Case, Run, RunCase, Result
+
+# 상태 코드 (0: 런에 포함되지 않음, 1: 포함되었으나 미실행)
+STATUS_CODES = ['not_in_run', 'untested', 'pass', 'fail', 'blocked', 'retest', 'na', 'skipped', 'other']
+_CODE_BY_STATUS = {name: code for code, name in enumerate(STATUS_CODES)}
+NOT_IN_RUN = 0
+UNTESTED = 1
+OTHER = _CODE_BY_STATUS['other']
+
+
+@dataclass
+class ResultMatrix:
+    columns: list          # [{run_id, name, build_label, created_at}] 또는 [{build_label, run_ids}]
+    case_ids: list
+    case_titles: list
+    matrix: np.ndarray     # int8 (len(case_ids), len(columns))
+
+
+def _select_runs(project_id: int, limit: int, by_build: bool) -> tuple[list, list, dict]:
+    """(columns, run_ids, column_index_by_run_id) - 컬럼은 오래된 것 -> 최신 순"""
+    if not by_build:
+        runs = db.session.execute(
+            select(Run.id, Run.name, Run.build_label, Run.created_at)
+            .where(Run.project_id == project_id)
+            .order_by(Run.created_at.desc(), Run.id.desc())
+            .limit(limit)
+        ).all()[::-1]
+        columns = [{
+            'run_id': r.id,
+            'name': r.name,
+            'build_label': r.build_label,
+            'created_at': r.created_at.isoformat() if r.created_at else None
+        } for r in runs]
+        return columns, [r.id for r in runs], {r.id: i for i, r in enumerate(runs)}
+
+    labels = db.session.execute(
+        select(Run.build_label, func.max(Run.created_at).label('last_at'))
+        .where(Run.project_id == project_id, Run.build_label.isnot(None), Run.build_label != '')
+        .group_by(Run.build_label)
+        .order_by(func.max(Run.created_at).desc())
+        .limit(limit)
+    ).all()[::-1]
+    index_by_label = {row.build_label: i for i, row in enumerate(labels)}
+    runs = db.session.execute(
+        select(Run.id, Run.build_label)
+        .where(Run.project_id == project_id, Run.build_label.in_(list(index_by_label)))
+        .order_by(Run.id)
+    ).all()
+    columns = [{'build_label': row.build_label, 'run_ids': []} for row in labels]
+    for r in runs:
+        columns[index_by_label[r.build_label]]['run_ids'].append(r.id)
+    return columns, [r.id for r in runs], {r.id: index_by_label[r.build_label] for r in runs}
+
+
+def _fetch_int_matrix(stmt, n_cols: int) -> np.ndarray:
+    """
+    정수 컬럼만 SELECT 하는 문장을 실행해 (n, n_cols) int64 배열로 반환.
+    수십만 행에서 ORM 객체/중간 리스트를 만들지 않도록 행 값을 바로 np.fromiter로 펼쳐 읽는다.
+    """
+    rows = db.session.execute(stmt)
+    flat = np.fromiter(chain.from_iterable(rows), dtype=np.int64)
+    return flat.reshape(-1, n_cols)
+
+
+def _index_of(sorted_keys: np.ndarray, order: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """values 각각의 원래 위치 (sorted_keys = keys[order])"""
+    return order[np.searchsorted(sorted_keys, values)]
+
+
+def build_result_matrix(project_id: int, *, section_ids: Optional[list] = None,
+                        limit: int = 20, by_build: bool = False) -> ResultMatrix:
+    """
+    프로젝트(또는 섹션 id 목록) 케이스들의 최근 limit개 런/빌드 결과 매트릭스.
+    빌드 모드에서 같은 빌드에 런이 여러 개면, 케이스가 포함된 가장 나중 런(id 기준)의 상태를 사용한다.
+    """
+    case_filter = select(Case.id).where(Case.project_id == project_id, Case.status == 'active')
+    if section_ids is not None:
+        case_filter = case_filter.where(Case.section_id.in_(section_ids))
+    cases = db.session.execute(
+        select(Case.id, Case.title).where(Case.id.in_(case_filter))
+        .order_by(Case.section_id, Case.order_index, Case.id)
+    ).all()
+    case_ids = [c.id for c in cases]
+
+    columns, run_ids, column_by_run = _select_runs(project_id, limit, by_build)
+    matrix = np.zeros((len(case_ids), len(columns)), dtype=np.int8)
+    if not case_ids or not run_ids:
+        return ResultMatrix(columns, case_ids, [c.title for c in cases], matrix)
+
+    # 런 포함 여부 (RunCase) + 실행 결과 (created_at 순: 나중 결과가 덮어써서 최신 결과가 남음)
+    members = _fetch_int_matrix(
+        select(RunCase.run_id, RunCase.case_id)
+        .where(RunCase.run_id.in_(run_ids), RunCase.case_id.in_(case_filter)),
+        2
+    )
+    status_code = db.case(
+        {status: code for code, status in enumerate(STATUS_CODES) if code > UNTESTED and code != OTHER},
+        value=Result.status,
+        else_=OTHER
+    )
+    results = _fetch_int_matrix(
+        select(Result.run_id, Result.case_id, status_code)
+        .where(
+            Result.run_id.in_(run_ids),
+            Result.case_id.in_(case_filter)
+        )
+        .order_by(Result.created_at, Result.id),
+        3
+    )
+
+    # case_id / run_id -> 행/열 인덱스 (벡터화)
+    case_arr = np.asarray(case_ids, dtype=np.int64)
+    case_order = np.argsort(case_arr)
+    case_sorted = case_arr[case_order]
+    run_arr = np.asarray(run_ids, dtype=np.int64)
+    run_order = np.argsort(run_arr)
+    run_sorted = run_arr[run_order]
+
+    per_run = np.zeros((len(case_ids), len(run_ids)), dtype=np.int8)
+    member_mask = np.zeros(per_run.shape, dtype=bool)
+    if len(members):
+        rows = _index_of(case_sorted, case_order, members[:, 1])
+        cols = _index_of(run_sorted, run_order, members[:, 0])
+        member_mask[rows, cols] = True
+        per_run[rows, cols] = UNTESTED
+    if len(results):
+        rows = _index_of(case_sorted, case_order, results[:, 1])
+        cols = _index_of(run_sorted, run_order, results[:, 0])
+        # 팬시 인덱스 대입은 중복 인덱스의 "마지막 값 우선"을 보장하지 않으므로
+        # (런, 케이스)마다 최신 결과(created_at 순 정렬의 마지막 행)만 남긴 뒤 대입
+        keys = rows.astype(np.int64) * len(run_ids) + cols
+        _, last_rev = np.unique(keys[::-1], return_index=True)
+        latest = len(keys) - 1 - last_rev
+        per_run[rows[latest], cols[latest]] = results[latest, 2]
+    per_run[~member_mask] = NOT_IN_RUN
+
+    if not by_build:
+        matrix = per_run
+    else:
+        # run_ids는 id 오름차순: 나중 런이 (케이스가 포함된 경우) 앞선 런을 덮어씀
+        for j, run_id in enumerate(run_ids):
+            col = column_by_run[run_id]
+            run_col = per_run[:, j]
+            matrix[:, col] = np.where(run_col != NOT_IN_RUN, run_col, matrix[:, col])
+    return ResultMatrix(columns, case_ids, [c.title for c in cases], matrix)
+
+
+def rle_encode_rows(matrix: np.ndarray) -> list[list[int]]:
+    """행마다 [code, count, code, count, ...] 형태의 run-length encoding"""
+    out = []
+    n_cols = matrix.shape[1]
+    for row in matrix:
+        if n_cols == 0:
+            out.append([])
+            continue
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(row)) + 1))
+        counts = np.diff(np.concatenate((starts, [n_cols])))
+        out.append(np.column_stack((row[starts], counts)).ravel().tolist())
+    return out
@@ -0,0 +1,105 @@
+"""
+런 간 비교 (run diff)
+
+- 런마다 쿼리 1회로 (case_id, 케이스 버전 스냅샷, 제목, 최신 실행 상태)를 가져온다.
+  RunCase LEFT JOIN Result 위에서 ROW_NUMBER() OVER (PARTITION BY run_case ORDER BY created_at DESC, id DESC) = 1
+  (윈도 서브쿼리를 따로 만들어 다시 JOIN 하면 SQLite가 인덱스 없이 반복 스캔하므로 한 번에 순위를 매긴다)
+- 두 결과를 case_id dict로 맞춰(hash join) 메모리에서 분류한다.
+
+분류 (base = 비교 기준 런, target = 대상 런):
+- newly_failing: target이 fail, base는 fail이 아님
+- fixed: base가 fail, target이 pass
+- still_failing: 둘 다 fail
+- added / removed: target에만 / base에만 포함된 케이스
+- content_changed: 양쪽에 있고 스냅샷 케이스 버전이 다른 케이스 (상태 분류와 별개로 표시)
+"""
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models import Case, CaseSnapshot, RunCase, Result
+
+DIFF_CATEGORIES = ('newly_failing', 'fixed', 'still_failing', 'added', 'removed', 'content_changed')
+
+
+def latest_status_rows(run_id: int) -> list:
+    """런의 케이스별 (case_id, version, title, status) - 미실행이면 status=None"""
+    ranked = (
+        select(
+            RunCase.case_id.label('case_id'),
+            func.coalesce(CaseSnapshot.case_version, Case.version, 1).label('version'),
+            func.coalesce(CaseSnapshot.title, Case.title).label('title'),
+            Result.status.label('status'),
+            RunCase.order_index.label('order_index'),
+            RunCase.id.label('run_case_id'),
+            func.row_number().over(
+                partition_by=RunCase.id,
+                order_by=(Result.created_at.desc(), Result.id.desc())
+            ).label('rn')
+        )
+        .join(Case, Case.id == RunCase.case_id)
+        .outerjoin(CaseSnapshot, CaseSnapshot.id == RunCase.snapshot_id)
+        .outerjoin(Result, (Result.run_id == RunCase.run_id) & (Result.case_id == RunCase.case_id))
+        .where(RunCase.run_id == run_id)
+        .subquery()
+    )
+    return db.session.execute(
+        select(ranked.c.case_id, ranked.c.version, ranked.c.title, ranked.c.status)
+        .where(ranked.c.rn == 1)
+        .order_by(ranked.c.order_index, ranked.c.run_case_id)
+    ).all()
+
+
+def _entry(case_id: int, base, target) -> dict:
+    return {
+        'case_id': case_id,
+        'title': (target or base).title,
+        'base_status': base.status if base else None,
+        'target_status': target.status if target else None,
+        'base_version': base.version if base else None,
+        'target_version': target.version if target else None,
+    }
+
+
+def diff_runs(base_run_id: int, target_run_id: int) -> dict:
+    """base 런 대비 target 런의 변화 분류 ({category: [entry, ...], 'summary': {...}})"""
+    base_rows = latest_status_rows(base_run_id)
+    target_rows = latest_status_rows(target_run_id)
+    base_by_case = {row.case_id: row for row in base_rows}
+    target_case_ids = set()
+
+    out = {category: [] for category in DIFF_CATEGORIES}
+    unchanged = 0
+    for target in target_rows:
+        case_id = target.case_id
+        target_case_ids.add(case_id)
+        base = base_by_case.get(case_id)
+        if base is None:
+            out['added'].append(_entry(case_id, None, target))
+            continue
+
+        if target.status == 'fail':
+            category = 'still_failing' if base.status == 'fail' else 'newly_failing'
+        elif base.status == 'fail' and target.status == 'pass':
+            category = 'fixed'
+        else:
+            category = None
+        if category:
+            out[category].append(_entry(case_id, base, target))
+        if base.version != target.version:
+            out['content_changed'].append(_entry(case_id, base, target))
+        if category is None and base.version == target.version:
+            unchanged += 1
+
+    for base in base_rows:
+        if base.case_id not in target_case_ids:
+            out['removed'].append(_entry(base.case_id, base, None))
+
+    out['summary'] = {category: len(out[category]) for category in DIFF_CATEGORIES}
+    out['summary'].update({
+        'base_total': len(base_rows),
+        'target_total': len(target_rows),
+        'unchanged': unchanged,
+    })
+    return out
@@ -0,0 +1,188 @@
+"""
+런 목록 조회 (필터 + 페이지네이션)
+
+- 필터: run_type, build_label, created_by, date_from/date_to(YYYY-MM-DD, 포함), status(open|closed)
+- 생성자는 joinedload로 함께 읽고, 통계는 페이지에 보이는 런만 compute_run_stats()로 한 번에 계산한다.
+- summary 투영(projection)은 목록/선택 UI용 최소 필드만 반환한다.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models import Run, User
+from app.utils.run_stats import compute_run_stats
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 200
+
+# 이 파라미터 중 하나라도 있으면 API가 페이지 응답({runs, page, ...})을 반환 (없으면 기존 배열 응답)
+PAGING_ARGS = ('page', 'per_page', 'run_type', 'build_label', 'created_by', 'date_from', 'date_to', 'status')
+
+
+class RunListFilterError(ValueError):
+    """잘못된 필터 값"""
+
+
+@dataclass
+class RunListFilters:
+    run_type: Optional[str] = None
+    build_label: Optional[str] = None
+    created_by: Optional[int] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None  # 포함 (해당 날짜 끝까지)
+    status: Optional[str] = None  # open | closed
+
+    def as_args(self) -> dict:
+        """템플릿 페이지 링크용 쿼리 파라미터 (값이 있는 것만)"""
+        out = {
+            'run_type': self.run_type,
+            'build_label': self.build_label,
+            'created_by': self.created_by,
+            'date_from': self.date_from.strftime('%Y-%m-%d') if self.date_from else None,
+            'date_to': self.date_to.strftime('%Y-%m-%d') if self.date_to else None,
+            'status': self.status,
+        }
+        return {k: v for k, v in out.items() if v not in (None, '')}
+
+
+@dataclass
+class RunPage:
+    runs: list
+    stats: dict  # run_id -> stats
+    page: int
+    per_page: int
+    total: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, math.ceil(self.total / self.per_page)) if self.per_page else 1
+
+
+def _parse_date(value: Optional[str], field: str) -> Optional[datetime]:
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        raise RunListFilterError(f'{field}는 YYYY-MM-DD 형식이어야 합니다')
+
+
+def parse_run_filters(args) -> RunListFilters:
+    """request.args -> RunListFilters (형식 오류 시 RunListFilterError)"""
+    created_by = (args.get('created_by') or '').strip()
+    if created_by and not created_by.isdigit():
+        raise RunListFilterError('created_by는 사용자 id여야 합니다')
+    status = (args.get('status') or '').strip().lower() or None
+    if status not in (None, 'open', 'closed'):
+        raise RunListFilterError("status는 'open' 또는 'closed'여야 합니다")
+    return RunListFilters(
+        run_type=(args.get('run_type') or '').strip() or None,
+        build_label=(args.get('build_label') or '').strip() or None,
+        created_by=int(created_by) if created_by else None,
+        date_from=_parse_date(args.get('date_from'), 'date_from'),
+        date_to=_parse_date(args.get('date_to'), 'date_to'),
+        status=status,
+    )
+
+
+def _filtered(stmt, project_id: int, filters: RunListFilters):
+    stmt = stmt.where(Run.project_id == project_id)
+    if filters.run_type:
+        stmt = stmt.where(Run.run_type == filters.run_type)
+    if filters.build_label:
+        stmt = stmt.where(Run.build_label == filters.build_label)
+    if filters.created_by:
+        stmt = stmt.where(Run.created_by == filters.created_by)
+    if filters.date_from:
+        stmt = stmt.where(Run.created_at >= filters.date_from)
+    if filters.date_to:
+        stmt = stmt.where(Run.created_at < filters.date_to + timedelta(days=1))
+    if filters.status == 'open':
+        stmt = stmt.where(Run.is_closed.isnot(True))
+    elif filters.status == 'closed':
+        stmt = stmt.where(Run.is_closed.is_(True))
+    return stmt
+
+
+def paging_requested(args) -> bool:
+    """페이지/필터 파라미터를 보낸 요청인지 (API 응답 형식 선택용)"""
+    return any(key in args for key in PAGING_ARGS)
+
+
+def list_runs(project_id: int, filters: RunListFilters, *, page: int = 1,
+              per_page: Optional[int] = DEFAULT_PER_PAGE, with_stats: bool = True) -> RunPage:
+    """필터된 런 목록 한 페이지 (최신순). per_page=None이면 전체"""
+    page = max(int(page or 1), 1)
+    stmt = (
+        _filtered(select(Run), project_id, filters)
+        .options(joinedload(Run.creator))
+        .order_by(Run.created_at.desc(), Run.id.desc())
+    )
+    if per_page is None:
+        runs = db.session.execute(stmt).scalars().all()
+        total = len(runs)
+        page, per_page = 1, total
+    else:
+        per_page = min(max(int(per_page or DEFAULT_PER_PAGE), 1), MAX_PER_PAGE)
+        total = db.session.execute(_filtered(select(func.count(Run.id)), project_id, filters)).scalar() or 0
+        runs = db.session.execute(stmt.limit(per_page).offset((page - 1) * per_page)).scalars().all()
+    stats = compute_run_stats([r.id for r in runs]) if with_stats else {}
+    return RunPage(runs=runs, stats=stats, page=page, per_page=per_page, total=total)
+
+
+def run_filter_options(project_id: int) -> dict:
+    """필터 선택지 (런 유형, 빌드 라벨, 생성자)"""
+    run_types = db.session.execute(
+        select(Run.run_type).where(Run.project_id == project_id, Run.run_type.isnot(None))
+        .distinct().order_by(Run.run_type)
+    ).scalars().all()
+    build_labels = db.session.execute(
+        select(Run.build_label).where(Run.project_id == project_id, Run.build_label.isnot(None), Run.build_label != '')
+        .group_by(Run.build_label).order_by(func.max(Run.created_at).desc()).limit(100)
+    ).scalars().all()
+    creators = db.session.execute(
+        select(User.id, User.name).where(User.id.in_(
+            select(Run.created_by).where(Run.project_id == project_id)
+        )).order_by(User.name)
+    ).all()
+    return {
+        'run_types': list(run_types),
+        'build_labels': list(build_labels),
+        'creators': [{'id': c.id, 'name': c.name} for c in creators],
+    }
+
+
+def serialize_run(run: Run, stats: Optional[dict], summary_only: bool = False) -> dict:
+    """런 목록 항목 (summary_only면 최소 필드 + 핵심 통계만)"""
+    if summary_only:
+        out = {
+            'id': run.id,
+            'name': run.name,
+            'build_label': run.build_label,
+            'is_closed': run.is_closed,
+            'created_at': run.created_at.isoformat() if run.created_at else None,
+        }
+        if stats is not None:
+            out['progress'] = stats['progress']
+            out['pass_rate'] = stats['pass_rate']
+        return out
+    return {
+        'id': run.id,
+        'name': run.name,
+        'description': run.description,
+        'run_type': run.run_type,
+        'build_label': run.build_label,
+        'is_closed': run.is_closed,
+        'created_by': run.creator.name if run.creator else None,
+        'created_by_id': run.created_by,
+        'created_at': run.created_at.isoformat() if run.created_at else None,
+        'stats': stats,
+    }
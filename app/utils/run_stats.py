@@ -0,0 +1,108 @@
+"""
+런 통계 일괄 계산 + 프로젝트 단위 단기 캐시
+
+- 여러 런의 통계(케이스당 최신 실행 결과 기준)를 그룹 쿼리 1회로 계산한다.
+  RunCase LEFT JOIN Result 위에서
+  ROW_NUMBER() OVER (PARTITION BY run_id, case_id ORDER BY created_at DESC, id DESC) = 1 인 행만
+  (run_id, status)로 GROUP BY 한다. (status NULL = 미실행)
+- 대시보드용 결과는 프로젝트별로 짧게(기본 30초) 캐시하며, 결과 기록/삭제/초기화 시 무효화한다.
+  NOTE: 개발/단일 프로세스 기준. 멀티프로세스 환경에서는 다른 프로세스의 무효화가 TTL 후에 반영된다.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models import RunCase, Result
+
+_DEFAULT_CACHE_TTL_SEC = 30
+
+_CACHE: dict[int, tuple[float, dict[int, dict]]] = {}  # project_id -> (expires_at, {run_id: stats})
+_GENERATION: dict[int, int] = {}  # project_id -> 무효화 횟수 (계산 중 무효화된 결과는 저장하지 않음)
+_CACHE_LOCK = threading.Lock()
+
+
+def format_run_stats(counts: dict) -> dict:
+    """{status(None=미실행): count} -> Run.get_stats() 형식"""
+    total = sum(counts.values())
+    pending = counts.get(None, 0)
+    executed_count = total - pending
+    passed = counts.get('pass', 0)
+    return {
+        'total': total,
+        'executed': executed_count,
+        'pending': pending,
+        'pass': passed,
+        'fail': counts.get('fail', 0),
+        'blocked': counts.get('blocked', 0),
+        'retest': counts.get('retest', 0),
+        'na': counts.get('na', 0),
+        'pass_rate': round(passed / executed_count * 100, 1) if executed_count > 0 else 0,
+        'progress': round(executed_count / total * 100, 1) if total > 0 else 0
+    }
+
+
+def compute_run_stats(run_ids: Iterable[int]) -> dict[int, dict]:
+    """런 id 목록의 통계 {run_id: stats} (그룹 쿼리 1회)"""
+    run_ids = sorted({int(r) for r in run_ids})
+    if not run_ids:
+        return {}
+
+    ranked = (
+        select(
+            RunCase.run_id.label('run_id'),
+            Result.status.label('status'),
+            func.row_number().over(
+                partition_by=(RunCase.run_id, RunCase.case_id),
+                order_by=(Result.created_at.desc(), Result.id.desc())
+            ).label('rn')
+        )
+        .outerjoin(Result, (Result.run_id == RunCase.run_id) & (Result.case_id == RunCase.case_id))
+        .where(RunCase.run_id.in_(run_ids))
+        .subquery()
+    )
+    rows = db.session.execute(
+        select(ranked.c.run_id, ranked.c.status, func.count())
+        .where(ranked.c.rn == 1)
+        .group_by(ranked.c.run_id, ranked.c.status)
+    ).all()
+
+    counts: dict[int, dict] = {run_id: {} for run_id in run_ids}
+    for run_id, status, count in rows:
+        counts[run_id][status] = count
+    return {run_id: format_run_stats(c) for run_id, c in counts.items()}
+
+
+def cached_project_run_stats(project_id: int, run_ids: Iterable[int]) -> dict[int, dict]:
+    """프로젝트 런 통계 (캐시에 요청한 런이 모두 있고 만료 전이면 캐시 사용)"""
+    run_ids = [int(r) for r in run_ids]
+    now = time.monotonic()
+    with _CACHE_LOCK:
+        entry = _CACHE.get(project_id)
+        generation = _GENERATION.get(project_id, 0)
+    if entry and entry[0] > now and all(r in entry[1] for r in run_ids):
+        return {r: entry[1][r] for r in run_ids}
+
+    stats = compute_run_stats(run_ids)
+    ttl = _DEFAULT_CACHE_TTL_SEC
+    try:
+        from flask import current_app
+        ttl = current_app.config.get('RUN_STATS_CACHE_TTL_SEC', ttl)
+    except Exception:
+        pass
+    if ttl > 0:
+        with _CACHE_LOCK:
+            if _GENERATION.get(project_id, 0) == generation:
+                _CACHE[project_id] = (now + ttl, stats)
+    return stats
+
+
+def invalidate_project_run_stats(project_id) -> None:
+    """결과 기록/삭제/초기화 후 호출 - 해당 프로젝트 캐시 제거"""
+    with _CACHE_LOCK:
+        _CACHE.pop(project_id, None)
+        _GENERATION[project_id] = _GENERATION.get(project_id, 0) + 1
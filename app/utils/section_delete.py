@@ -0,0 +1,107 @@
+"""
+섹션 트리 삭제 (set 기반)
+
+- 하위 섹션 전체를 재귀 CTE 한 번으로 구한다.
+- 의존 행을 FK 의존 순서대로 일괄 DELETE 한다.
+  Attachment -> Result/ResultArchive/RunCaseArtifact/RunCaseComment -> RunCase -> CaseSnapshot/CaseTag/CaseJiraLink/CaseMedia/CaseTranslation/CaseResultDaily/CaseFlakiness
+  -> (TranslationUsage.case_id NULL 처리) -> Case -> Section
+- blob 저장소 파일은 지운 행 수만큼 같은 트랜잭션에서 참조 수를 줄인다(파일은 blob GC가 정리).
+- 이전 방식(평면 업로드) CaseMedia/Attachment 파일은 커밋 후 백그라운드 작업으로 정리한다.
+  다른 행이 같은 파일을 참조하면 지우지 않는다(Import/프로젝트 복제로 공유된 파일).
+"""
+from __future__ import annotations
+
+import os
+
+from sqlalchemy import delete, select, update
+
+from app import db
+from app.models import (
+    Section, Case, CaseSnapshot, CaseTag, CaseJiraLink, CaseMedia, CaseTranslation, TranslationUsage,
+    RunCase, Result, ResultArchive, RunCaseComment, RunCaseArtifact, Attachment, CaseResultDaily, CaseFlakiness
+)
+from app.utils.blob_store import release_paths, sha_from_path
+
+
+def section_subtree_ids(section_id: int) -> list[int]:
+    """section_id와 모든 하위 섹션 id (재귀 CTE 1회)"""
+    tree = select(Section.id).where(Section.id == section_id).cte('section_subtree', recursive=True)
+    tree = tree.union_all(select(Section.id).where(Section.parent_id == tree.c.id))
+    return list(db.session.execute(select(tree.c.id)).scalars())
+
+
+def delete_section_tree(section_id: int) -> dict:
+    """
+    섹션과 하위 섹션/케이스/의존 행을 삭제하고 요약을 반환한다. (커밋은 호출 측에서)
+
+    Returns:
+      {'sections', 'cases', 'run_cases', 'results', 'attachments', 'media', 'file_paths'}
+    """
+    section_ids = section_subtree_ids(section_id)
+    case_ids = select(Case.id).where(Case.section_id.in_(section_ids)).scalar_subquery()
+    result_ids = select(Result.id).where(Result.case_id.in_(case_ids)).scalar_subquery()
+    artifact_ids = select(RunCaseArtifact.id).where(RunCaseArtifact.case_id.in_(case_ids)).scalar_subquery()
+    attachment_filter = Attachment.result_id.in_(result_ids) | Attachment.artifact_id.in_(artifact_ids)
+
+    # 파일 경로는 행을 지우기 전에 수집 (blob 참조 수 감소를 위해 행 단위로)
+    row_paths = list(db.session.execute(
+        select(CaseMedia.file_path).where(CaseMedia.case_id.in_(case_ids))
+    ).scalars())
+    row_paths.extend(db.session.execute(
+        select(Attachment.file_path).where(attachment_filter)
+    ).scalars())
+
+    def _delete(stmt) -> int:
+        return db.session.execute(stmt, execution_options={'synchronize_session': False}).rowcount or 0
+
+    summary = {'sections': len(section_ids)}
+    summary['attachments'] = _delete(delete(Attachment).where(attachment_filter))
+    summary['results'] = _delete(delete(Result).where(Result.case_id.in_(case_ids)))
+    summary['results'] += _delete(delete(ResultArchive).where(ResultArchive.case_id.in_(case_ids)))
+    _delete(delete(RunCaseArtifact).where(RunCaseArtifact.case_id.in_(case_ids)))
+    _delete(delete(RunCaseComment).where(RunCaseComment.case_id.in_(case_ids)))
+    summary['run_cases'] = _delete(delete(RunCase).where(RunCase.case_id.in_(case_ids)))
+    _delete(delete(CaseSnapshot).where(CaseSnapshot.case_id.in_(case_ids)))
+    _delete(delete(CaseTag).where(CaseTag.case_id.in_(case_ids)))
+    _delete(delete(CaseJiraLink).where(CaseJiraLink.case_id.in_(case_ids)))
+    summary['media'] = _delete(delete(CaseMedia).where(CaseMedia.case_id.in_(case_ids)))
+    _delete(delete(CaseTranslation).where(CaseTranslation.case_id.in_(case_ids)))
+    _delete(delete(CaseResultDaily).where(CaseResultDaily.case_id.in_(case_ids)))
+    _delete(delete(CaseFlakiness).where(CaseFlakiness.case_id.in_(case_ids)))
+    # 번역 사용량 기록은 통계용으로 유지 (케이스 참조만 해제)
+    _delete(update(TranslationUsage).where(TranslationUsage.case_id.in_(case_ids)).values(case_id=None))
+    summary['cases'] = _delete(delete(Case).where(Case.section_id.in_(section_ids)))
+    # 같은 문장 안에서 부모/자식이 함께 지워지므로 parent_id FK 순서 문제 없음
+    _delete(delete(Section).where(Section.id.in_(section_ids)))
+
+    release_paths(row_paths)
+    summary['file_paths'] = sorted({p for p in row_paths if p and not sha_from_path(p)})
+    return summary
+
+
+def cleanup_orphan_files(job, file_paths: list) -> dict:
+    """
+    더 이상 어떤 CaseMedia/Attachment도 참조하지 않는 파일 삭제 (백그라운드 작업).
+    """
+    job.set_total(len(file_paths))
+    still_used = set()
+    if file_paths:
+        still_used.update(db.session.execute(
+            select(CaseMedia.file_path).where(CaseMedia.file_path.in_(file_paths))
+        ).scalars())
+        still_used.update(db.session.execute(
+            select(Attachment.file_path).where(Attachment.file_path.in_(file_paths))
+        ).scalars())
+
+    removed = 0
+    failed = 0
+    for path in file_paths:
+        if path not in still_used:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                    removed += 1
+            except Exception:
+                failed += 1
+        job.advance()
+    return {'removed': removed, 'kept': len(still_used), 'failed': failed}
@@ -0,0 +1,164 @@
+"""
+첨부/케이스 미디어 썸네일 (blob 파생 파일)
+
+- 이미지: 긴 변 THUMBNAIL_MAX_PX 이하로 줄인 WebP (Pillow, 없으면 ffmpeg)
+- 영상: 앞부분 한 프레임(포스터)을 같은 크기의 WebP로 (ffmpeg가 있을 때만)
+- 결과는 blob 옆 <sha>.thumb.webp 에 저장한다. 내용 주소이므로 같은 파일은 한 번만 만들고,
+  원본 blob이 GC될 때 함께 지워진다.
+- 업로드 커밋 후 백그라운드 작업(submit_job)으로 만든다. 만들 수 없으면(디코더 없음/손상 파일) 조용히 건너뛴다.
+- 목록 API는 썸네일이 이미 있을 때만 thumbnail_url을 준다(없으면 원본 링크만 표시).
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import uuid
+from typing import Iterable, Optional
+
+from flask import current_app
+
+from app.utils.blob_store import derivative_path, sha_from_path
+from app.utils.media_serving import versioned_url
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow는 선택 의존성 (없으면 ffmpeg로 대체)
+    Image = None
+
+THUMB_NAME = 'thumb.webp'
+IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+VIDEO_EXTENSIONS = {'mp4', 'mov', 'webm', 'avi', 'mkv'}
+
+_DEFAULT_MAX_PX = 320
+_FFMPEG_TIMEOUT_SEC = 30
+
+
+def media_kind(name: Optional[str]) -> Optional[str]:
+    """원본 파일명 확장자 -> 'image' | 'video' | None"""
+    ext = (name or '').rsplit('.', 1)[-1].lower() if '.' in (name or '') else ''
+    if ext in IMAGE_EXTENSIONS:
+        return 'image'
+    if ext in VIDEO_EXTENSIONS:
+        return 'video'
+    return None
+
+
+def thumbnail_path(file_path: Optional[str]) -> Optional[str]:
+    """blob 파일의 썸네일 경로 (blob이 아니면 None)"""
+    sha = sha_from_path(file_path)
+    return derivative_path(sha, THUMB_NAME) if sha else None
+
+
+def thumbnail_url(base_url: str, file_path: Optional[str]) -> Optional[str]:
+    """썸네일이 만들어져 있으면 '<base_url>/thumbnail?v=...', 아니면 None"""
+    path = thumbnail_path(file_path)
+    if not path or not os.path.exists(path):
+        return None
+    return versioned_url(f'{base_url}/thumbnail', file_path)
+
+
+def _max_px() -> int:
+    return int(current_app.config.get('THUMBNAIL_MAX_PX', _DEFAULT_MAX_PX) or _DEFAULT_MAX_PX)
+
+
+def _ffmpeg() -> Optional[str]:
+    return current_app.config.get('FFMPEG_PATH') or shutil.which('ffmpeg')
+
+
+def _image_with_pillow(src: str, dst: str, max_px: int) -> bool:
+    with Image.open(src) as im:
+        im.draft('RGB', (max_px, max_px))  # JPEG은 축소 디코딩 (큰 스크린샷도 빠르게)
+        im.seek(0)  # 애니메이션 GIF/WebP는 첫 프레임
+        im = ImageOps.exif_transpose(im)
+        if im.mode not in ('RGB', 'RGBA'):
+            im = im.convert('RGBA')
+        im.thumbnail((max_px, max_px))
+        im.save(dst, 'WEBP', quality=80, method=4)
+    return True
+
+
+def _frame_with_ffmpeg(ffmpeg: str, src: str, dst: str, max_px: int, seek: Optional[str]) -> bool:
+    scale = f"scale='min({max_px},iw)':'min({max_px},ih)':force_original_aspect_ratio=decrease"
+    cmd = [ffmpeg, '-v', 'error', '-y']
+    if seek:
+        cmd += ['-ss', seek]
+    cmd += ['-i', src, '-frames:v', '1', '-vf', scale, '-f', 'webp', dst]
+    proc = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=_FFMPEG_TIMEOUT_SEC)
+    return proc.returncode == 0 and os.path.exists(dst) and os.path.getsize(dst) > 0
+
+
+def generate_thumbnail(file_path: str, name: Optional[str]) -> Optional[str]:
+    """썸네일 1개 생성 (이미 있으면 재사용). 생성된 경로, 만들 수 없으면 None"""
+    dst = thumbnail_path(file_path)
+    kind = media_kind(name)
+    if not dst or not kind or not os.path.exists(file_path):
+        return None
+    if os.path.exists(dst):
+        return dst
+
+    max_px = _max_px()
+    ffmpeg = _ffmpeg()
+    tmp = f'{dst}.{uuid.uuid4().hex}.part'
+    ok = False
+    try:
+        if kind == 'image' and Image is not None:
+            ok = _image_with_pillow(file_path, tmp, max_px)
+        elif ffmpeg:
+            # 영상은 1초 지점(검은 첫 프레임 회피), 짧은 영상이면 첫 프레임
+            ok = _frame_with_ffmpeg(ffmpeg, file_path, tmp, max_px, '1' if kind == 'video' else None)
+            if not ok and kind == 'video':
+                ok = _frame_with_ffmpeg(ffmpeg, file_path, tmp, max_px, None)
+    except Exception as e:
+        current_app.logger.warning(f'썸네일 생성 실패 ({os.path.basename(file_path)}): {e}')
+        ok = False
+    if not ok:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return None
+    os.replace(tmp, dst)
+    return dst
+
+
+def can_generate(name: Optional[str]) -> bool:
+    kind = media_kind(name)
+    if kind == 'image':
+        return Image is not None or bool(_ffmpeg())
+    if kind == 'video':
+        return bool(_ffmpeg())
+    return False
+
+
+def generate_thumbnails(job, items: list) -> dict:
+    """[(file_path, 원본 파일명)] 썸네일 일괄 생성 (백그라운드 작업)"""
+    job.set_total(len(items))
+    created = 0
+    skipped = 0
+    for file_path, name in items:
+        if generate_thumbnail(file_path, name):
+            created += 1
+        else:
+            skipped += 1
+        job.advance()
+    return {'created': created, 'skipped': skipped}
+
+
+def schedule_thumbnails(items: Iterable[tuple], *, user_id: Optional[int] = None,
+                        project_id: Optional[int] = None) -> None:
+    """
+    업로드 커밋 후 호출. 썸네일이 아직 없고 만들 수 있는 파일만 백그라운드 작업으로 넘긴다.
+    items: [(file_path, 원본 파일명)]
+    """
+    from app.utils.jobs import submit_job
+
+    pending = {}
+    for file_path, name in items:
+        dst = thumbnail_path(file_path)
+        if dst and dst not in pending and not os.path.exists(dst) and can_generate(name):
+            pending[dst] = (file_path, name)
+    if not pending:
+        return
+    try:
+        submit_job('thumbnails', generate_thumbnails, list(pending.values()), user_id=user_id, project_id=project_id)
+    except Exception as e:
+        current_app.logger.warning(f'썸네일 작업 등록 실패: {e}')
@@ -0,0 +1,73 @@
+"""
+스트리밍 업로드 (요청 본문 -> blob 임시 파일)
+
+- 업로드 엔드포인트의 multipart 파일 파트는 Werkzeug 기본 버퍼(메모리/임시 파일) 대신
+  BlobSpool로 받는다. 청크를 받는 즉시 blob 임시 파일에 쓰고 SHA-256/크기를 계산하므로,
+  put_upload()는 파일을 다시 읽지 않고 그대로 blob으로 옮긴다.
+- 파일 종류별 크기 제한(UPLOAD_LIMITS)을 일찍 적용한다.
+  - 단일 파일 엔드포인트: Content-Length가 제한을 넘으면 본문을 읽기 전에 413
+  - 파트 헤더에 Content-Length가 있으면 파트를 받기 전에, 없으면 받는 중 제한을 넘는 순간 413
+- 그 외 엔드포인트(Import 파일 등)는 Werkzeug 기본 동작 그대로다.
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from app.utils.blob_store import BlobSpool
+
+# 엔드포인트 -> (파일 1개 최대 크기 config 키(MB), 단일 파일 업로드 여부)
+UPLOAD_LIMITS = {
+    'api.profile_avatar': ('AVATAR_MAX_MB', True),
+    'api.case_media': ('ATTACHMENT_MAX_MB', True),
+    'api.run_case_attachments': ('ATTACHMENT_MAX_MB', True),
+    'api.upload_attachment': ('ATTACHMENT_MAX_MB', True),
+    'main.feedback_new': ('FEEDBACK_ATTACHMENT_MAX_MB', False),
+    'main.feedback_edit': ('FEEDBACK_ATTACHMENT_MAX_MB', False),
+}
+
+# 단일 파일 요청의 multipart 경계/헤더/폼 필드 여유분
+_MULTIPART_OVERHEAD = 64 * 1024
+
+
+def upload_limit_bytes(endpoint: Optional[str]) -> Optional[int]:
+    """엔드포인트의 파일 1개 최대 크기 (bytes, 스트리밍 업로드 대상이 아니면 None)"""
+    spec = UPLOAD_LIMITS.get(endpoint or '')
+    if not spec:
+        return None
+    mb = current_app.config.get(spec[0])
+    if not mb:
+        return current_app.config.get('MAX_CONTENT_LENGTH')
+    return max(1, int(mb)) * 1024 * 1024
+
+
+class UploadRequest(Request):
+    """업로드 엔드포인트에서 파일 파트를 BlobSpool로 스트리밍하는 Request (app.request_class)"""
+
+    @property
+    def max_content_length(self) -> Optional[int]:
+        base = super().max_content_length
+        spec = UPLOAD_LIMITS.get(self.endpoint or '')
+        if not spec or not spec[1]:
+            return base
+        # 단일 파일 업로드: 파일 제한 + 여유분을 넘는 요청은 본문을 읽지 않고 거절
+        limit = upload_limit_bytes(self.endpoint) + _MULTIPART_OVERHEAD
+        return min(base, limit) if base else limit
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        max_bytes = upload_limit_bytes(self.endpoint)
+        if max_bytes is None:
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        if content_length and content_length > max_bytes:
+            raise RequestEntityTooLarge(f'파일 크기 제한 초과 ({max_bytes} bytes)')
+        spool = BlobSpool(max_bytes=max_bytes)
+        # 파싱 도중 중단되면 request.files에 들어가지 못한 파트가 남으므로 직접 추적해 정리
+        self.__dict__.setdefault('_blob_spools', []).append(spool)
+        return spool
+
+    def close(self) -> None:
+        super().close()
+        for spool in self.__dict__.pop('_blob_spools', ()):
+            spool.close()
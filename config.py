@@ -61,10 +61,60 @@ class Config:
         'zip', 'log', 'txt'
     }
 
+    # 첨부/미디어/아바타 blob 저장소 (SHA-256 내용 주소, 2단계 샤딩). 비우면 <UPLOAD_FOLDER>/blobs
+    # - QUICKRAIL_BLOB_STORE_DIR=/data/quickrail/blobs
+    # - QUICKRAIL_BLOB_GC_GRACE_SEC=3600  (참조가 0이 된 blob을 GC가 지우기까지 유예 시간)
+    BLOB_STORE_DIR = os.environ.get('QUICKRAIL_BLOB_STORE_DIR') or None
+    BLOB_GC_GRACE_SEC = int(os.environ.get('QUICKRAIL_BLOB_GC_GRACE_SEC', '3600') or '3600')
+
+    # 첨부/미디어 파일 전송을 리버스 프록시에 맡김 (Python은 권한 확인만, app.utils.media_serving)
+    # - QUICKRAIL_MEDIA_OFFLOAD=x-accel-redirect  (nginx, blob 파일만)
+    #   QUICKRAIL_MEDIA_ACCEL_PREFIX=/_blobs        (nginx: location /_blobs/ { internal; alias <blob 디렉터리>/; })
+    # - QUICKRAIL_MEDIA_OFFLOAD=x-sendfile        (Apache mod_xsendfile / lighttpd)
+    MEDIA_OFFLOAD = (os.environ.get('QUICKRAIL_MEDIA_OFFLOAD') or '').strip().lower()
+    MEDIA_ACCEL_PREFIX = os.environ.get('QUICKRAIL_MEDIA_ACCEL_PREFIX') or '/_blobs'
+    USE_X_SENDFILE = MEDIA_OFFLOAD == 'x-sendfile'
+
+    # 이미지/영상 썸네일 (업로드 후 백그라운드 생성, app.utils.thumbnails)
+    # - QUICKRAIL_THUMBNAIL_MAX_PX=320         (긴 변 최대 픽셀)
+    # - QUICKRAIL_FFMPEG_PATH=/usr/bin/ffmpeg  (영상 포스터 프레임, 비우면 PATH에서 찾음. 없으면 영상 썸네일 생략)
+    THUMBNAIL_MAX_PX = int(os.environ.get('QUICKRAIL_THUMBNAIL_MAX_PX', '320') or '320')
+    FFMPEG_PATH = os.environ.get('QUICKRAIL_FFMPEG_PATH') or None
+
+    # 업로드 파일 1개당 최대 크기 (요청 본문을 받는 중에 적용, app.utils.upload_stream)
+    # - QUICKRAIL_ATTACHMENT_MAX_MB=64  (런 첨부/케이스 미디어, 기본: QUICKRAIL_MAX_UPLOAD_MB)
+    # - QUICKRAIL_AVATAR_MAX_MB=5       (프로필 이미지)
+    ATTACHMENT_MAX_MB = int(os.environ.get('QUICKRAIL_ATTACHMENT_MAX_MB', str(_max_upload_mb)) or _max_upload_mb)
+    AVATAR_MAX_MB = int(os.environ.get('QUICKRAIL_AVATAR_MAX_MB', '5') or '5')
+
+    # 이어받기 청크 업로드 (/api/uploads)
+    # - QUICKRAIL_UPLOAD_CHUNK_MB=8               (청크 크기)
+    # - QUICKRAIL_UPLOAD_SESSION_TTL_SEC=86400    (마지막 청크 이후 세션 보관 시간)
+    # - QUICKRAIL_CHUNKED_UPLOAD_MAX_MB=2048      (런 첨부/케이스 미디어 파일 1개 최대 크기, 영상 기준)
+    #   요청 1개 크기(MAX_CONTENT_LENGTH/ATTACHMENT_MAX_MB)와 별개 - 청크 단위로 받으므로 전체 파일은 더 커도 됨
+    UPLOAD_CHUNK_MB = int(os.environ.get('QUICKRAIL_UPLOAD_CHUNK_MB', '8') or '8')
+    UPLOAD_SESSION_TTL_SEC = int(os.environ.get('QUICKRAIL_UPLOAD_SESSION_TTL_SEC', '86400') or '86400')
+    CHUNKED_UPLOAD_MAX_MB = int(os.environ.get('QUICKRAIL_CHUNKED_UPLOAD_MAX_MB', '2048') or '2048')
+
     # 피드백 첨부(이미지/영상) 1개당 최대 크기 (기본 25MB)
     # - QUICKRAIL_FEEDBACK_ATTACHMENT_MAX_MB=25  (정수)
     FEEDBACK_ATTACHMENT_MAX_MB = int(os.environ.get('QUICKRAIL_FEEDBACK_ATTACHMENT_MAX_MB', '25') or '25')
-    
+
+    # 케이스 Import(CSV) chunk 단위 파싱 행 수 (기본 20000행)
+    # - QUICKRAIL_IMPORT_CSV_CHUNK_ROWS=20000  (정수)
+    IMPORT_CSV_CHUNK_ROWS = int(os.environ.get('QUICKRAIL_IMPORT_CSV_CHUNK_ROWS', '20000') or '20000')
+    # import/parse 응답에서 전체 케이스 목록 대신 보여줄 미리보기 행 수
+    IMPORT_PREVIEW_ROWS = int(os.environ.get('QUICKRAIL_IMPORT_PREVIEW_ROWS', '200') or '200')
+    # 케이스 Import 미디어(URL) 동시 다운로드 설정
+    # - QUICKRAIL_IMPORT_MEDIA_WORKERS=8     (전체 동시 다운로드 수)
+    # - QUICKRAIL_IMPORT_MEDIA_PER_HOST=4    (호스트별 동시 연결 수)
+    # - QUICKRAIL_IMPORT_MEDIA_TIMEOUT_SEC=10
+    IMPORT_MEDIA_WORKERS = int(os.environ.get('QUICKRAIL_IMPORT_MEDIA_WORKERS', '8') or '8')
+    IMPORT_MEDIA_PER_HOST = int(os.environ.get('QUICKRAIL_IMPORT_MEDIA_PER_HOST', '4') or '4')
+    IMPORT_MEDIA_TIMEOUT_SEC = float(os.environ.get('QUICKRAIL_IMPORT_MEDIA_TIMEOUT_SEC', '10') or '10')
+    # 대시보드 런 통계 캐시(초). 결과 기록 시 즉시 무효화되며, 0이면 캐시하지 않음
+    RUN_STATS_CACHE_TTL_SEC = int(os.environ.get('QUICKRAIL_RUN_STATS_CACHE_TTL_SEC', '30') or '30')
+
     # Session settings
     SESSION_COOKIE_SECURE = False  # Set True in production with HTTPS
     SESSION_COOKIE_HTTPONLY = True
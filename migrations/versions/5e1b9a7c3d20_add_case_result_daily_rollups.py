@@ -0,0 +1,61 @@
+"""add case_result_daily rollups
+
+Revision ID: 5e1b9a7c3d20
+Revises: 3c8a1f0d2b77
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '5e1b9a7c3d20'
+down_revision = '3c8a1f0d2b77'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'case_result_daily',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('project_id', sa.Integer(), sa.ForeignKey('projects.id'), nullable=False),
+        sa.Column('case_id', sa.Integer(), sa.ForeignKey('cases.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pass_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fail_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('blocked_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_result_at', sa.DateTime(), nullable=True),
+        sa.Column('last_fail_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('case_id', 'day', name='uq_case_result_daily_case_day'),
+    )
+    op.create_index('ix_case_result_daily_case_id', 'case_result_daily', ['case_id'])
+    op.create_index('ix_case_result_daily_project_day', 'case_result_daily', ['project_id', 'day'])
+
+    # 기존 결과 이력으로 backfill (코멘트/아티팩트 전용 Result 제외)
+    op.execute(
+        """
+        INSERT INTO case_result_daily
+            (project_id, case_id, day, total_count, pass_count, fail_count, blocked_count,
+             last_result_at, last_fail_at)
+        SELECT c.project_id, r.case_id, date(r.created_at),
+               COUNT(r.id),
+               SUM(CASE WHEN r.status = 'pass' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN r.status = 'fail' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN r.status = 'blocked' THEN 1 ELSE 0 END),
+               MAX(r.created_at),
+               MAX(CASE WHEN r.status = 'fail' THEN r.created_at END)
+        FROM results r
+        JOIN cases c ON c.id = r.case_id
+        WHERE r.status NOT IN ('comment', 'artifact') AND r.created_at IS NOT NULL
+        GROUP BY c.project_id, r.case_id, date(r.created_at)
+        """
+    )
+
+
+def downgrade():
+    op.drop_index('ix_case_result_daily_project_day', table_name='case_result_daily')
+    op.drop_index('ix_case_result_daily_case_id', table_name='case_result_daily')
+    op.drop_table('case_result_daily')
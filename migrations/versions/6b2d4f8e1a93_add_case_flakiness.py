@@ -0,0 +1,93 @@
+"""add case_flakiness
+
+Revision ID: 6b2d4f8e1a93
+Revises: 5e1b9a7c3d20
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '6b2d4f8e1a93'
+down_revision = '5e1b9a7c3d20'
+branch_labels = None
+depends_on = None
+
+# app/utils/flakiness.py와 같은 값 (마이그레이션은 앱 코드를 import하지 않음)
+EWMA_ALPHA = 0.3
+CONFIDENCE_PRIOR = 5
+
+
+def _backfill(conn, table):
+    rows = conn.execute(sa.text(
+        """
+        SELECT r.case_id, c.project_id, r.run_id, r.status, r.created_at
+        FROM results r
+        JOIN cases c ON c.id = r.case_id
+        WHERE r.status NOT IN ('comment', 'artifact')
+        ORDER BY r.case_id, r.run_id, r.created_at, r.id
+        """
+    ).columns(created_at=sa.DateTime())).fetchall()
+
+    # 런마다 마지막 결과만 관측으로 사용
+    latest = {}
+    for case_id, project_id, run_id, status, created_at in rows:
+        latest[(case_id, run_id)] = (project_id, status, created_at)
+
+    states = {}
+    for (case_id, run_id), (project_id, status, created_at) in sorted(latest.items()):
+        if status not in ('pass', 'fail'):
+            continue
+        st = states.get(case_id)
+        if st is None:
+            st = states[case_id] = {
+                'case_id': case_id, 'project_id': project_id, 'observations': 0, 'pass_observations': 0,
+                'flips': 0, 'ewma_flip_rate': 0.0, 'confidence': 0.0, 'flaky_score': 0.0,
+                'last_run_id': None, 'last_status': None, 'last_observed_at': None, 'last_flip_at': None,
+            }
+        if st['observations'] > 0:
+            flipped = 1 if status != st['last_status'] else 0
+            st['flips'] += flipped
+            st['ewma_flip_rate'] = EWMA_ALPHA * flipped + (1 - EWMA_ALPHA) * st['ewma_flip_rate']
+            if flipped:
+                st['last_flip_at'] = created_at
+        st['observations'] += 1
+        if status == 'pass':
+            st['pass_observations'] += 1
+        transitions = st['observations'] - 1
+        st['confidence'] = transitions / (transitions + CONFIDENCE_PRIOR)
+        st['flaky_score'] = st['ewma_flip_rate'] * st['confidence']
+        st['last_run_id'] = run_id
+        st['last_status'] = status
+        st['last_observed_at'] = created_at
+
+    if states:
+        op.bulk_insert(table, list(states.values()))
+
+
+def upgrade():
+    table = op.create_table(
+        'case_flakiness',
+        sa.Column('case_id', sa.Integer(), sa.ForeignKey('cases.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('project_id', sa.Integer(), sa.ForeignKey('projects.id'), nullable=False),
+        sa.Column('observations', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pass_observations', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('flips', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('ewma_flip_rate', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('confidence', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('flaky_score', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('last_run_id', sa.Integer(), nullable=True),
+        sa.Column('last_status', sa.String(length=20), nullable=True),
+        sa.Column('last_observed_at', sa.DateTime(), nullable=True),
+        sa.Column('last_flip_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_case_flakiness_project_score', 'case_flakiness', ['project_id', 'flaky_score'])
+
+    _backfill(op.get_bind(), table)
+
+
+def downgrade():
+    op.drop_index('ix_case_flakiness_project_score', table_name='case_flakiness')
+    op.drop_table('case_flakiness')
@@ -0,0 +1,23 @@
+"""add results (run_id, case_id, created_at) index
+
+Revision ID: 8d3e5a1c7f42
+Revises: 6b2d4f8e1a93
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+
+
+revision = '8d3e5a1c7f42'
+down_revision = '6b2d4f8e1a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_results_run_case_created', 'results', ['run_id', 'case_id', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_results_run_case_created', table_name='results')
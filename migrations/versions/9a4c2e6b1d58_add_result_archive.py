@@ -0,0 +1,49 @@
+"""add result_archive
+
+Revision ID: 9a4c2e6b1d58
+Revises: 8d3e5a1c7f42
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '9a4c2e6b1d58'
+down_revision = '8d3e5a1c7f42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'result_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('case_id', sa.Integer(), nullable=False),
+        sa.Column('executor_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=True),
+        sa.Column('bug_links', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['run_id'], ['runs.id']),
+        sa.ForeignKeyConstraint(['case_id'], ['cases.id']),
+        sa.ForeignKeyConstraint(['executor_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_result_archive_case_id', 'result_archive', ['case_id'])
+    op.create_index('ix_result_archive_run_case_created', 'result_archive', ['run_id', 'case_id', 'created_at'])
+    # 기존 종료 런의 이력은 그대로 두고, 이후 close_run부터 보관한다.
+
+
+def downgrade():
+    # 보관된 이력을 results로 되돌린 뒤 테이블 삭제
+    op.execute(
+        "INSERT INTO results (id, run_id, case_id, executor_id, status, comment, bug_links, created_at) "
+        "SELECT id, run_id, case_id, executor_id, status, comment, bug_links, created_at FROM result_archive"
+    )
+    op.drop_index('ix_result_archive_run_case_created', table_name='result_archive')
+    op.drop_index('ix_result_archive_case_id', table_name='result_archive')
+    op.drop_table('result_archive')
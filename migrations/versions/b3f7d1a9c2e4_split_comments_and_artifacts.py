@@ -0,0 +1,160 @@
+"""split run case comments/artifacts out of results
+
+Revision ID: b3f7d1a9c2e4
+Revises: 9a4c2e6b1d58
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b3f7d1a9c2e4'
+down_revision = '9a4c2e6b1d58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'run_case_comments',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('run_id', sa.Integer(), sa.ForeignKey('runs.id'), nullable=False),
+        sa.Column('case_id', sa.Integer(), sa.ForeignKey('cases.id'), nullable=False),
+        sa.Column('author_id', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('comment', sa.Text(), nullable=False, server_default=''),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_run_case_comments_case_id', 'run_case_comments', ['case_id'])
+    op.create_index('ix_run_case_comments_run_case_created', 'run_case_comments', ['run_id', 'case_id', 'created_at'])
+
+    op.create_table(
+        'run_case_artifacts',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('run_id', sa.Integer(), sa.ForeignKey('runs.id'), nullable=False),
+        sa.Column('case_id', sa.Integer(), sa.ForeignKey('cases.id'), nullable=False),
+        sa.Column('created_by', sa.Integer(), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('bug_links', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('run_id', 'case_id', name='uq_run_case_artifacts_run_case'),
+    )
+    op.create_index('ix_run_case_artifacts_case_id', 'run_case_artifacts', ['case_id'])
+    op.create_index('ix_run_case_artifacts_run_case_created', 'run_case_artifacts', ['run_id', 'case_id', 'created_at'])
+
+    # SQLite: 컬럼 nullable 변경은 batch 모드(테이블 재생성)로 처리
+    with op.batch_alter_table('attachments') as batch_op:
+        batch_op.add_column(sa.Column('artifact_id', sa.Integer(), nullable=True))
+        batch_op.alter_column('result_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.create_foreign_key('fk_attachments_artifact_id', 'run_case_artifacts', ['artifact_id'], ['id'])
+        batch_op.create_index('ix_attachments_artifact_id', ['artifact_id'])
+
+    conn = op.get_bind()
+
+    # 코멘트: Result(status='comment') -> run_case_comments
+    op.execute(
+        """
+        INSERT INTO run_case_comments (run_id, case_id, author_id, comment, created_at)
+        SELECT run_id, case_id, executor_id, COALESCE(comment, ''), created_at
+        FROM results
+        WHERE status = 'comment'
+        ORDER BY created_at, id
+        """
+    )
+
+    # 산출물: Result(status='artifact') -> run_case_artifacts ((run, case)당 1개로 병합) + 첨부 재연결
+    rows = conn.execute(sa.text(
+        """
+        SELECT id, run_id, case_id, executor_id, bug_links, created_at
+        FROM results
+        WHERE status = 'artifact'
+        ORDER BY created_at, id
+        """
+    ).columns(created_at=sa.DateTime())).fetchall()
+    grouped = {}
+    for row in rows:
+        grouped.setdefault((row.run_id, row.case_id), []).append(row)
+
+    artifacts = sa.table(
+        'run_case_artifacts',
+        sa.column('run_id', sa.Integer()),
+        sa.column('case_id', sa.Integer()),
+        sa.column('created_by', sa.Integer()),
+        sa.column('bug_links', sa.Text()),
+        sa.column('created_at', sa.DateTime()),
+        sa.column('updated_at', sa.DateTime()),
+    )
+    for (run_id, case_id), group in grouped.items():
+        with_links = [r for r in group if (r.bug_links or '').strip()]
+        latest = (with_links or group)[-1]
+        conn.execute(artifacts.insert().values(
+            run_id=run_id,
+            case_id=case_id,
+            created_by=group[0].executor_id,
+            bug_links=latest.bug_links or '',
+            created_at=group[0].created_at,
+            updated_at=latest.created_at,
+        ))
+        artifact_id = conn.execute(sa.text(
+            "SELECT id FROM run_case_artifacts WHERE run_id = :run_id AND case_id = :case_id"
+        ), {'run_id': run_id, 'case_id': case_id}).scalar()
+        conn.execute(sa.text(
+            "UPDATE attachments SET artifact_id = :artifact_id, result_id = NULL WHERE result_id IN :result_ids"
+        ).bindparams(sa.bindparam('result_ids', expanding=True)),
+            {'artifact_id': artifact_id, 'result_ids': [r.id for r in group]})
+
+    op.execute("DELETE FROM results WHERE status IN ('comment', 'artifact')")
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    op.execute(
+        """
+        INSERT INTO results (run_id, case_id, executor_id, status, comment, bug_links, created_at)
+        SELECT run_id, case_id, author_id, 'comment', comment, '', created_at
+        FROM run_case_comments
+        """
+    )
+
+    rows = conn.execute(sa.text(
+        "SELECT id, run_id, case_id, created_by, bug_links, updated_at FROM run_case_artifacts"
+    ).columns(updated_at=sa.DateTime())).fetchall()
+    results = sa.Table(
+        'results', sa.MetaData(),
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('run_id', sa.Integer()),
+        sa.Column('case_id', sa.Integer()),
+        sa.Column('executor_id', sa.Integer()),
+        sa.Column('status', sa.String(20)),
+        sa.Column('comment', sa.Text()),
+        sa.Column('bug_links', sa.Text()),
+        sa.Column('created_at', sa.DateTime()),
+    )
+    for row in rows:
+        result_id = conn.execute(results.insert().values(
+            run_id=row.run_id,
+            case_id=row.case_id,
+            executor_id=row.created_by,
+            status='artifact',
+            comment='',
+            bug_links=row.bug_links or '',
+            created_at=row.updated_at,
+        )).inserted_primary_key[0]
+        conn.execute(sa.text(
+            "UPDATE attachments SET result_id = :result_id WHERE artifact_id = :artifact_id"
+        ), {'result_id': result_id, 'artifact_id': row.id})
+
+    with op.batch_alter_table('attachments') as batch_op:
+        batch_op.drop_index('ix_attachments_artifact_id')
+        batch_op.drop_constraint('fk_attachments_artifact_id', type_='foreignkey')
+        batch_op.drop_column('artifact_id')
+        batch_op.alter_column('result_id', existing_type=sa.Integer(), nullable=False)
+
+    op.drop_index('ix_run_case_artifacts_run_case_created', table_name='run_case_artifacts')
+    op.drop_index('ix_run_case_artifacts_case_id', table_name='run_case_artifacts')
+    op.drop_table('run_case_artifacts')
+    op.drop_index('ix_run_case_comments_run_case_created', table_name='run_case_comments')
+    op.drop_index('ix_run_case_comments_case_id', table_name='run_case_comments')
+    op.drop_table('run_case_comments')
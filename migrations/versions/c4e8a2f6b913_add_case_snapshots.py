@@ -0,0 +1,159 @@
+"""content-addressed case snapshots for run cases
+
+Revision ID: c4e8a2f6b913
+Revises: b3f7d1a9c2e4
+Create Date: 2026-10-19
+
+"""
+
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c4e8a2f6b913'
+down_revision = 'b3f7d1a9c2e4'
+branch_labels = None
+depends_on = None
+
+_SNAPSHOT_COLUMNS = [
+    # (run_cases 컬럼, case_snapshots 컬럼, 타입)
+    ('case_version_snapshot', 'case_version', sa.Integer()),
+    ('title_snapshot', 'title', sa.String(500)),
+    ('steps_snapshot', 'steps', sa.Text()),
+    ('expected_result_snapshot', 'expected_result', sa.Text()),
+    ('priority_snapshot', 'priority', sa.String(10)),
+    ('jira_links_snapshot', 'jira_links', sa.Text()),
+    ('media_names_snapshot', 'media_names', sa.Text()),
+]
+_CONTENT_FIELDS = ('title', 'steps', 'expected_result', 'priority', 'jira_links', 'media_names')
+_CHUNK = 1000
+
+
+def _snapshot_hash(case_id, version, language, content):
+    # app.utils.case_snapshots.snapshot_hash 와 동일해야 이후 생성되는 스냅샷과 중복 제거된다
+    payload = json.dumps(
+        [int(case_id), version, language or 'original', [content.get(f) for f in _CONTENT_FIELDS]],
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def upgrade():
+    op.create_table(
+        'case_snapshots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('case_id', sa.Integer(), sa.ForeignKey('cases.id'), nullable=False),
+        sa.Column('case_version', sa.Integer(), nullable=True),
+        sa.Column('language', sa.String(10), nullable=True),
+        sa.Column('title', sa.String(500), nullable=True),
+        sa.Column('steps', sa.Text(), nullable=True),
+        sa.Column('expected_result', sa.Text(), nullable=True),
+        sa.Column('priority', sa.String(10), nullable=True),
+        sa.Column('jira_links', sa.Text(), nullable=True),
+        sa.Column('media_names', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('content_hash'),
+    )
+    op.create_index('ix_case_snapshots_case_id', 'case_snapshots', ['case_id'])
+
+    with op.batch_alter_table('run_cases') as batch_op:
+        batch_op.add_column(sa.Column('snapshot_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_run_cases_snapshot_id', 'case_snapshots', ['snapshot_id'], ['id'])
+        batch_op.create_index('ix_run_cases_snapshot_id', ['snapshot_id'])
+
+    # 기존 run_cases 스냅샷 컬럼 -> case_snapshots (해시 기준 중복 제거)
+    conn = op.get_bind()
+    snapshots = sa.table(
+        'case_snapshots',
+        sa.column('content_hash', sa.String()),
+        sa.column('case_id', sa.Integer()),
+        sa.column('case_version', sa.Integer()),
+        sa.column('language', sa.String()),
+        sa.column('title', sa.String()),
+        sa.column('steps', sa.Text()),
+        sa.column('expected_result', sa.Text()),
+        sa.column('priority', sa.String()),
+        sa.column('jira_links', sa.Text()),
+        sa.column('media_names', sa.Text()),
+        sa.column('created_at', sa.DateTime()),
+    )
+    select_cols = ', '.join(f'rc.{old}' for old, _, _ in _SNAPSHOT_COLUMNS)
+    last_id = 0
+    while True:
+        rows = conn.execute(sa.text(
+            f"""
+            SELECT rc.id, rc.case_id, rc.created_at, r.language, {select_cols}
+            FROM run_cases rc JOIN runs r ON r.id = rc.run_id
+            WHERE rc.id > :last_id
+            ORDER BY rc.id
+            LIMIT {_CHUNK}
+            """
+        ).columns(created_at=sa.DateTime()), {'last_id': last_id}).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        by_hash = {}
+        run_case_hash = []
+        for row in rows:
+            if row.case_version_snapshot is None and row.title_snapshot is None:
+                continue  # 스냅샷이 한 번도 저장되지 않은 행 (읽기 시 케이스 원본 사용)
+            language = row.language or 'original'
+            version = row.case_version_snapshot or 1
+            content = {
+                'title': row.title_snapshot,
+                'steps': row.steps_snapshot,
+                'expected_result': row.expected_result_snapshot,
+                'priority': row.priority_snapshot,
+                'jira_links': row.jira_links_snapshot or '',
+                'media_names': row.media_names_snapshot or '',
+            }
+            h = _snapshot_hash(row.case_id, version, language, content)
+            run_case_hash.append((row.id, h))
+            by_hash.setdefault(h, {
+                'content_hash': h, 'case_id': row.case_id, 'case_version': version,
+                'language': language, 'created_at': row.created_at, **content,
+            })
+        if not by_hash:
+            continue
+
+        lookup = sa.text("SELECT content_hash, id FROM case_snapshots WHERE content_hash IN :hashes") \
+            .bindparams(sa.bindparam('hashes', expanding=True))
+        existing = dict(conn.execute(lookup, {'hashes': list(by_hash)}).fetchall())
+        missing = [v for h, v in by_hash.items() if h not in existing]
+        if missing:
+            conn.execute(snapshots.insert(), missing)
+            existing = dict(conn.execute(lookup, {'hashes': list(by_hash)}).fetchall())
+        conn.execute(
+            sa.text("UPDATE run_cases SET snapshot_id = :snapshot_id WHERE id = :id"),
+            [{'id': rc_id, 'snapshot_id': existing[h]} for rc_id, h in run_case_hash]
+        )
+
+    with op.batch_alter_table('run_cases') as batch_op:
+        for old, _, _ in _SNAPSHOT_COLUMNS:
+            batch_op.drop_column(old)
+
+
+def downgrade():
+    with op.batch_alter_table('run_cases') as batch_op:
+        for old, _, type_ in _SNAPSHOT_COLUMNS:
+            batch_op.add_column(sa.Column(old, type_, nullable=True))
+
+    assignments = ', '.join(
+        f'{old} = (SELECT s.{new} FROM case_snapshots s WHERE s.id = run_cases.snapshot_id)'
+        for old, new, _ in _SNAPSHOT_COLUMNS
+    )
+    op.execute(f'UPDATE run_cases SET {assignments} WHERE snapshot_id IS NOT NULL')
+
+    with op.batch_alter_table('run_cases') as batch_op:
+        batch_op.drop_index('ix_run_cases_snapshot_id')
+        batch_op.drop_constraint('fk_run_cases_snapshot_id', type_='foreignkey')
+        batch_op.drop_column('snapshot_id')
+
+    op.drop_index('ix_case_snapshots_case_id', table_name='case_snapshots')
+    op.drop_table('case_snapshots')
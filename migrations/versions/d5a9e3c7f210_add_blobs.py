@@ -0,0 +1,36 @@
+"""content-addressed blob store for uploaded files
+
+Revision ID: d5a9e3c7f210
+Revises: c4e8a2f6b913
+Create Date: 2026-10-19
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd5a9e3c7f210'
+down_revision = 'c4e8a2f6b913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 기존 평면 업로드 파일은 그대로 읽히며, tools/blob_store.py migrate로 옮긴다
+    op.create_table(
+        'blobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('sha256', sa.String(64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('sha256'),
+    )
+    op.create_index('ix_blobs_updated_at', 'blobs', ['updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_blobs_updated_at', table_name='blobs')
+    op.drop_table('blobs')
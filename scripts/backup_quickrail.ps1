@@ -1,12 +1,16 @@
 param(
   [string]$ProjectRoot = (Split-Path -Parent $PSScriptRoot),
   [string]$DbPath = "",
-  [string]$BackupDir = ""
+  [string]$BackupDir = "",
+  [string]$UploadsDir = "",
+  [string]$UploadsBackupDir = "",
+  [switch]$SkipUploads
 )
 
 # QuickRail SQLite 백업 실행 스크립트 (Windows Task Scheduler용)
 # - venv가 있으면 사용
 # - tools/sqlite_backup.py를 호출하여 온라인 백업 + 무결성 검사 + 로테이션 수행
+# - 이어서 tools/uploads_backup.py로 업로드 폴더 하드링크 스냅샷 생성 (-SkipUploads로 생략)
 
 Set-Location $ProjectRoot
 
@@ -24,6 +28,19 @@ if ($BackupDir -eq "") {
 }
 
 & $python "$ProjectRoot\\tools\\sqlite_backup.py" --db "$DbPath" --backup-dir "$BackupDir" --keep-last 30 --keep-days 14
+if ($LASTEXITCODE -ne 0) {
+  exit $LASTEXITCODE
+}
+
+if (-not $SkipUploads) {
+  if ($UploadsDir -eq "") {
+    $UploadsDir = "$ProjectRoot\\uploads"
+  }
+  if ($UploadsBackupDir -eq "") {
+    $UploadsBackupDir = "$ProjectRoot\\backups\\uploads"
+  }
+  & $python "$ProjectRoot\\tools\\uploads_backup.py" --uploads-dir "$UploadsDir" --backup-dir "$UploadsBackupDir" --keep-last 14 --keep-days 30
+}
 exit $LASTEXITCODE
 
 
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""
+이미 종료된 런의 대체된(superseded) 실행 결과를 result_archive로 옮긴다.
+(새로 종료하는 런은 close_run 시 자동 보관되므로, 기존 데이터 정리용)
+
+사용 예:
+  python -m tools.archive_closed_run_results              # 전체 프로젝트
+  python -m tools.archive_closed_run_results --project 4  # 특정 프로젝트만
+
+주의:
+- DB는 instance/quickrail.db 기준(기본 config normalize)
+- 런 단위로 커밋한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from app import create_app, db
+from app.models import Run
+from app.utils.result_archive import archive_superseded_results
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="종료된 런 결과 이력 보관")
+    ap.add_argument("--project", type=int, default=None, help="프로젝트 ID (생략 시 전체)")
+    args = ap.parse_args()
+
+    app = create_app("production")
+    with app.app_context():
+        q = db.session.query(Run.id).filter(Run.is_closed.is_(True))
+        if args.project:
+            q = q.filter(Run.project_id == args.project)
+        run_ids = [run_id for (run_id,) in q.order_by(Run.id)]
+
+        total = 0
+        for run_id in run_ids:
+            total += archive_superseded_results(run_id)
+            db.session.commit()
+        target = f"project={args.project}" if args.project else "전체"
+        print(f"[OK] 결과 보관 완료 ({target}): 런 {len(run_ids)}개, {total}건 이동")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+"""
+내용 주소(content-addressed) 파일 저장소 관리
+
+사용 예:
+  python -m tools.blob_store gc                    # 참조 수 보정 + 참조 없는 blob 삭제 (유예: BLOB_GC_GRACE_SEC)
+  python -m tools.blob_store gc --grace-sec 0      # 유예 없이 바로 삭제
+  python -m tools.blob_store gc --dry-run          # 지울 대상만 집계
+  python -m tools.blob_store migrate               # 이전 평면 업로드 파일을 blob 저장소로 이관
+  python -m tools.blob_store migrate --dry-run
+
+주의:
+- DB는 instance/quickrail.db 기준(기본 config normalize)
+- migrate는 파일을 하드링크(불가 시 복사)로 먼저 가져오고, 경로를 바꿔 커밋한 뒤에 원본을 지운다.
+  중간에 중단되어도 원본/DB가 어긋나지 않으며, 다시 실행하면 남은 파일만 이관한다.
+- gc는 주기 실행(cron 등)을 권장한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+from collections import defaultdict
+
+from sqlalchemy import select, update
+
+from app import create_app, db
+from app.models import Attachment, CaseMedia, FeedbackAttachment, User
+from app.utils.blob_store import avatar_file_path, avatar_filename, collect_garbage, put_file, sha_from_path
+
+_FILE_MODELS = (Attachment, CaseMedia, FeedbackAttachment)
+_COMMIT_EVERY = 200
+
+
+def _legacy_file_refs() -> dict:
+    """이전 평면 업로드 경로 -> [(model, 참조 수)]"""
+    refs = defaultdict(list)
+    for model in _FILE_MODELS:
+        for path, n in db.session.execute(
+            select(model.file_path, db.func.count()).where(model.file_path.isnot(None)).group_by(model.file_path)
+        ):
+            if not sha_from_path(path):
+                refs[path].append((model, n))
+    return refs
+
+
+def _flush(done: list, dry_run: bool) -> None:
+    if dry_run:
+        return
+    db.session.commit()
+    for path in done:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+        except OSError as e:
+            print(f"[WARN] 원본 삭제 실패: {path} ({e})")
+    done.clear()
+
+
+def migrate(dry_run: bool) -> dict:
+    stats = {"files": 0, "rows": 0, "avatars": 0, "missing": 0, "deduplicated": 0}
+    done: list = []
+
+    for path, targets in sorted(_legacy_file_refs().items()):
+        if not os.path.isfile(path):
+            stats["missing"] += 1
+            continue
+        rows = sum(n for _, n in targets)
+        stats["files"] += 1
+        stats["rows"] += rows
+        if dry_run:
+            continue
+        stored = put_file(path, refs=rows, move=False)
+        stats["deduplicated"] += int(stored.deduplicated)
+        for model, _ in targets:
+            db.session.execute(
+                update(model).where(model.file_path == path).values(file_path=stored.path),
+                execution_options={"synchronize_session": False},
+            )
+        done.append(path)
+        if len(done) >= _COMMIT_EVERY:
+            _flush(done, dry_run)
+
+    by_avatar = defaultdict(list)
+    for user_id, name in db.session.execute(select(User.id, User.avatar_filename).where(User.avatar_filename.isnot(None))):
+        if not sha_from_path(avatar_file_path(name)):
+            by_avatar[name].append(user_id)
+    for name, user_ids in sorted(by_avatar.items()):
+        path = avatar_file_path(name)
+        if not os.path.isfile(path):
+            stats["missing"] += 1
+            continue
+        stats["avatars"] += len(user_ids)
+        if dry_run:
+            continue
+        stored = put_file(path, refs=len(user_ids), move=False)
+        stats["deduplicated"] += int(stored.deduplicated)
+        ext = name.rsplit(".", 1)[1].lower() if "." in name else "png"
+        db.session.execute(
+            update(User).where(User.id.in_(user_ids)).values(avatar_filename=avatar_filename(stored, ext)),
+            execution_options={"synchronize_session": False},
+        )
+        done.append(path)
+        if len(done) >= _COMMIT_EVERY:
+            _flush(done, dry_run)
+
+    _flush(done, dry_run)
+    return stats
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="blob 저장소 관리 (GC/이관)")
+    sub = ap.add_subparsers(dest="command", required=True)
+    gc = sub.add_parser("gc", help="참조 수 보정 + 참조 없는 blob 삭제")
+    gc.add_argument("--grace-sec", type=int, default=None, help="참조가 0이 된 뒤 유지할 시간(초)")
+    gc.add_argument("--dry-run", action="store_true", help="삭제하지 않고 집계만")
+    mig = sub.add_parser("migrate", help="이전 평면 업로드 파일을 blob 저장소로 이관")
+    mig.add_argument("--dry-run", action="store_true", help="이관하지 않고 집계만")
+    args = ap.parse_args()
+
+    app = create_app("production")
+    with app.app_context():
+        mode = " (dry-run)" if args.dry_run else ""
+        if args.command == "gc":
+            s = collect_garbage(grace_sec=args.grace_sec, dry_run=args.dry_run)
+            print(
+                f"[OK] blob GC{mode}: blob {s['blobs']}개, 참조 수 보정 {s['recounted']}개, "
+                f"삭제 {s['deleted']}개 ({s['bytes_freed']} bytes), 고아 파일 {s['orphan_files']}개, "
+                f"임시 파일 {s['tmp_files']}개"
+            )
+        else:
+            s = migrate(args.dry_run)
+            print(
+                f"[OK] blob 이관{mode}: 파일 {s['files']}개 (행 {s['rows']}개), 아바타 {s['avatars']}개, "
+                f"중복 {s['deduplicated']}개, 원본 없음 {s['missing']}개"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -14,8 +14,9 @@ def main():
         print("case_jira_links:", tj)
         print("case_media:", tm)
         cols = [r[1] for r in con.execute("pragma table_info(run_cases)").fetchall()]
-        print("run_cases has jira_links_snapshot:", "jira_links_snapshot" in cols)
-        print("run_cases has media_names_snapshot:", "media_names_snapshot" in cols)
+        print("run_cases has snapshot_id:", "snapshot_id" in cols)
+        ts = con.execute("select name from sqlite_master where type='table' and name='case_snapshots'").fetchone()
+        print("case_snapshots:", ts)
     finally:
         con.close()
 
@@ -1,11 +1,32 @@
+"""
+QuickRail SQLite DB 통합 (원본 -> 타깃으로 복사)
+
+사용 예:
+  python tools/consolidate_sqlite_db.py --source instance/quickrail-old.db
+  # 앱 실행 중(업무 시간): 256페이지씩 나눠 복사하고 단계 사이 20ms 대기, 진행률 출력, 사본 압축/통계 갱신
+  python tools/consolidate_sqlite_db.py --source instance/quickrail-old.db \
+      --pages-per-step 256 --step-sleep-ms 20 --progress --vacuum-into --analyze
+
+- 원본 복사와 기존 타깃의 보관 복사본 모두 Online Backup API를 쓴다(복사 중에도 쓰기가 한 단계 이상 막히지 않음).
+- 단계 복사/후처리 옵션은 tools/sqlite_backup.py와 같다.
+"""
 from __future__ import annotations
 
 import argparse
-import shutil
 import sqlite3
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+try:
+    from tools.sqlite_backup import (
+        CopyOptions, add_copy_arguments, copy_options_from_args, online_backup, post_process_copy,
+    )
+except ImportError:  # python tools/consolidate_sqlite_db.py 로 직접 실행
+    from sqlite_backup import (
+        CopyOptions, add_copy_arguments, copy_options_from_args, online_backup, post_process_copy,
+    )
 
 
 @dataclass(frozen=True)
@@ -30,25 +51,21 @@ def _integrity_check(db_path: Path) -> tuple[bool, str]:
         con.close()
 
 
-def _backup_sqlite(source_db: Path, dest_db: Path) -> None:
-    """SQLite Online Backup API 기반 복사(실행 중인 DB에서도 비교적 안전)."""
+def _backup_sqlite(source_db: Path, dest_db: Path, options: Optional[CopyOptions] = None) -> None:
+    """SQLite Online Backup API 기반 복사(실행 중인 DB에서도 비교적 안전, options로 단계 복사)."""
     _ensure_parent(dest_db)
     if dest_db.exists():
         dest_db.unlink()
-
-    src = sqlite3.connect(str(source_db), timeout=30)
-    try:
-        dst = sqlite3.connect(str(dest_db), timeout=30)
-        try:
-            src.backup(dst)
-            dst.commit()
-        finally:
-            dst.close()
-    finally:
-        src.close()
+    online_backup(source_db, dest_db, options)
 
 
-def consolidate(source: Path, target: Path, keep_backup: bool = True) -> ConsolidationResult:
+def consolidate(
+    source: Path,
+    target: Path,
+    keep_backup: bool = True,
+    options: Optional[CopyOptions] = None,
+) -> ConsolidationResult:
+    options = options or CopyOptions()
     if not source.exists():
         raise FileNotFoundError(f"source DB not found: {source}")
 
@@ -60,10 +77,16 @@ def consolidate(source: Path, target: Path, keep_backup: bool = True) -> Consoli
         backup_dir.mkdir(parents=True, exist_ok=True)
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = backup_dir / f"{target.stem}_before_{ts}{target.suffix}"
-        shutil.copy2(target, backup_path)
+        # 타깃도 앱이 쓰는 중일 수 있으므로 파일 복사 대신 같은 단계 복사 (후처리는 하지 않음)
+        _backup_sqlite(target, backup_path, CopyOptions(
+            pages_per_step=options.pages_per_step,
+            step_sleep=options.step_sleep,
+            progress=options.progress,
+        ))
 
     tmp = target.with_suffix(target.suffix + ".tmp")
-    _backup_sqlite(source, tmp)
+    _backup_sqlite(source, tmp, options)
+    post_process_copy(tmp, options)
 
     ok, msg = _integrity_check(tmp)
     if not ok:
@@ -98,9 +121,15 @@ def main() -> int:
         action="store_true",
         help="타깃 DB 백업(복사본) 생성 생략",
     )
+    add_copy_arguments(parser)
     args = parser.parse_args()
 
-    res = consolidate(Path(args.source), Path(args.target), keep_backup=(not args.no_backup))
+    res = consolidate(
+        Path(args.source),
+        Path(args.target),
+        keep_backup=(not args.no_backup),
+        options=copy_options_from_args(args, label="consolidate"),
+    )
     print("[DONE] Consolidated DB")
     print("  source:", res.source.resolve())
     print("  target:", res.target.resolve())
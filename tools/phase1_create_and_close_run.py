@@ -12,7 +12,7 @@ from __future__ import annotations
 from datetime import datetime
 
 from app import create_app, db
-from app.models import Project, Case, Run, RunCase, Result
+from app.models import Project, Case, Run, Result
 
 
 PROJECT_ID = 4
@@ -50,19 +50,10 @@ def main() -> None:
         db.session.add(run)
         db.session.flush()
 
-        # RunCase 생성 (기본 스냅샷도 채워줌: close 시 업데이트되긴 하지만, 생성 시점 스냅샷도 유의미)
-        for idx, c in enumerate(cases, start=1):
-            rc = RunCase(
-                run_id=run.id,
-                case_id=c.id,
-                order_index=idx,
-                case_version_snapshot=c.version or 1,
-                title_snapshot=c.title,
-                steps_snapshot=c.steps,
-                expected_result_snapshot=c.expected_result,
-                priority_snapshot=c.priority,
-            )
-            db.session.add(rc)
+        # RunCase 생성 (기본 스냅샷도 채워줌: 동일 내용 스냅샷은 case_snapshots에서 재사용)
+        from app.utils.case_snapshots import add_run_cases
+
+        add_run_cases(run.id, [c.id for c in cases], run.language)
         db.session.flush()
 
         # 결과 PASS 기록
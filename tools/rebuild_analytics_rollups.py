@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+"""
+analytics 집계(일간 rollup: case_result_daily, 불안정성: case_flakiness)를 Result 이력으로 다시 만든다.
+
+사용 예:
+  python -m tools.rebuild_analytics_rollups              # 전체 프로젝트
+  python -m tools.rebuild_analytics_rollups --project 4  # 특정 프로젝트만
+
+주의:
+- DB는 instance/quickrail.db 기준(기본 config normalize)
+- 평소에는 결과 기록 시 자동 갱신되므로, 데이터 보정/이관 후에만 실행하면 된다.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from app import create_app, db
+from app.utils.analytics_rollup import backfill_result_rollups
+from app.utils.flakiness import backfill_case_flakiness
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="analytics 집계 재구축")
+    ap.add_argument("--project", type=int, default=None, help="프로젝트 ID (생략 시 전체)")
+    args = ap.parse_args()
+
+    app = create_app("production")
+    with app.app_context():
+        rows = backfill_result_rollups(args.project)
+        flaky_cases = backfill_case_flakiness(args.project)
+        db.session.commit()
+        target = f"project={args.project}" if args.project else "전체"
+        print(f"[OK] rollup 재구축 완료 ({target}): {rows}행")
+        print(f"[OK] flakiness 재계산 완료 ({target}): {flaky_cases}개 케이스")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,52 @@
+"""
+QuickRail SQLite DB 백업
+
+전체(full) 모드(기본):
+  Online Backup API 스냅샷 -> integrity_check -> .sha256 -> 로테이션
+  python tools/sqlite_backup.py --db instance/quickrail.db --backup-dir backups/quickrail.db
+
+증분(incremental) 모드:
+  스냅샷을 페이지 경계에 맞춘 청크(기본 16페이지)로 나눠 SHA-256 내용 주소로 저장하고,
+  저장소에 없는 청크만 새로 쓴다(이전 백업과 같은 페이지 구간은 공간/쓰기 비용 0).
+  백업 1개 = snapshots/<prefix>_<ts>.json (청크 해시 목록 + 전체 SHA-256)
+  python tools/sqlite_backup.py --incremental --max-mb-per-sec 50
+  python tools/sqlite_backup.py --list
+  python tools/sqlite_backup.py --restore latest --restore-to restore/quickrail.db
+  python tools/sqlite_backup.py --restore quickrail_20250101_020000 --restore-to restore/quickrail.db
+
+  저장 구조(--backup-dir 아래):
+    chunks/<sha[:2]>/<sha>      zlib 압축된 청크 (해시는 압축 전 내용 기준)
+    snapshots/<prefix>_<ts>.json
+  로테이션(--keep-last/--keep-days)은 스냅샷 manifest 기준이며, 어느 manifest도 참조하지 않는 청크는 그때 삭제한다.
+
+운영 중(업무 시간) 백업 옵션 (전체/증분 공통):
+  --pages-per-step 256 --step-sleep-ms 20
+      Online Backup을 N페이지씩 나눠 복사하고 단계 사이에 쉰다. 한 단계 동안만 읽기 락을 잡으므로
+      앱의 쓰기가 전체 복사 시간 동안 막히지 않는다. (단계 사이에 DB가 바뀌면 SQLite는 처음부터 다시 복사하므로,
+      재시작이 반복되면 단계 크기를 자동으로 늘린다)
+  --max-mb-per-sec 50
+      스냅샷 복사/청크 읽기 속도 제한 (단계 크기를 지정하지 않으면 1MB 단계)
+  --progress
+      진행률(복사한 페이지/전체 페이지) 출력
+  --vacuum-into / --analyze
+      복사가 끝난 임시 사본에 VACUUM INTO(조각 모음된 압축 사본) / ANALYZE(통계 갱신)를 적용한다.
+      운영 DB가 아니라 사본에서 실행하므로 앱에는 영향이 없다.
+      (증분 모드에서 VACUUM은 페이지 배치를 바꾸므로 청크 재사용률이 떨어진다)
+"""
 from __future__ import annotations
 
 import argparse
 import hashlib
+import json
 import os
 import shutil
 import sqlite3
+import time
+import zlib
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 
 @dataclass
@@ -18,6 +56,34 @@ class BackupResult:
     sha256_file: Path
 
 
+@dataclass
+class IncrementalBackupResult:
+    source_db: Path
+    manifest_file: Path
+    size: int
+    chunks: int
+    new_chunks: int
+    new_bytes: int
+    changed_chunks: int
+
+
+@dataclass
+class CopyOptions:
+    """Online Backup 단계 복사/후처리 옵션"""
+    pages_per_step: int = -1  # -1: 한 번에 전체 복사
+    step_sleep: float = 0.0  # 단계 사이 대기(초)
+    max_bytes_per_sec: Optional[float] = None
+    progress: Optional[Callable[[int, int], None]] = None  # (복사한 페이지, 전체 페이지)
+    vacuum_into: bool = False
+    analyze: bool = False
+
+
+DEFAULT_CHUNK_PAGES = 16
+_STEP_BYTES = 1024 * 1024  # 속도 제한만 지정했을 때 Online Backup 1단계 크기
+_BUSY_SLEEP = 0.25  # 단계가 SQLITE_BUSY/LOCKED면 재시도 전 대기(초)
+_MAX_RESTARTS = 3  # 원본 변경으로 처음부터 다시 복사한 횟수가 이만큼이면 단계 크기를 늘림
+
+
 def _project_root() -> Path:
     # tools/ 아래에 위치하므로 상위가 프로젝트 루트
     return Path(__file__).resolve().parents[1]
@@ -68,13 +134,130 @@ def _sqlite_integrity_check(path: Path) -> Tuple[bool, str]:
         con.close()
 
 
+class _Throttle:
+    """누적 처리량이 bytes_per_sec을 넘지 않도록 sleep (0/None이면 제한 없음)"""
+
+    def __init__(self, bytes_per_sec: Optional[float]):
+        self.rate = float(bytes_per_sec or 0)
+        self._start = time.monotonic()
+        self._done = 0
+
+    def consume(self, n: int) -> None:
+        if self.rate <= 0:
+            return
+        self._done += n
+        ahead = self._done / self.rate - (time.monotonic() - self._start)
+        if ahead > 0:
+            time.sleep(ahead)
+
+
+def print_progress(label: str, every_pct: int = 5) -> Callable[[int, int], None]:
+    """CopyOptions.progress용: every_pct% 간격으로 진행률 출력"""
+    last = [-every_pct]
+
+    def _report(done: int, total: int) -> None:
+        pct = 100 if not total else int(done * 100 / total)
+        if pct >= last[0] + every_pct or (pct == 100 and last[0] != 100):
+            last[0] = pct
+            print(f"[..] {label}: {pct}% ({done}/{total} pages)", flush=True)
+
+    return _report
+
+
+class _BackupRestarted(Exception):
+    """단계 복사 중 원본이 계속 바뀌어 처음부터 다시 복사하게 된 경우 (단계 크기를 늘려 재시도)"""
+
+
+def online_backup(source_db: Path, dest_db: Path, options: Optional[CopyOptions] = None,
+                  throttle: Optional[_Throttle] = None) -> None:
+    """
+    Online Backup API 스냅샷.
+    pages_per_step > 0 이면 단계 복사: 각 단계 후 진행률 보고 -> 속도 제한 -> step_sleep.
+
+    단계 사이에 다른 연결이 원본에 쓰면 SQLite는 복사를 처음부터 다시 한다. 쓰기가 계속되면 끝나지 않으므로
+    _MAX_RESTARTS번 재시작되면 단계 크기를 4배로 늘려 다시 시도하고, 전체 크기에 이르면 한 번에 복사한다.
+    """
+    options = options or CopyOptions()
+    src = sqlite3.connect(str(source_db), timeout=30)
+    try:
+        # WAL 모드라면 체크포인트를 한 번 시도(실패해도 백업은 가능)
+        try:
+            src.execute("PRAGMA wal_checkpoint(FULL);")
+        except Exception:
+            pass
+
+        page_size = int(src.execute("PRAGMA page_size;").fetchone()[0])
+        pages = int(options.pages_per_step or -1)
+        if pages <= 0 and throttle is not None and throttle.rate > 0:
+            pages = max(1, _STEP_BYTES // page_size)
+
+        while True:
+            state = {"done": 0, "restarts": 0, "total": 0}
+
+            def _on_step(status, remaining, total):
+                done = total - remaining
+                state["total"] = total
+                if done <= state["done"]:
+                    # 정상 단계는 항상 진행분이 늘어난다 (같거나 줄었으면 처음부터 다시 복사한 것)
+                    state["restarts"] += 1
+                    if state["restarts"] >= _MAX_RESTARTS:
+                        raise _BackupRestarted()
+                if options.progress:
+                    options.progress(done, total)
+                if throttle is not None:
+                    throttle.consume(max(0, done - state["done"]) * page_size)
+                state["done"] = done
+                if options.step_sleep > 0 and remaining > 0:
+                    time.sleep(options.step_sleep)
+
+            dst = sqlite3.connect(str(dest_db))
+            try:
+                if pages > 0 or options.progress:
+                    src.backup(dst, pages=pages, progress=_on_step, sleep=_BUSY_SLEEP)
+                else:
+                    src.backup(dst)
+                dst.commit()
+                return
+            except _BackupRestarted:
+                pages = pages * 4 if pages * 4 < state["total"] else -1
+            finally:
+                dst.close()
+    finally:
+        src.close()
+
+
+def post_process_copy(db_path: Path, options: CopyOptions) -> None:
+    """복사가 끝난 사본에 VACUUM INTO(압축 사본으로 교체) / ANALYZE 적용"""
+    if options.vacuum_into:
+        if sqlite3.sqlite_version_info < (3, 27, 0):
+            raise RuntimeError(f"VACUUM INTO는 SQLite 3.27 이상이 필요합니다 (현재 {sqlite3.sqlite_version})")
+        compact = db_path.with_name(db_path.name + ".vacuum")
+        if compact.exists():
+            compact.unlink()
+        con = sqlite3.connect(str(db_path))
+        try:
+            con.execute("VACUUM INTO ?", (str(compact),))
+        finally:
+            con.close()
+        compact.replace(db_path)
+    if options.analyze:
+        con = sqlite3.connect(str(db_path))
+        try:
+            con.execute("ANALYZE;")
+            con.commit()
+        finally:
+            con.close()
+
+
 def backup_sqlite_db(
     source_db: Path,
     backup_dir: Path,
     keep_last: int = 30,
     keep_days: int = 14,
     prefix: str = "quickrail",
+    options: Optional[CopyOptions] = None,
 ) -> BackupResult:
+    options = options or CopyOptions()
     source_db = source_db.resolve()
     backup_dir = backup_dir.resolve()
     backup_dir.mkdir(parents=True, exist_ok=True)
@@ -86,23 +269,9 @@ def backup_sqlite_db(
     backup_file = backup_dir / f"{prefix}_{ts}.db"
     tmp_file = backup_dir / f".{prefix}_{ts}.db.tmp"
 
-    # SQLite Online Backup API로 일관성 있는 스냅샷 생성
-    src = sqlite3.connect(str(source_db), timeout=30)
-    try:
-        # WAL 모드라면 체크포인트를 한 번 시도(실패해도 백업은 가능)
-        try:
-            src.execute("PRAGMA wal_checkpoint(FULL);")
-        except Exception:
-            pass
-
-        dst = sqlite3.connect(str(tmp_file))
-        try:
-            src.backup(dst)
-            dst.commit()
-        finally:
-            dst.close()
-    finally:
-        src.close()
+    # SQLite Online Backup API로 일관성 있는 스냅샷 생성 (+ 사본 후처리)
+    online_backup(source_db, tmp_file, options, _Throttle(options.max_bytes_per_sec))
+    post_process_copy(tmp_file, options)
 
     # 임시 파일 -> 최종 파일(atomic-ish)
     if backup_file.exists():
@@ -157,6 +326,247 @@ def rotate_backups(backup_dir: Path, prefix: str, keep_last: int, keep_days: int
             pass
 
 
+# ---------------------------------------------------------------------------
+# 증분 백업 (페이지 청크 + 내용 주소 저장소)
+# ---------------------------------------------------------------------------
+
+def _chunks_dir(backup_dir: Path) -> Path:
+    return backup_dir / "chunks"
+
+
+def _snapshots_dir(backup_dir: Path) -> Path:
+    return backup_dir / "snapshots"
+
+
+def _chunk_path(backup_dir: Path, sha: str) -> Path:
+    return _chunks_dir(backup_dir) / sha[:2] / sha
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    tmp.replace(path)
+
+
+def _list_manifests(backup_dir: Path, prefix: Optional[str] = None) -> list[Path]:
+    """스냅샷 manifest 목록 (오래된 순)"""
+    d = _snapshots_dir(backup_dir)
+    if not d.exists():
+        return []
+    pattern = f"{prefix}_*.json" if prefix else "*.json"
+    return sorted(d.glob(pattern))
+
+
+def _load_manifest(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def incremental_backup(
+    source_db: Path,
+    backup_dir: Path,
+    keep_last: int = 30,
+    keep_days: int = 14,
+    prefix: str = "quickrail",
+    chunk_pages: int = DEFAULT_CHUNK_PAGES,
+    options: Optional[CopyOptions] = None,
+) -> IncrementalBackupResult:
+    options = options or CopyOptions()
+    source_db = source_db.resolve()
+    backup_dir = backup_dir.resolve()
+    backup_dir.mkdir(parents=True, exist_ok=True)
+
+    if not source_db.exists():
+        raise FileNotFoundError(f"DB 파일을 찾을 수 없습니다: {source_db}")
+
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    manifest_file = _snapshots_dir(backup_dir) / f"{prefix}_{ts}.json"
+    tmp_file = backup_dir / f".{prefix}_{ts}.snapshot.tmp"
+    throttle = _Throttle(options.max_bytes_per_sec)
+
+    previous = _list_manifests(backup_dir, prefix)
+    prev_chunks = _load_manifest(previous[-1]).get("chunks", []) if previous else []
+
+    try:
+        # 1) 일관성 있는 스냅샷 (임시 파일, 끝나면 삭제)
+        online_backup(source_db, tmp_file, options, throttle)
+        post_process_copy(tmp_file, options)
+        ok, msg = _sqlite_integrity_check(tmp_file)
+        if not ok:
+            raise RuntimeError(f"백업 무결성 검사 실패: {msg}")
+
+        con = sqlite3.connect(str(tmp_file))
+        try:
+            page_size = int(con.execute("PRAGMA page_size;").fetchone()[0])
+        finally:
+            con.close()
+        chunk_size = page_size * max(1, int(chunk_pages))
+
+        # 2) 페이지 경계 청크 -> 해시, 저장소에 없는 청크만 기록 (전체 SHA-256도 같은 패스에서)
+        whole = hashlib.sha256()
+        chunks: list[str] = []
+        new_chunks = new_bytes = changed = 0
+        with tmp_file.open("rb") as f:
+            for index, block in enumerate(iter(lambda: f.read(chunk_size), b"")):
+                throttle.consume(len(block))
+                whole.update(block)
+                sha = hashlib.sha256(block).hexdigest()
+                chunks.append(sha)
+                if index >= len(prev_chunks) or prev_chunks[index] != sha:
+                    changed += 1
+                path = _chunk_path(backup_dir, sha)
+                if not path.exists():
+                    data = zlib.compress(block, 6)
+                    _write_atomic(path, data)
+                    new_chunks += 1
+                    new_bytes += len(data)
+        size = tmp_file.stat().st_size
+    finally:
+        try:
+            tmp_file.unlink()
+        except FileNotFoundError:
+            pass
+
+    # 3) manifest는 청크를 모두 쓴 뒤에 기록 (중단되면 manifest 없는 청크만 남고 다음 GC에서 정리)
+    manifest = {
+        "format": 1,
+        "source_db": str(source_db),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "page_size": page_size,
+        "chunk_size": chunk_size,
+        "size": size,
+        "sha256": whole.hexdigest(),
+        "chunks": chunks,
+    }
+    _write_atomic(manifest_file, json.dumps(manifest).encode("utf-8"))
+
+    rotate_incremental(backup_dir, prefix=prefix, keep_last=keep_last, keep_days=keep_days)
+
+    return IncrementalBackupResult(
+        source_db=source_db,
+        manifest_file=manifest_file,
+        size=size,
+        chunks=len(chunks),
+        new_chunks=new_chunks,
+        new_bytes=new_bytes,
+        changed_chunks=changed,
+    )
+
+
+def rotate_incremental(backup_dir: Path, prefix: str, keep_last: int, keep_days: int) -> int:
+    """오래된 manifest 삭제 후 어느 manifest도 참조하지 않는 청크 삭제. 삭제한 청크 수 반환."""
+    backup_dir = backup_dir.resolve()
+    manifests = _list_manifests(backup_dir, prefix)
+    cutoff = datetime.now() - timedelta(days=keep_days)
+    for i, m in enumerate(reversed(manifests)):
+        try:
+            if i >= keep_last or datetime.fromtimestamp(m.stat().st_mtime) < cutoff:
+                m.unlink()
+        except Exception:
+            pass
+
+    # mark: 남은 모든 manifest(다른 prefix 포함)의 청크
+    live: set[str] = set()
+    for m in _list_manifests(backup_dir):
+        try:
+            live.update(_load_manifest(m).get("chunks", []))
+        except Exception:
+            return 0  # 읽을 수 없는 manifest가 있으면 청크를 지우지 않는다
+
+    # sweep (진행 중인 다른 백업의 청크를 지우지 않도록 1시간 이내 파일은 남김)
+    removed = 0
+    recent = time.time() - 3600
+    chunks_dir = _chunks_dir(backup_dir)
+    if not chunks_dir.exists():
+        return 0
+    for path in chunks_dir.glob("*/*"):
+        try:
+            if path.name not in live and path.stat().st_mtime < recent:
+                path.unlink()
+                removed += 1
+        except Exception:
+            pass
+    return removed
+
+
+def resolve_snapshot(backup_dir: Path, name: str, prefix: Optional[str] = None) -> Path:
+    """'latest' | manifest 이름(확장자 생략 가능) | 경로 -> manifest 경로"""
+    backup_dir = backup_dir.resolve()
+    if name == "latest":
+        manifests = _list_manifests(backup_dir, prefix)
+        if not manifests:
+            raise FileNotFoundError(f"스냅샷이 없습니다: {_snapshots_dir(backup_dir)}")
+        return manifests[-1]
+    p = Path(name)
+    if p.exists():
+        return p
+    p = _snapshots_dir(backup_dir) / (name if name.endswith(".json") else f"{name}.json")
+    if not p.exists():
+        raise FileNotFoundError(f"스냅샷을 찾을 수 없습니다: {name}")
+    return p
+
+
+def restore_snapshot(manifest_file: Path, backup_dir: Path, target: Path, overwrite: bool = False) -> Path:
+    """manifest의 청크를 이어 붙여 DB 파일을 복원 (청크/전체 SHA-256 검증 후 교체)"""
+    backup_dir = backup_dir.resolve()
+    target = target.resolve()
+    if target.exists() and not overwrite:
+        raise FileExistsError(f"복원 대상이 이미 있습니다(--force로 덮어쓰기): {target}")
+    manifest = _load_manifest(manifest_file)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.restore.tmp")
+
+    whole = hashlib.sha256()
+    try:
+        with tmp.open("wb") as out:
+            for sha in manifest["chunks"]:
+                path = _chunk_path(backup_dir, sha)
+                try:
+                    block = zlib.decompress(path.read_bytes())
+                except FileNotFoundError:
+                    raise RuntimeError(f"청크가 없습니다: {sha}")
+                if hashlib.sha256(block).hexdigest() != sha:
+                    raise RuntimeError(f"청크 해시 불일치: {sha}")
+                whole.update(block)
+                out.write(block)
+            out.flush()
+            os.fsync(out.fileno())
+        if whole.hexdigest() != manifest["sha256"]:
+            raise RuntimeError("복원 파일 SHA-256이 manifest와 다릅니다")
+        ok, msg = _sqlite_integrity_check(tmp)
+        if not ok:
+            raise RuntimeError(f"복원 파일 무결성 검사 실패: {msg}")
+        tmp.replace(target)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return target
+
+
+def add_copy_arguments(parser: argparse.ArgumentParser) -> None:
+    """단계 복사/진행률/후처리 옵션 (consolidate_sqlite_db.py와 공통)"""
+    parser.add_argument(
+        "--pages-per-step", type=int, default=-1, help="Online Backup 1단계 페이지 수(기본 -1: 한 번에 전체)"
+    )
+    parser.add_argument("--step-sleep-ms", type=int, default=0, help="단계 사이 대기(ms)")
+    parser.add_argument("--progress", action="store_true", help="복사 진행률 출력")
+    parser.add_argument("--vacuum-into", action="store_true", help="사본을 VACUUM INTO로 압축(조각 모음)")
+    parser.add_argument("--analyze", action="store_true", help="사본에 ANALYZE 실행(쿼리 통계 갱신)")
+
+
+def copy_options_from_args(args: argparse.Namespace, label: str) -> CopyOptions:
+    return CopyOptions(
+        pages_per_step=args.pages_per_step,
+        step_sleep=max(0, args.step_sleep_ms) / 1000.0,
+        progress=print_progress(label) if args.progress else None,
+        vacuum_into=args.vacuum_into,
+        analyze=args.analyze,
+    )
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     parser = argparse.ArgumentParser(description="QuickRail SQLite DB 백업")
     parser.add_argument(
@@ -180,14 +590,60 @@ def main(argv: Optional[list[str]] = None) -> int:
     parser.add_argument("--keep-last", type=int, default=30, help="최근 N개 백업 유지")
     parser.add_argument("--keep-days", type=int, default=14, help="최근 N일 백업 유지")
     parser.add_argument("--prefix", type=str, default="quickrail", help="백업 파일 prefix")
+    parser.add_argument("--incremental", action="store_true", help="증분 백업(페이지 청크, 바뀐 청크만 저장)")
+    parser.add_argument(
+        "--chunk-pages", type=int, default=DEFAULT_CHUNK_PAGES, help="증분 청크 1개의 페이지 수(기본 16)"
+    )
+    parser.add_argument(
+        "--max-mb-per-sec", type=float, default=None, help="백업 복사/읽기 속도 제한(MB/s, 기본: 제한 없음)"
+    )
+    add_copy_arguments(parser)
+    parser.add_argument("--list", action="store_true", help="증분 백업 스냅샷 목록")
+    parser.add_argument("--restore", default=None, help="복원할 증분 스냅샷 이름 또는 latest")
+    parser.add_argument("--restore-to", default=None, help="복원 파일 경로(--restore와 함께)")
+    parser.add_argument("--force", action="store_true", help="--restore-to 파일이 있으면 덮어쓰기")
 
     args = parser.parse_args(argv)
+    backup_dir = Path(args.backup_dir)
+
+    if args.list:
+        for m in _list_manifests(backup_dir.resolve(), args.prefix):
+            info = _load_manifest(m)
+            print(f"{m.stem}  {info.get('created_at')}  {info.get('size')} bytes  chunks={len(info.get('chunks', []))}")
+        return 0
+
+    if args.restore:
+        if not args.restore_to:
+            parser.error("--restore에는 --restore-to가 필요합니다")
+        manifest = resolve_snapshot(backup_dir, args.restore, args.prefix)
+        out = restore_snapshot(manifest, backup_dir, Path(args.restore_to), overwrite=args.force)
+        print(f"[DONE] Restored {manifest.stem} -> {out}")
+        return 0
 
     db_url = args.db_url or os.environ.get("DATABASE_URL")
     if db_url:
         source = _parse_sqlite_url(db_url)
     else:
         source = Path(args.db_path)
+    options = copy_options_from_args(args, label="backup")
+    options.max_bytes_per_sec = (args.max_mb_per_sec or 0) * 1024 * 1024
+
+    if args.incremental:
+        inc = incremental_backup(
+            source_db=source,
+            backup_dir=backup_dir,
+            keep_last=args.keep_last,
+            keep_days=args.keep_days,
+            prefix=args.prefix,
+            chunk_pages=args.chunk_pages,
+            options=options,
+        )
+        print(f"[DONE] Incremental backup: {inc.manifest_file}")
+        print(
+            f"[DONE] {inc.size} bytes, chunks={inc.chunks}, changed={inc.changed_chunks}, "
+            f"new={inc.new_chunks} ({inc.new_bytes} bytes stored)"
+        )
+        return 0
 
     res = backup_sqlite_db(
         source_db=source,
@@ -195,6 +651,7 @@ def main(argv: Optional[list[str]] = None) -> int:
         keep_last=args.keep_last,
         keep_days=args.keep_days,
         prefix=args.prefix,
+        options=options,
     )
 
     print(f"[DONE] Backup created: {res.backup_file}")
@@ -0,0 +1,321 @@
+"""
+QuickRail 업로드 폴더(uploads/) 백업 - 하드링크 스냅샷 + 해시 manifest
+
+  python tools/uploads_backup.py --uploads-dir uploads --backup-dir backups/uploads
+  python tools/uploads_backup.py --list
+  python tools/uploads_backup.py --verify                # 최신 스냅샷을 manifest와 대조 (스레드 풀)
+  python tools/uploads_backup.py --verify uploads_20250101_020000 --workers 8
+
+동작 (rsync --link-dest 방식):
+- 스냅샷 1개 = <backup-dir>/<prefix>_<ts>/ (원본과 같은 디렉터리 구조의 전체 사본처럼 보임)
+          + <backup-dir>/<prefix>_<ts>.manifest.json ({상대 경로: [크기, mtime_ns, sha256]})
+- 직전 스냅샷과 크기/수정 시각이 같은 파일은 직전 스냅샷 파일에 하드링크한다(복사/해시 없음, 디스크 사용 0).
+  바뀌었거나 새 파일만 복사하며, 복사하면서 SHA-256을 계산한다(파일을 두 번 읽지 않음).
+- 스냅샷은 임시 디렉터리에 만든 뒤 manifest까지 쓰고 이름을 바꾼다. 중단되면 다음 실행 때 정리된다.
+- 어느 스냅샷을 지워도 다른 스냅샷은 온전하다(하드링크). 복원은 스냅샷 디렉터리를 그대로 복사하면 된다.
+- 진행 중인 업로드 임시 파일(blobs/tmp, blobs/uploads 청크 세션, *.part)은 제외한다.
+
+주의:
+- 백업 디렉터리는 하드링크를 위해 스냅샷끼리 같은 파일시스템(NTFS/ext4 등)에 있어야 한다.
+  하드링크를 만들 수 없으면 복사로 대신한다(공간은 더 쓰지만 결과는 같다).
+- BLOB_STORE_DIR을 uploads 밖으로 지정했다면 --uploads-dir/--prefix를 바꿔 한 번 더 실행한다.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_EXCLUDES = ("blobs/tmp/*", "blobs/uploads/*", "*.part", "*.tmp")
+_READ_SIZE = 1024 * 1024
+
+
+@dataclass
+class SnapshotResult:
+    snapshot_dir: Path
+    manifest_file: Path
+    files: int = 0
+    linked: int = 0
+    copied: int = 0
+    copied_bytes: int = 0
+    total_bytes: int = 0
+
+
+@dataclass
+class VerifyResult:
+    snapshot_dir: Path
+    checked: int = 0
+    missing: list = field(default_factory=list)
+    mismatched: list = field(default_factory=list)
+    extra: list = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.mismatched or self.extra)
+
+
+def _project_root() -> Path:
+    # tools/ 아래에 위치하므로 상위가 프로젝트 루트
+    return Path(__file__).resolve().parents[1]
+
+
+def _sha256_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(_READ_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _copy_with_sha256(src: Path, dst: Path) -> str:
+    """복사하면서 해시 계산 (mtime 등 메타데이터도 복사)"""
+    h = hashlib.sha256()
+    with src.open("rb") as fin, dst.open("wb") as fout:
+        for chunk in iter(lambda: fin.read(_READ_SIZE), b""):
+            h.update(chunk)
+            fout.write(chunk)
+    shutil.copystat(src, dst)
+    return h.hexdigest()
+
+
+def _excluded(rel: str, excludes: tuple) -> bool:
+    return any(fnmatch.fnmatch(rel, pat) for pat in excludes)
+
+
+def _iter_files(root: Path, excludes: tuple):
+    """(상대 경로('/' 구분), 절대 경로) - 정렬된 순서"""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = Path(dirpath) / name
+            rel = path.relative_to(root).as_posix()
+            if not _excluded(rel, excludes):
+                yield rel, path
+
+
+def _manifest_path(snapshot_dir: Path) -> Path:
+    return snapshot_dir.with_name(snapshot_dir.name + ".manifest.json")
+
+
+def _load_manifest(snapshot_dir: Path) -> dict:
+    return json.loads(_manifest_path(snapshot_dir).read_text(encoding="utf-8"))
+
+
+def list_snapshots(backup_dir: Path, prefix: str) -> list[Path]:
+    """manifest까지 완성된 스냅샷 목록 (오래된 순)"""
+    if not backup_dir.exists():
+        return []
+    return sorted(
+        p for p in backup_dir.glob(f"{prefix}_*")
+        if p.is_dir() and _manifest_path(p).exists()
+    )
+
+
+def snapshot_uploads(
+    uploads_dir: Path,
+    backup_dir: Path,
+    prefix: str = "uploads",
+    excludes: tuple = DEFAULT_EXCLUDES,
+) -> SnapshotResult:
+    uploads_dir = uploads_dir.resolve()
+    backup_dir = backup_dir.resolve()
+    if not uploads_dir.is_dir():
+        raise FileNotFoundError(f"업로드 폴더를 찾을 수 없습니다: {uploads_dir}")
+    backup_dir.mkdir(parents=True, exist_ok=True)
+
+    # 이전 실행이 남긴 미완성 스냅샷 정리
+    for stale in backup_dir.glob(f".{prefix}_*.tmp"):
+        shutil.rmtree(stale, ignore_errors=True)
+    for stale in backup_dir.glob(f".{prefix}_*.tmp.manifest"):
+        stale.unlink(missing_ok=True)
+
+    previous = list_snapshots(backup_dir, prefix)
+    prev_dir = previous[-1] if previous else None
+    prev_files = _load_manifest(prev_dir)["files"] if prev_dir else {}
+
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    final_dir = backup_dir / f"{prefix}_{ts}"
+    tmp_dir = backup_dir / f".{prefix}_{ts}.tmp"
+    tmp_dir.mkdir()
+    result = SnapshotResult(snapshot_dir=final_dir, manifest_file=_manifest_path(final_dir))
+    files: dict = {}
+
+    try:
+        for rel, src in _iter_files(uploads_dir, excludes):
+            try:
+                st = src.stat()
+            except FileNotFoundError:
+                continue  # 스캔 중 삭제됨
+            dst = tmp_dir / rel
+            dst.parent.mkdir(parents=True, exist_ok=True)
+
+            prev = prev_files.get(rel)
+            linked = False
+            if prev and prev[0] == st.st_size and prev[1] == st.st_mtime_ns:
+                prev_path = prev_dir / rel
+                try:
+                    # 이전 스냅샷 파일이 손상(크기 변경)되었으면 링크하지 않고 원본에서 다시 복사
+                    if prev_path.stat().st_size == prev[0]:
+                        os.link(prev_path, dst)
+                        files[rel] = prev
+                        linked = True
+                except OSError:
+                    pass  # 이전 스냅샷 파일 없음/하드링크 불가 -> 복사
+            if not linked:
+                try:
+                    sha = _copy_with_sha256(src, dst)
+                except FileNotFoundError:
+                    continue
+                files[rel] = [st.st_size, st.st_mtime_ns, sha]
+                result.copied += 1
+                result.copied_bytes += st.st_size
+            else:
+                result.linked += 1
+            result.files += 1
+            result.total_bytes += st.st_size
+
+        manifest = {
+            "format": 1,
+            "source": str(uploads_dir),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "files": files,
+        }
+        tmp_manifest = tmp_dir.with_name(tmp_dir.name + ".manifest")
+        tmp_manifest.write_text(json.dumps(manifest), encoding="utf-8")
+        tmp_dir.replace(final_dir)
+        tmp_manifest.replace(result.manifest_file)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return result
+
+
+def rotate_snapshots(backup_dir: Path, prefix: str, keep_last: int, keep_days: int) -> int:
+    """keep_last개를 넘거나 keep_days보다 오래된 스냅샷 삭제 (다른 스냅샷의 하드링크는 그대로 남음)"""
+    snapshots = list_snapshots(backup_dir.resolve(), prefix)
+    cutoff = datetime.now() - timedelta(days=keep_days)
+    removed = 0
+    for i, snap in enumerate(reversed(snapshots)):
+        if i == 0:
+            continue  # 최신 스냅샷은 항상 유지
+        try:
+            if i >= keep_last or datetime.fromtimestamp(_manifest_path(snap).stat().st_mtime) < cutoff:
+                _manifest_path(snap).unlink()
+                shutil.rmtree(snap, ignore_errors=True)
+                removed += 1
+        except Exception:
+            pass
+    return removed
+
+
+def resolve_snapshot(backup_dir: Path, name: str, prefix: str) -> Path:
+    backup_dir = backup_dir.resolve()
+    if name == "latest":
+        snapshots = list_snapshots(backup_dir, prefix)
+        if not snapshots:
+            raise FileNotFoundError(f"스냅샷이 없습니다: {backup_dir}")
+        return snapshots[-1]
+    p = backup_dir / name
+    if not p.is_dir() or not _manifest_path(p).exists():
+        raise FileNotFoundError(f"스냅샷을 찾을 수 없습니다: {name}")
+    return p
+
+
+def verify_snapshot(snapshot_dir: Path, workers: int = 4, excludes: tuple = DEFAULT_EXCLUDES) -> VerifyResult:
+    """스냅샷 파일을 manifest SHA-256과 대조 (파일 해시는 스레드 풀에서 병렬 계산)"""
+    files = _load_manifest(snapshot_dir)["files"]
+    result = VerifyResult(snapshot_dir=snapshot_dir)
+
+    def _check(item):
+        rel, (size, _mtime, sha) = item
+        path = snapshot_dir / rel
+        try:
+            if path.stat().st_size != size:
+                return rel, "mismatch"
+            return rel, ("ok" if _sha256_file(path) == sha else "mismatch")
+        except FileNotFoundError:
+            return rel, "missing"
+
+    # hashlib은 큰 버퍼를 해시하는 동안 GIL을 놓으므로 스레드로 디스크/CPU를 함께 쓸 수 있다
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for rel, status in pool.map(_check, files.items()):
+            result.checked += 1
+            if status == "missing":
+                result.missing.append(rel)
+            elif status == "mismatch":
+                result.mismatched.append(rel)
+
+    result.extra = [rel for rel, _ in _iter_files(snapshot_dir, excludes) if rel not in files]
+    return result
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="QuickRail 업로드 폴더 백업 (하드링크 스냅샷 + 해시 manifest)")
+    parser.add_argument(
+        "--uploads-dir",
+        default=str(_project_root() / "uploads"),
+        help="백업할 업로드 폴더(기본: uploads)",
+    )
+    parser.add_argument(
+        "--backup-dir",
+        default=str(_project_root() / "backups" / "uploads"),
+        help="스냅샷 저장 디렉토리",
+    )
+    parser.add_argument("--keep-last", type=int, default=14, help="최근 N개 스냅샷 유지")
+    parser.add_argument("--keep-days", type=int, default=30, help="최근 N일 스냅샷 유지")
+    parser.add_argument("--prefix", type=str, default="uploads", help="스냅샷 이름 prefix")
+    parser.add_argument(
+        "--exclude", action="append", default=[], help="추가 제외 패턴(상대 경로 glob, 여러 번 지정 가능)"
+    )
+    parser.add_argument("--list", action="store_true", help="스냅샷 목록")
+    parser.add_argument(
+        "--verify", nargs="?", const="latest", default=None, help="스냅샷 검증(이름 생략 시 최신)"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="--verify 병렬 스레드 수")
+    args = parser.parse_args(argv)
+
+    backup_dir = Path(args.backup_dir)
+    excludes = DEFAULT_EXCLUDES + tuple(args.exclude)
+
+    if args.list:
+        for snap in list_snapshots(backup_dir.resolve(), args.prefix):
+            info = _load_manifest(snap)
+            total = sum(v[0] for v in info["files"].values())
+            print(f"{snap.name}  {info.get('created_at')}  files={len(info['files'])}  {total} bytes")
+        return 0
+
+    if args.verify:
+        snap = resolve_snapshot(backup_dir, args.verify, args.prefix)
+        res = verify_snapshot(snap, workers=args.workers, excludes=excludes)
+        for label, items in (("MISSING", res.missing), ("MISMATCH", res.mismatched), ("EXTRA", res.extra)):
+            for rel in items[:20]:
+                print(f"[{label}] {rel}")
+            if len(items) > 20:
+                print(f"[{label}] ... 외 {len(items) - 20}개")
+        status = "OK" if res.ok else "FAIL"
+        print(
+            f"[{status}] {snap.name}: checked={res.checked}, missing={len(res.missing)}, "
+            f"mismatch={len(res.mismatched)}, extra={len(res.extra)}"
+        )
+        return 0 if res.ok else 1
+
+    res = snapshot_uploads(Path(args.uploads_dir), backup_dir, prefix=args.prefix, excludes=excludes)
+    removed = rotate_snapshots(backup_dir, args.prefix, keep_last=args.keep_last, keep_days=args.keep_days)
+    print(f"[DONE] Snapshot created: {res.snapshot_dir}")
+    print(
+        f"[DONE] files={res.files} ({res.total_bytes} bytes), linked={res.linked}, "
+        f"copied={res.copied} ({res.copied_bytes} bytes), rotated={removed}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())